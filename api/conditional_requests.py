@@ -0,0 +1,22 @@
+"""Helpers for conditional GET requests using ETags."""
+from fastapi import Response
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Check if an If-None-Match request header matches the current ETag of a resource.
+
+    :param if_none_match: Value of the If-None-Match request header.
+    :param etag: Current ETag of the resource.
+    :return: True if the client copy is still current, False otherwise.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """Build an empty 304 Not Modified response."""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
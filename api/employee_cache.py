@@ -0,0 +1,142 @@
+"""
+Read-through cache of single employees, used by the employee data by id endpoint.
+
+Entries are the assembled employee response rows with their ETag, kept for a limited time and evicted least
+recently used first once the cache is full. Every write to an employee invalidates its entry after the
+write is committed. A read that started before an invalidation does not store its result, since it may have
+read the data as it was before the write.
+
+Writes made by other API workers, or outside the API, are seen through the employee change notifications,
+which invalidate the entries of the employees changed. The cache is cleared when the listener connects, when
+a reset is notified (e.g. after seeding synthetic employees), and when its connection is lost, so entries
+cached while disconnected are dropped on reconnection. With
+employee_cache_notify disabled, only the writes of this process invalidate the cache, so it must then run
+as a single worker.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Tuple
+
+from psycopg import AsyncConnection
+
+from app.config.config import settings
+from backend import employee_changes
+
+
+class EmployeeCache:
+    """Bounded LRU cache with a TTL, keyed by employee id."""
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.generation = 0
+        self._entries: "OrderedDict[int, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, employee_id: int) -> Any | None:
+        """Get the cached value of an employee, None if it is not cached or has expired."""
+        entry = self._entries.get(employee_id)
+        if entry is not None and time.monotonic() - entry[0] >= self.ttl:
+            del self._entries[employee_id]
+            self.expirations += 1
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(employee_id)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, employee_id: int, value: Any, generation: int) -> None:
+        """
+        Cache the value of an employee read from the database.
+
+        :param employee_id: Employee id.
+        :param value: Value to cache.
+        :param generation: Cache generation taken before the value was read.
+        """
+        if generation != self.generation:
+            # An employee was written while the value was read
+            return
+
+        self._entries[employee_id] = (time.monotonic(), value)
+        self._entries.move_to_end(employee_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, employee_id: int) -> None:
+        """Drop the cached value of an employee after it was written."""
+        self.invalidate_many((employee_id,))
+
+    def invalidate_many(self, employee_ids: Iterable[int]) -> None:
+        """Drop the cached values of employees after they were written."""
+        self.generation += 1
+        for employee_id in employee_ids:
+            self.invalidations += 1
+            self._entries.pop(employee_id, None)
+
+    def clear(self) -> None:
+        """Drop all cached values, when writes may have been missed."""
+        self.generation += 1
+        self._entries.clear()
+
+    async def listen(self) -> None:
+        """Invalidate the employees changed by other processes, from the change notifications, until cancelled."""
+
+        async def on_reset(connection: AsyncConnection) -> None:
+            self.clear()
+
+        async def on_changes(employee_ids: Iterable[int]) -> None:
+            self.invalidate_many(employee_ids)
+
+        await employee_changes.listen(
+            "Employee cache",
+            on_reset=on_reset,
+            on_changes=on_changes,
+            on_disconnect=self.clear,
+            batch_delay=0,
+            reconnect_delay=settings.employee_cache_reconnect_delay,
+        )
+
+    def stats(self) -> Dict[str, int | float]:
+        """Get the cache size, counters and hit ratio."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+cache = EmployeeCache(max_size=settings.employee_cache_size, ttl=settings.employee_cache_ttl)
+_listener: asyncio.Task = None  # type: ignore
+
+
+async def employee_cache_listen_init() -> None:
+    """Start invalidating the cache from the employee change notifications in the background."""
+    global _listener
+
+    _listener = asyncio.create_task(cache.listen())
+
+
+async def employee_cache_listen_close() -> None:
+    """Stop the employee cache listener."""
+    if _listener is not None:
+        _listener.cancel()
+        try:
+            await _listener
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,306 @@
+"""
+This module contains the API endpoint for importing many employees at once.
+The request body is streamed as CSV (with a header row) or NDJSON, one employee per line, with department,
+position and gender given by name. Every row is validated and copied into a temporary staging table with
+PostgreSQL COPY. The names are then resolved to ids, email and phone uniqueness is checked for the whole
+batch, and the valid rows are merged into the employee table, all in one transaction. Rows that can't be
+imported are reported back with their line number and the reason.
+"""
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from psycopg import AsyncConnection, AsyncCursor, sql
+from pydantic import ValidationError
+
+from api.input_data_validations.pydantic_validations import EmployeeImportRow
+from app.config.config import settings
+from app.logger.log_handler import logger
+from backend import db_connect
+
+
+bulk_import_router = APIRouter(prefix="/v1", tags=["Add New Employee"])
+
+STAGING_TABLE = "employee_import"
+
+IMPORT_COLUMNS = (
+    "first_name",
+    "middle_name",
+    "last_name",
+    "email",
+    "phone",
+    "address",
+    "salary",
+    "department",
+    "position",
+    "gender",
+    "date_of_birth",
+    "hired_date",
+    "status",
+)
+
+
+async def read_lines(request: Request) -> AsyncIterator[str]:
+    """Read the request body line by line as it is streamed in."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    async for chunk in request.stream():
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def read_records(request: Request, body_format: str) -> AsyncIterator[Tuple[int, Dict[str, Any] | str]]:
+    """
+    Parse the request body into records.
+
+    :param request: Incoming request.
+    :param body_format: "csv" or "ndjson".
+    :return: Async iterator of line numbers with the parsed record, or the reason the line could not be parsed.
+    """
+    header: List[str] | None = None
+    line_number = 0
+
+    async for line in read_lines(request):
+        line_number += 1
+        if not line.strip():
+            continue
+
+        if body_format == "ndjson":
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield line_number, "Invalid JSON: expected an object"
+                continue
+            yield line_number, record
+            continue
+
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [value.strip() for value in values]
+            continue
+        if len(values) != len(header):
+            yield line_number, f"Expected {len(header)} fields, got {len(values)}"
+            continue
+        # Empty CSV fields are missing values
+        yield line_number, {key: value for key, value in zip(header, values) if value != ""}
+
+
+def validate_record(record: Dict[str, Any]) -> Tuple[Any, ...] | str:
+    """Validate a record and return its values in staging table column order, or the validation errors."""
+    try:
+        row = EmployeeImportRow.model_validate(record)
+    except ValidationError as e:
+        return "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors())
+    return tuple(getattr(row, column) for column in IMPORT_COLUMNS)
+
+
+async def create_staging_table(cursor: AsyncCursor) -> None:
+    """Create the temporary staging table, dropped when the transaction ends."""
+    await cursor.execute(
+        sql.SQL("""
+            CREATE TEMPORARY TABLE {staging} (
+                line_number INT NOT NULL,
+                first_name VARCHAR(50) NOT NULL,
+                middle_name VARCHAR(50),
+                last_name VARCHAR(50) NOT NULL,
+                email VARCHAR(50) NOT NULL,
+                phone VARCHAR(20) NOT NULL,
+                address VARCHAR(255) NOT NULL,
+                salary DECIMAL(10,2) NOT NULL,
+                department TEXT NOT NULL,
+                position TEXT NOT NULL,
+                gender TEXT NOT NULL,
+                date_of_birth DATE NOT NULL,
+                hired_date DATE,
+                status VARCHAR(10),
+                department_id INT,
+                position_id INT,
+                gender_id INT,
+                rejection TEXT
+            ) ON COMMIT DROP;
+        """).format(staging=sql.Identifier(STAGING_TABLE))
+    )
+
+
+async def merge_staging_table(cursor: AsyncCursor) -> int:
+    """
+    Resolve names to ids, reject rows that can't be inserted and insert the rest into the employee table.
+
+    :param cursor: Cursor in the import transaction.
+    :return: Number of employees inserted.
+    """
+    identifiers = {
+        "staging": sql.Identifier(STAGING_TABLE),
+        "employee": sql.Identifier(settings.employee_table_name),
+        "department": sql.Identifier(settings.dept_table_name),
+        "position": sql.Identifier(settings.position_table_name),
+        "gender": sql.Identifier(settings.gender_table_name),
+    }
+
+    statements = [
+        # Resolve department, position and gender names to their ids
+        """
+        UPDATE {staging} AS s
+        SET
+            department_id = (SELECT d.id FROM {department} AS d WHERE d.department = s.department),
+            position_id = (SELECT p.id FROM {position} AS p WHERE p.position = s.position),
+            gender_id = (SELECT g.id FROM {gender} AS g WHERE g.gender = s.gender);
+        """,
+        """
+        UPDATE {staging}
+        SET rejection = CASE
+            WHEN department_id IS NULL THEN 'Unknown department: ' || department
+            WHEN position_id IS NULL THEN 'Unknown position: ' || position
+            ELSE 'Unknown gender: ' || gender
+        END
+        WHERE department_id IS NULL OR position_id IS NULL OR gender_id IS NULL;
+        """,
+        # Only the first row with an email or phone number in the batch can be imported. Rows already rejected
+        # are not counted, so a valid row isn't rejected as a duplicate of a rejected one.
+        """
+        UPDATE {staging} AS s
+        SET rejection = 'Duplicate email in import: ' || s.email
+        FROM (
+            SELECT line_number, row_number() OVER (PARTITION BY email ORDER BY line_number) AS occurrence
+            FROM {staging}
+            WHERE rejection IS NULL
+        ) AS duplicates
+        WHERE s.line_number = duplicates.line_number AND duplicates.occurrence > 1 AND s.rejection IS NULL;
+        """,
+        """
+        UPDATE {staging} AS s
+        SET rejection = 'Duplicate phone in import: ' || s.phone
+        FROM (
+            SELECT line_number, row_number() OVER (PARTITION BY phone ORDER BY line_number) AS occurrence
+            FROM {staging}
+            WHERE rejection IS NULL
+        ) AS duplicates
+        WHERE s.line_number = duplicates.line_number AND duplicates.occurrence > 1 AND s.rejection IS NULL;
+        """,
+        # Reject emails and phone numbers that are already used by an employee
+        """
+        UPDATE {staging} AS s
+        SET rejection = 'Email already exists: ' || s.email
+        FROM {employee} AS e
+        WHERE e.email = s.email AND s.rejection IS NULL;
+        """,
+        """
+        UPDATE {staging} AS s
+        SET rejection = 'Phone number already exists: ' || s.phone
+        FROM {employee} AS e
+        WHERE e.phone = s.phone AND s.rejection IS NULL;
+        """,
+    ]
+    for statement in statements:
+        await cursor.execute(sql.SQL(statement).format(**identifiers))
+
+    # ON CONFLICT guards against employees added concurrently since the checks above
+    await cursor.execute(
+        sql.SQL("""
+            WITH inserted AS (
+                INSERT INTO {employee} (
+                    first_name, middle_name, last_name, email, phone, address, salary,
+                    department_id, position_id, gender_id, date_of_birth, hired_date, status
+                )
+                SELECT
+                    first_name, middle_name, last_name, email, phone, address, salary,
+                    department_id, position_id, gender_id, date_of_birth, COALESCE(hired_date, CURRENT_DATE), status
+                FROM {staging}
+                WHERE rejection IS NULL
+                ORDER BY line_number
+                ON CONFLICT DO NOTHING
+                RETURNING email
+            )
+            UPDATE {staging} AS s
+            SET rejection = 'Email or phone number already exists'
+            WHERE s.rejection IS NULL AND NOT EXISTS (SELECT 1 FROM inserted WHERE inserted.email = s.email);
+        """).format(**identifiers)
+    )
+
+    await cursor.execute(
+        sql.SQL("SELECT count(*) FROM {staging} WHERE rejection IS NULL").format(**identifiers)
+    )
+    return (await cursor.fetchone())[0]  # type: ignore
+
+
+@bulk_import_router.post("/bulk_import_employees/", description="""
+    - Send employees as CSV with a header row (`Content-Type: text/csv`) or as NDJSON (`Content-Type: application/x-ndjson`).
+
+    - Fields: first_name, middle_name, last_name, email, phone, address, salary, department, position, gender,
+      date_of_birth, hired_date, status. Department, position and gender are given by name. middle_name,
+      hired_date and status are optional.
+
+    - CSV fields may not contain line breaks.
+
+    - Rows that can't be imported are skipped and reported with their line number and the reason.
+    """)
+async def bulk_import_employees(
+    request: Request,
+    connection: AsyncConnection = Depends(db_connect.get_db_connection),
+) -> Dict[str, Any]:
+    """
+    Import many employees in one transaction.
+
+    :param request: Request with the CSV or NDJSON body.
+    :return: Number of employees imported and the rejected rows.
+    """
+    content_type = request.headers.get("content-type", "")
+    if "csv" in content_type:
+        body_format = "csv"
+    elif "ndjson" in content_type or "jsonl" in content_type:
+        body_format = "ndjson"
+    else:
+        raise HTTPException(status_code=415, detail="Send employees as text/csv or application/x-ndjson.")
+
+    logger.info("Importing employees from %s ...", body_format)
+    rejected: List[Dict[str, Any]] = []
+
+    try:
+        async with connection.transaction():
+            async with connection.cursor() as cursor:
+                await create_staging_table(cursor)
+
+                copy_statement = sql.SQL("COPY {staging} (line_number, {columns}) FROM STDIN").format(
+                    staging=sql.Identifier(STAGING_TABLE),
+                    columns=sql.SQL(", ").join(map(sql.Identifier, IMPORT_COLUMNS)),
+                )
+                async with cursor.copy(copy_statement) as copy:
+                    async for line_number, record in read_records(request, body_format):
+                        values = record if isinstance(record, str) else validate_record(record)
+                        if isinstance(values, str):
+                            rejected.append({"line": line_number, "reason": values})
+                            continue
+                        await copy.write_row((line_number, *values))
+
+                inserted = await merge_staging_table(cursor)
+
+                await cursor.execute(
+                    sql.SQL(
+                        "SELECT line_number, rejection FROM {} WHERE rejection IS NOT NULL ORDER BY line_number"
+                    ).format(sql.Identifier(STAGING_TABLE))
+                )
+                rejected.extend({"line": line, "reason": reason} for line, reason in await cursor.fetchall())
+
+    except Exception as e:
+        logger.error("Unexpected error occurred while importing employees. Message: %s", str(e))
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+    rejected.sort(key=lambda row: row["line"])
+    logger.info("Employee import completed. Inserted: %s, rejected: %s", inserted, len(rejected))
+
+    return {
+        "status": "Success",
+        "inserted": inserted,
+        "rejected": rejected,
+    }
@@ -3,120 +3,431 @@ This module defines the API endpoints for employee data management, including re
 The endpoints allow clients to fetch employee data based on various criteria such as ID, first name, last name, department,
 and position. Additionally, it provides an endpoint to add new employee records to the database.
 """
-from typing import Any, Dict, List
+import hashlib
+from itertools import product
+from typing import Any, Dict, List, Tuple
 
-from fastapi import APIRouter, HTTPException
-from psycopg2 import sql
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from psycopg import AsyncConnection, sql
+from psycopg.abc import AdaptContext
 
+from api import employee_cache
+from api.conditional_requests import etag_matches, not_modified
 from api.input_data_validations.pydantic_validations import (
     EmployeeResponseModel,
     DepartmentIdRequest,
+    PaginatedEmployeeResponseModel,
     PositionIdRequest,
 )
 from app.config.config import settings
-from app.logger.log_handler import logger
-from backend import db_connect
+from app.logger.log_handler import SAMPLED, get_logger
+from backend import db_connect, metrics
 
 
 employees_data_router = APIRouter(prefix="/v1", tags=["Employee Data"])
+logger = get_logger(__name__)
 
 ALLOWED_EMPLOYEE_FILTERS = {
     "id": "e.id",
     "first_name": "e.first_name",
     "last_name": "e.last_name",
     "department": "d.department",
+    "position": "p.position",
     "status": "e.status"
 }
 
+# Filters matched on case-insensitive prefix or trigram similarity by the search endpoint, the others exactly
+NAME_FILTERS = ("first_name", "last_name")
+
+EMPLOYEE_SELECT_LIST = sql.SQL("""
+                e.id,
+                e.first_name,
+                e.middle_name,
+                e.last_name,
+                e.email,
+                e.phone,
+                e.address,
+                e.salary,
+                d.department,
+                p.position,
+                g.gender,
+                e.date_of_birth,
+                e.hired_date,
+                e.status,
+                e.date_resigned
+""")
+
+# Number of employees and latest change of the employees matching a filter, the version of their data
+EMPLOYEE_VERSION_SELECT_LIST = sql.SQL("count(*), max(e.updated_at)")
+
+EMPLOYEE_CACHE_CONTROL = "private, no-cache"
+
+# Employee data queries by (filter field, keyset, limit), composed once at startup
+EMPLOYEE_QUERIES: Dict[Tuple[str, bool, bool], bytes] = {}
+
+# Employee data version queries by filter field, composed once at startup
+EMPLOYEE_VERSION_QUERIES: Dict[str, bytes] = {}
+
+
+def employee_select_query(
+    where_clause: sql.Composable,
+    tail_clause: sql.Composable = sql.SQL(""),
+    select_list: sql.Composable = EMPLOYEE_SELECT_LIST,
+) -> sql.Composed:
+    """
+    Compose the employee data query joining the department, gender and position tables.
 
-def fetch_employee_data(filter_field: str, value: Any) -> List[Dict[str, Any]]:
+    :param where_clause: WHERE clause filtering the employees.
+    :param tail_clause: Clause after the WHERE clause, such as ORDER BY and LIMIT.
+    :param select_list: Columns selected, the employee data by default.
+    :return: Query with the placeholders of the clauses.
     """
-    A helper function for fetching employee data via API calss to the Database
+    return sql.SQL("""
+            SELECT {select_list}
+            FROM {employee} AS e
+            JOIN {department} AS d ON e.{department_id} = d.{data_join_column}
+            JOIN {gender} AS g ON e.{gender_id} = g.{data_join_column}
+            JOIN {position} AS p ON e.{position_id} = p.{data_join_column}
+            {where_clause}
+            {tail_clause};
+        """
+        ).format(
+            employee=sql.Identifier(settings.employee_table_name),
+            department=sql.Identifier(settings.dept_table_name),
+            department_id=sql.Identifier(settings.department_id),
+            gender=sql.Identifier(settings.gender_table_name),
+            gender_id=sql.Identifier(settings.gender_id),
+            position=sql.Identifier(settings.position_table_name),
+            position_id=sql.Identifier(settings.position_id),
+            data_join_column=sql.Identifier(settings.fetch_employee_data_join_column),
+            select_list=select_list,
+            where_clause=where_clause,
+            tail_clause=tail_clause,
+        )
+
+
+def employee_data_query(
+    filter_field: str,
+    keyset: bool = False,
+    limit: bool = False,
+    version: bool = False,
+) -> sql.Composed:
+    """
+    Compose the employee data query for a filter.
 
     :param filter_field: The field to filter on (e.g., "id", "first_name")
-    :param value: value for filter
-    :return: List of dictionary values for retrieved data.
+    :param keyset: Add a keyset condition, e.id greater than a parameter
+    :param limit: Order by e.id and limit the rows to a parameter, selecting e.updated_at too for the page ETag
+    :param version: Select the number of employees and their latest change instead of their data
+    :return: Query with placeholders for the filter value, then the keyset and limit if used.
     """
-
     if filter_field not in ALLOWED_EMPLOYEE_FILTERS:
         raise ValueError("Invalid filter field")
 
     column = ALLOWED_EMPLOYEE_FILTERS[filter_field]
+    if version:
+        select_list: sql.Composable = EMPLOYEE_VERSION_SELECT_LIST
+    elif limit:
+        select_list = sql.SQL("{}, e.updated_at").format(EMPLOYEE_SELECT_LIST)
+    else:
+        select_list = EMPLOYEE_SELECT_LIST
+
+    return employee_select_query(
+        where_clause=sql.SQL("WHERE {filter_column} = %s {keyset_clause}").format(
+            filter_column=sql.SQL(column),
+            keyset_clause=sql.SQL("AND e.id > %s") if keyset else sql.SQL(""),
+        ),
+        tail_clause=sql.SQL("ORDER BY e.id LIMIT %s") if limit else sql.SQL(""),
+        select_list=select_list,
+    )
+
+
+def employee_filter_clause(filter_fields: List[str]) -> sql.Composable:
+    """
+    Compose a WHERE clause matching all filters exactly.
+
+    :param filter_fields: Fields to filter on, from ALLOWED_EMPLOYEE_FILTERS.
+    :return: WHERE clause with a placeholder for the value of every filter field, in order. Empty without filters.
+    """
+    if not filter_fields:
+        return sql.SQL("")
+
+    conditions = [sql.SQL("{} = %s").format(sql.SQL(ALLOWED_EMPLOYEE_FILTERS[field])) for field in filter_fields]
+    return sql.SQL("WHERE ") + sql.SQL(" AND ").join(conditions)
+
+
+def like_prefix(value: str) -> str:
+    """Escape the LIKE wildcards in a value and turn it into a prefix pattern."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def employee_search_query(filters: Dict[str, Any]) -> Tuple[sql.Composed, Dict[str, Any]]:
+    """
+    Compose the employee search query combining filters.
+
+    Name filters match case-insensitive prefixes and similar names, with the results ranked by how well the
+    names match, prefix matches first. The other filters match exactly.
+
+    :param filters: Filter values by field, at least one.
+    :return: Query with named placeholders and its parameters, without the limit.
+    """
+    conditions = []
+    rank_terms = []
+    params: Dict[str, Any] = {}
+
+    for field, value in filters.items():
+        column = sql.SQL(ALLOWED_EMPLOYEE_FILTERS[field])
+        params[field] = value
+
+        if field in NAME_FILTERS:
+            prefix = sql.Placeholder(f"{field}_prefix")
+            params[f"{field}_prefix"] = like_prefix(value)
+            conditions.append(sql.SQL("({column} ILIKE {prefix} OR {column} %% {value})").format(
+                column=column, prefix=prefix, value=sql.Placeholder(field)
+            ))
+            rank_terms.append(sql.SQL("({column} ILIKE {prefix})::int + similarity({column}, {value})").format(
+                column=column, prefix=prefix, value=sql.Placeholder(field)
+            ))
+        else:
+            conditions.append(sql.SQL("{} = {}").format(column, sql.Placeholder(field)))
+
+    order = [sql.SQL("e.id")]
+    if rank_terms:
+        order.insert(0, sql.SQL("({}) DESC").format(sql.SQL(" + ").join(rank_terms)))
+
+    query = employee_select_query(
+        where_clause=sql.SQL("WHERE ") + sql.SQL(" AND ").join(conditions),
+        tail_clause=sql.SQL("ORDER BY {} LIMIT %(limit)s").format(sql.SQL(", ").join(order)),
+    )
+    return query, params
 
-    with db_connect.db_client.cursor() as cursor:
-        query = sql.SQL("""
-                SELECT
-                    e.id,
-                    e.first_name,
-                    e.middle_name,
-                    e.last_name,
-                    e.email,
-                    e.phone,
-                    e.address,
-                    e.salary,
-                    d.department,
-                    p.position,
-                    g.gender,
-                    e.date_of_birth,
-                    e.hired_date,
-                    e.status,
-                    e.date_resigned
-                FROM {employee} AS e
-                JOIN {department} AS d ON e.{department_id} = d.{data_join_column}
-                JOIN {gender} AS g ON e.{gender_id} = g.{data_join_column}
-                JOIN {position} AS p ON e.{position_id} = p.{data_join_column}
-                WHERE {filter_column} = %s;
-            """
-            ).format(
-                employee=sql.Identifier(settings.employee_table_name),
-                department=sql.Identifier(settings.dept_table_name),
-                department_id=sql.Identifier(settings.department_id),
-                gender=sql.Identifier(settings.gender_table_name),
-                gender_id=sql.Identifier(settings.gender_id),
-                position=sql.Identifier(settings.position_table_name),
-                position_id=sql.Identifier(settings.position_id),
-                data_join_column=sql.Identifier(settings.fetch_employee_data_join_column),
-                filter_column=sql.SQL(column)
-            )
-        cursor.execute(query, (value,))
-        rows = cursor.fetchall()
+
+def compile_employee_queries(context: AdaptContext) -> None:
+    """
+    Compose the employee data query of every filter variant once and keep it in the query registry.
+
+    :param context: Connection used to quote the identifiers.
+    """
+    for filter_field, keyset, limit in product(ALLOWED_EMPLOYEE_FILTERS, (False, True), (False, True)):
+        query = employee_data_query(filter_field, keyset=keyset, limit=limit)
+        EMPLOYEE_QUERIES[(filter_field, keyset, limit)] = query.as_bytes(context)
+
+    for filter_field in ALLOWED_EMPLOYEE_FILTERS:
+        EMPLOYEE_VERSION_QUERIES[filter_field] = employee_data_query(filter_field, version=True).as_bytes(context)
+
+    logger.info("Employee data queries compiled: %s", len(EMPLOYEE_QUERIES) + len(EMPLOYEE_VERSION_QUERIES))
+
+
+async def fetch_employee_data(
+    connection: AsyncConnection,
+    filter_field: str,
+    value: Any,
+    limit: int | None = None,
+    after: int | None = None,
+) -> List[Dict[str, Any]]:
+    """
+    A helper function for fetching employee data via API calss to the Database
+
+    :param connection: Database connection borrowed from the pool
+    :param filter_field: The field to filter on (e.g., "id", "first_name")
+    :param value: value for filter
+    :param limit: Maximum number of rows to return, ordered by employee id. All rows if not set.
+    :param after: Only return employees with an id greater than this value (keyset cursor).
+    :return: List of dictionary values for retrieved data.
+    """
+    key = (filter_field, after is not None, limit is not None)
+    query = EMPLOYEE_QUERIES.get(key) or employee_data_query(*key)
+    params = [value] + [param for param in (after, limit) if param is not None]
+
+    async with connection.cursor() as cursor:
+        # Prepared on the connection at first use, later executions skip parsing and planning
+        with metrics.named_query(f"fetch_employee_data:{filter_field}"):
+            await cursor.execute(query, params, prepare=True)
+        rows = await cursor.fetchall()
 
         col_names = [desc[0] for desc in cursor.description]  # type: ignore
 
         return [dict(zip(col_names, row)) for row in rows]
 
 
+async def employee_data_etag(connection: AsyncConnection, filter_field: str, value: Any, *variant: Any) -> str:
+    """
+    Compute the strong ETag of the employee data matching a filter, without reading the data.
+
+    The ETag changes when an employee is added, removed or updated: updates and inserts set a newer
+    updated_at, and removals lower the count.
+
+    :param connection: Database connection borrowed from the pool
+    :param filter_field: The field to filter on (e.g., "id", "first_name")
+    :param value: value for filter
+    :param variant: Other request parameters changing the response.
+    :return: Quoted ETag.
+    """
+    query = EMPLOYEE_VERSION_QUERIES.get(filter_field) or employee_data_query(filter_field, version=True)
+
+    async with connection.cursor() as cursor:
+        with metrics.named_query(f"employee_data_etag:{filter_field}"):
+            await cursor.execute(query, [value], prepare=True)
+        count, updated_at = await cursor.fetchone()  # type: ignore
+
+    version = f"{filter_field}:{value}:{variant}:{count}:{updated_at.isoformat() if updated_at else ''}"
+    return '"{}"'.format(hashlib.sha256(version.encode()).hexdigest()[:32])
+
+
+def employee_page_etag(
+    filter_field: str, value: Any, limit: int, after: int | None, rows: List[Dict[str, Any]]
+) -> str:
+    """
+    Compute the strong ETag of a page of employee data from its rows.
+
+    The page is read in one query, so the ETag matches the data returned, and only the rows of the page are
+    read. It changes when an employee of the page is added, removed or updated.
+
+    :param filter_field: The field filtered on
+    :param value: value for filter
+    :param limit: Page size
+    :param after: Cursor of the page
+    :param rows: Rows of the page, with their updated_at, fetched with a limit one larger than the page size.
+    :return: Quoted ETag.
+    """
+    versions = ",".join(f"{row['id']}@{row['updated_at'].isoformat()}" for row in rows)
+    version = f"{filter_field}:{value}:{limit}:{after}:{versions}"
+    return '"{}"'.format(hashlib.sha256(version.encode()).hexdigest()[:32])
+
+
+def set_cache_headers(response: Response, etag: str) -> None:
+    """Set the ETag and Cache-Control headers of an employee data response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = EMPLOYEE_CACHE_CONTROL
+
+
+def employee_page(rows: List[Dict[str, Any]], limit: int) -> Dict[str, Any]:
+    """
+    Build a page of employee data from rows fetched with a limit one larger than the page size.
+
+    :param rows: Rows ordered by employee id, at most limit + 1.
+    :param limit: Page size.
+    :return: The page items and the cursor for the next page, None on the last page.
+    """
+    items = rows[:limit]
+    next_cursor = items[-1]["id"] if len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@employees_data_router.get("/search_employees/", response_model=List[EmployeeResponseModel], description="""
+    - Combine any of the filters, at least one is required.
+
+    - First and last names match case-insensitive prefixes and similar names (pg_trgm similarity),
+      the best matches first. The other filters match exactly.
+    """)
+async def search_employees(
+    employee_id: int | None = Query(default=None, alias="id"),
+    first_name: str | None = Query(default=None, min_length=1),
+    last_name: str | None = Query(default=None, min_length=1),
+    department: DepartmentIdRequest | None = None,
+    position: PositionIdRequest | None = None,
+    status: str | None = None,
+    limit: int = Query(default=settings.employee_page_size, ge=1, le=settings.employee_page_max_size),
+    connection: AsyncConnection = Depends(db_connect.get_db_connection),
+) -> List[Dict[str, Any]]:
+    """
+    Search employees on several criteria.
+
+    :param limit: Maximum number of results
+    :return: Matching employee data from all tables, ranked.
+    """
+    values = {
+        "id": employee_id,
+        "first_name": first_name,
+        "last_name": last_name,
+        "department": department.value if department else None,
+        "position": position.value if position else None,
+        "status": status,
+    }
+    filters = {field: value for field, value in values.items() if value is not None}
+    if not filters:
+        raise HTTPException(status_code=400, detail="At least one search filter is required.")
+
+    logger.info("Searching employee data by %s ...", ", ".join(filters), extra=SAMPLED)
+    query, params = employee_search_query(filters)
+
+    async with connection.cursor() as cursor:
+        await cursor.execute(query, {**params, "limit": limit})
+        rows = await cursor.fetchall()
+        col_names = [desc[0] for desc in cursor.description]  # type: ignore
+
+    if not rows:
+        raise HTTPException(status_code=404, detail="Employee not found")
+
+    logger.info("Employee data retrieved successfully. Results: %s", len(rows), extra=SAMPLED)
+    return [dict(zip(col_names, row)) for row in rows]
+
+
 @employees_data_router.get("/get_employee_data/by_id/{employee_id}", response_model=List[EmployeeResponseModel])
-async def get_employee_data_by_id(employee_id: int) -> List[Dict[str, Any]]:
+async def get_employee_data_by_id(
+    employee_id: int,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+) -> List[EmployeeResponseModel] | Response:
     """
-    Retrieve employee data using employee ID.
+    Retrieve employee data using employee ID, from the employee cache if available.
+
+    A connection is only borrowed from the pool when the employee is not cached.
 
     :param employee_id: Employee ID
     :return: Employee data from all tables, if available.
     """
-    logger.info("Retrieving employee data using ID ...")
-    result = fetch_employee_data(
-        filter_field="id",
-        value=employee_id
-    )
+    logger.info("Retrieving employee data using ID ...", extra=SAMPLED)
+    cached = employee_cache.cache.get(employee_id)
+
+    if cached is None:
+        generation = employee_cache.cache.generation
+        async with db_connect.db_pool.connection() as connection:
+            etag = await employee_data_etag(connection, "id", employee_id)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag, EMPLOYEE_CACHE_CONTROL)
+
+            result = await fetch_employee_data(
+                connection=connection,
+                filter_field="id",
+                value=employee_id
+            )
 
-    if not result:
-        raise HTTPException(status_code=404, detail="Employee not found")
+        if not result:
+            raise HTTPException(status_code=404, detail="Employee not found")
 
-    logger.info("Employee data retrieved successfully.")
-    return result
+        cached = ([EmployeeResponseModel.model_validate(row) for row in result], etag)
+        employee_cache.cache.put(employee_id, cached, generation)
+
+    employees, etag = cached
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, EMPLOYEE_CACHE_CONTROL)
+
+    logger.info("Employee data retrieved successfully.", extra=SAMPLED)
+    set_cache_headers(response, etag)
+    return employees
 
 
 @employees_data_router.get("/get_employee_data/by_first_name/{first_name}", response_model=List[EmployeeResponseModel])
-async def get_employee_data_by_first_name(first_name: str) -> List[Dict[str, Any]]:
+async def get_employee_data_by_first_name(
+    first_name: str,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    connection: AsyncConnection = Depends(db_connect.get_db_connection),
+) -> List[Dict[str, Any]] | Response:
     """
     Retrieve employee data using employee first name.
 
     :param first_name: Employee first name
     :return: Employee data from all tables, if available.
     """
-    logger.info("Retrieving employee data by first name ...")
-    result = fetch_employee_data(
+    logger.info("Retrieving employee data by first name ...", extra=SAMPLED)
+    etag = await employee_data_etag(connection, "first_name", first_name.capitalize())
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, EMPLOYEE_CACHE_CONTROL)
+
+    result = await fetch_employee_data(
+        connection=connection,
         filter_field="first_name",
         value=first_name.capitalize()
     )
@@ -124,20 +435,31 @@ async def get_employee_data_by_first_name(first_name: str) -> List[Dict[str, Any
     if not result:
         raise HTTPException(status_code=404, detail="Employee not found")
 
-    logger.info("Employee data retrieved successfully.")
+    logger.info("Employee data retrieved successfully.", extra=SAMPLED)
+    set_cache_headers(response, etag)
     return result
 
 
 @employees_data_router.get("/get_employee_data/by_last_name/{last_name}", response_model=List[EmployeeResponseModel])
-async def get_employee_data_by_last_name(last_name: str) -> List[Dict[str, Any]]:
+async def get_employee_data_by_last_name(
+    last_name: str,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    connection: AsyncConnection = Depends(db_connect.get_db_connection),
+) -> List[Dict[str, Any]] | Response:
     """
     Retrieve employee data using employee last name.
 
     :param last_name: Employee last name
     :return: Employee data from all tables, if available.
     """
-    logger.info("Retrieving employee data by last name ...")
-    result = fetch_employee_data(
+    logger.info("Retrieving employee data by last name ...", extra=SAMPLED)
+    etag = await employee_data_etag(connection, "last_name", last_name.capitalize())
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, EMPLOYEE_CACHE_CONTROL)
+
+    result = await fetch_employee_data(
+        connection=connection,
         filter_field="last_name",
         value=last_name.capitalize()
     )
@@ -145,47 +467,84 @@ async def get_employee_data_by_last_name(last_name: str) -> List[Dict[str, Any]]
     if not result:
         raise HTTPException(status_code=404, detail="Employee not found")
 
-    logger.info("Employee data retrieved successfully.")
+    logger.info("Employee data retrieved successfully.", extra=SAMPLED)
+    set_cache_headers(response, etag)
     return result
 
 
-@employees_data_router.get("/get_employee_data/by_department/{department}", response_model=List[EmployeeResponseModel])
-async def get_employee_data_by_department(department: DepartmentIdRequest) -> List[Dict[str, Any]]:
+@employees_data_router.get("/get_employee_data/by_department/{department}", response_model=PaginatedEmployeeResponseModel)
+async def get_employee_data_by_department(
+    department: DepartmentIdRequest,
+    response: Response,
+    limit: int = Query(default=settings.employee_page_size, ge=1, le=settings.employee_page_max_size),
+    after: int | None = Query(default=None, ge=0),
+    if_none_match: str | None = Header(default=None),
+    connection: AsyncConnection = Depends(db_connect.get_db_connection),
+) -> Dict[str, Any] | Response:
     """
     Retrieve employee data using department. This returns at least one result if available.
+    Results are paginated by employee id, pass the returned next_cursor as after to get the next page.
 
     :param department: Department name
-    :return: Employee data from all tables, if available.
+    :param limit: Page size
+    :param after: Cursor returned with the previous page
+    :return: Page of employee data from all tables, if available.
     """
-    logger.info("Retrieving employee data by department ...")
-    result = fetch_employee_data(
+    logger.info("Retrieving employee data by department ...", extra=SAMPLED)
+    result = await fetch_employee_data(
+        connection=connection,
         filter_field="department",
-        value=department
+        value=department.value,
+        limit=limit + 1,
+        after=after,
     )
 
-    if not result:
+    if not result and after is None:
         raise HTTPException(status_code=404, detail="Employee not found")
 
-    logger.info("Employee data retrieved successfully.")
-    return result
+    etag = employee_page_etag("department", department.value, limit, after, result)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, EMPLOYEE_CACHE_CONTROL)
+
+    logger.info("Employee data retrieved successfully.", extra=SAMPLED)
+    set_cache_headers(response, etag)
+    return employee_page(result, limit)
 
 
-@employees_data_router.get("/get_employee_data/by_position/{position}", response_model=List[EmployeeResponseModel])
-async def get_employee_data_by_position(position: PositionIdRequest) -> List[Dict[str, Any]]:
+@employees_data_router.get("/get_employee_data/by_position/{position}", response_model=PaginatedEmployeeResponseModel)
+async def get_employee_data_by_position(
+    position: PositionIdRequest,
+    response: Response,
+    limit: int = Query(default=settings.employee_page_size, ge=1, le=settings.employee_page_max_size),
+    after: int | None = Query(default=None, ge=0),
+    if_none_match: str | None = Header(default=None),
+    connection: AsyncConnection = Depends(db_connect.get_db_connection),
+) -> Dict[str, Any] | Response:
     """
-    Retrieve employee data using department. This returns at least one result if available.
+    Retrieve employee data using position. This returns at least one result if available.
+    Results are paginated by employee id, pass the returned next_cursor as after to get the next page.
 
     :param position: Employee position
-    :return: Employee data from all tables, if available.
+    :param limit: Page size
+    :param after: Cursor returned with the previous page
+    :return: Page of employee data from all tables, if available.
     """
-    logger.info("Retrieving employee data by position ...")
-    result = fetch_employee_data(
+    logger.info("Retrieving employee data by position ...", extra=SAMPLED)
+    result = await fetch_employee_data(
+        connection=connection,
         filter_field="position",
-        value=position
+        value=position.value,
+        limit=limit + 1,
+        after=after,
     )
 
-    if not result:
+    if not result and after is None:
         raise HTTPException(status_code=404, detail="Employee not found")
 
-    logger.info("Employee data retrieved successfully.")
-    return result
+    etag = employee_page_etag("position", position.value, limit, after, result)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, EMPLOYEE_CACHE_CONTROL)
+
+    logger.info("Employee data retrieved successfully.", extra=SAMPLED)
+    set_cache_headers(response, etag)
+    return employee_page(result, limit)
@@ -0,0 +1,271 @@
+"""
+This module contains the API endpoint for exporting the employee directory.
+Employees are read with a named server-side cursor in batches and streamed to the client while they are
+read, so the memory used stays the same however many employees are exported. The export can be filtered on
+the same fields as the employee data endpoints.
+
+Besides NDJSON and CSV, employees can be exported in columnar form as an Arrow IPC stream or a Parquet file,
+with typed dates and dictionary-encoded department, position and gender, to be loaded into a DataFrame
+without converting row by row.
+"""
+import csv
+import io
+import json
+from datetime import date
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from psycopg import sql
+
+from api.endpoints.employees import employee_filter_clause, employee_select_query
+from api.input_data_validations.pydantic_validations import (
+    DepartmentIdRequest,
+    ExportFormat,
+    PositionIdRequest,
+)
+from app.config.config import settings
+from app.logger.log_handler import SAMPLED, get_logger
+from backend import db_connect, reference_data
+
+
+export_router = APIRouter(prefix="/v1", tags=["Employee Data"])
+logger = get_logger(__name__)
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+    ExportFormat.arrow: "application/vnd.apache.arrow.stream",
+    ExportFormat.parquet: "application/vnd.apache.parquet",
+}
+
+DICTIONARY_COLUMNS = ("department", "position", "gender")
+
+EMPLOYEE_ARROW_SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("first_name", pa.string()),
+    ("middle_name", pa.string()),
+    ("last_name", pa.string()),
+    ("email", pa.string()),
+    ("phone", pa.string()),
+    ("address", pa.string()),
+    ("salary", pa.float64()),
+    ("department", pa.dictionary(pa.int32(), pa.string())),
+    ("position", pa.dictionary(pa.int32(), pa.string())),
+    ("gender", pa.dictionary(pa.int32(), pa.string())),
+    ("date_of_birth", pa.date32()),
+    ("hired_date", pa.date32()),
+    ("status", pa.string()),
+    ("date_resigned", pa.date32()),
+])
+
+
+class ChunkSink(io.RawIOBase):
+    """Writable file that hands out the bytes written since the last take, keeping the write position."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.chunks: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self.chunks.append(chunk)
+        self.position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self.position
+
+    def take(self) -> bytes:
+        """Get and drop the bytes written so far."""
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def employee_export_query(filter_fields: List[str]) -> sql.Composed:
+    """
+    Compose the employee export query, ordered by employee id.
+
+    :param filter_fields: Fields to filter on, all conditions must match.
+    :return: Query with a placeholder for the value of every filter field, in order.
+    """
+    return employee_select_query(
+        where_clause=employee_filter_clause(filter_fields),
+        tail_clause=sql.SQL("ORDER BY e.id"),
+    )
+
+
+def json_value(value: Any) -> Any:
+    """Convert database values that JSON can't represent."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+async def employee_batches(filters: Dict[str, Any]) -> AsyncIterator[List[Tuple[Any, ...]]]:
+    """
+    Read the employees matching the filters batch by batch.
+
+    The connection is borrowed from the pool for as long as the response is streamed, the named cursor
+    lives in its transaction and is closed with it.
+
+    :param filters: Filter values by field.
+    :return: Async iterator of batches of employee rows, in settings.EMPLOYEES_COLUMN order.
+    """
+    query = employee_export_query(list(filters))
+    exported = 0
+
+    async with db_connect.db_pool.connection() as connection:
+        async with connection.cursor(name="employee_export") as cursor:
+            await cursor.execute(query, list(filters.values()))
+            while rows := await cursor.fetchmany(settings.export_batch_size):
+                exported += len(rows)
+                yield rows
+
+    logger.info("Employee export completed. Employees exported: %s", exported, extra=SAMPLED)
+
+
+async def stream_text(filters: Dict[str, Any], export_format: ExportFormat) -> AsyncIterator[str]:
+    """
+    Stream the employees matching the filters as NDJSON or CSV.
+
+    :param filters: Filter values by field.
+    :param export_format: NDJSON or CSV.
+    :return: Async iterator of serialized batches of employees.
+    """
+    columns = settings.EMPLOYEES_COLUMN
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if export_format == ExportFormat.csv:
+        writer.writerow(columns)
+
+    async for rows in employee_batches(filters):
+        if export_format == ExportFormat.csv:
+            writer.writerows(rows)
+        else:
+            for row in rows:
+                buffer.write(json.dumps(dict(zip(columns, row)), default=json_value))
+                buffer.write("\n")
+
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    # Only the CSV header is left when no employee matches
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def arrow_batch(rows: List[Tuple[Any, ...]], dictionaries: Dict[str, pa.Array]) -> pa.RecordBatch:
+    """
+    Convert a batch of employee rows to an Arrow record batch of EMPLOYEE_ARROW_SCHEMA.
+
+    :param rows: Employee rows in settings.EMPLOYEES_COLUMN order.
+    :param dictionaries: Names of every dictionary-encoded column, ordered by id.
+    :return: Record batch.
+    """
+    arrays = []
+    for field, values in zip(EMPLOYEE_ARROW_SCHEMA, zip(*rows)):
+        if field.name in dictionaries:
+            dictionary = dictionaries[field.name]
+            indices = pc.index_in(pa.array(values, pa.string()), value_set=dictionary)
+            arrays.append(pa.DictionaryArray.from_arrays(indices, dictionary))
+        elif field.name == "salary":
+            arrays.append(pa.array(values, pa.decimal128(10, 2)).cast(field.type))
+        else:
+            arrays.append(pa.array(values, field.type))
+
+    return pa.RecordBatch.from_arrays(arrays, schema=EMPLOYEE_ARROW_SCHEMA)
+
+
+async def stream_columnar(filters: Dict[str, Any], export_format: ExportFormat) -> AsyncIterator[bytes]:
+    """
+    Stream the employees matching the filters as an Arrow IPC stream or a Parquet file.
+
+    The dictionaries are the whole reference tables, so they are the same for every batch.
+
+    :param filters: Filter values by field.
+    :param export_format: Arrow or Parquet.
+    :return: Async iterator of the bytes of the stream or file.
+    """
+    dictionaries = {}
+    for name in DICTIONARY_COLUMNS:
+        table = await reference_data.cache.get_table(name)
+        dictionaries[name] = pa.array([table.by_id[row_id] for row_id in sorted(table.by_id)], pa.string())
+
+    sink = ChunkSink()
+    if export_format == ExportFormat.parquet:
+        writer = pq.ParquetWriter(sink, EMPLOYEE_ARROW_SCHEMA)
+    else:
+        writer = pa.ipc.new_stream(sink, EMPLOYEE_ARROW_SCHEMA)
+
+    try:
+        async for rows in employee_batches(filters):
+            batch = arrow_batch(rows, dictionaries)
+            if export_format == ExportFormat.parquet:
+                writer.write_table(pa.Table.from_batches([batch]))
+            else:
+                writer.write_batch(batch)
+            yield sink.take()
+    finally:
+        writer.close()
+
+    yield sink.take()
+
+
+@export_router.get("/export_employees/", description="""
+    - Streams all employees matching the filters, ordered by employee id, as NDJSON, CSV with a header row,
+      an Arrow IPC stream or a Parquet file.
+
+    - In the Arrow and Parquet formats dates are typed and department, position and gender dictionary-encoded.
+
+    - Filters are optional and combined, the whole directory is exported without any.
+    """)
+async def export_employees(
+    export_format: ExportFormat = Query(default=ExportFormat.ndjson, alias="format"),
+    employee_id: int | None = Query(default=None, alias="id"),
+    first_name: str | None = None,
+    last_name: str | None = None,
+    department: DepartmentIdRequest | None = None,
+    position: PositionIdRequest | None = None,
+    status: str | None = None,
+) -> StreamingResponse:
+    """
+    Export employee data.
+
+    :param export_format: NDJSON, CSV, Arrow or Parquet.
+    :return: Streamed employee data from all tables.
+    """
+    values = {
+        "id": employee_id,
+        "first_name": first_name.capitalize() if first_name else None,
+        "last_name": last_name.capitalize() if last_name else None,
+        "department": department.value if department else None,
+        "position": position.value if position else None,
+        "status": status,
+    }
+    filters = {field: value for field, value in values.items() if value is not None}
+
+    logger.info("Exporting employee data as %s ...", export_format.value, extra=SAMPLED)
+
+    if export_format in (ExportFormat.arrow, ExportFormat.parquet):
+        content = stream_columnar(filters, export_format)
+    else:
+        content = stream_text(filters, export_format)
+
+    return StreamingResponse(
+        content,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="employees.{export_format.value}"'},
+    )
@@ -1,51 +1,69 @@
 """
 This module defines API endpoints for retrieving IDs for employee gender, department, and position.
 It includes GET endpoints that accept specific parameters (gender, department, or position) and
-return the corresponding ID from the database. The endpoints handle database interactions,
-including executing SQL queries to fetch the required IDs, and include error handling to manage
-potential issues during the retrieval process.   
+return the corresponding ID. The IDs are served from the in-memory reference data cache, which is
+loaded from the database at startup and refreshed when its TTL expires or on request. The endpoints
+include error handling to manage potential issues during the retrieval process.
 """
 from typing import Dict
 
 from fastapi import (
     APIRouter,
+    Header,
     HTTPException,
+    Response,
 )
-from psycopg2 import sql
+from fastapi.responses import JSONResponse
 
+from api.conditional_requests import etag_matches, not_modified
 from api.input_data_validations.pydantic_validations import (
     DepartmentIdRequest,
     GenderIdRequest,
     PositionIdRequest,
 )
-from app.config.config import settings
-from app.logger.log_handler import logger
-from backend import db_connect
+from app.logger.log_handler import SAMPLED, get_logger
+from backend import reference_data
 
 
 id_router = APIRouter(prefix="/v1", tags=["ID Retrieval"])
+logger = get_logger(__name__)
+
+REFERENCE_CACHE_CONTROL = "no-cache"
+
+
+@id_router.get("/reference")
+async def get_reference_data(if_none_match: str | None = Header(default=None)) -> Response:
+    """
+    Get all genders, departments, positions and roles with their ids in one response.
+
+    The response carries an ETag. Clients send it back in the If-None-Match header to revalidate their
+    copy, and get an empty 304 response if it is still current.
+    """
+    try:
+        bundle, etag = await reference_data.cache.get_bundle()
+    except Exception as e:
+        logger.error("Unexpected error occurred while retrieving reference data. Message: %s", str(e))
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, REFERENCE_CACHE_CONTROL)
+
+    return JSONResponse(content=bundle, headers={"ETag": etag, "Cache-Control": REFERENCE_CACHE_CONTROL})
 
 
 @id_router.get("/get_gender_id/{gender}")
 async def get_gender_id(gender: GenderIdRequest) -> Dict[str, int]:
     """Get employee gender id."""
-    logger.info("Retrieving Employee gender id  ...")
+    logger.info("Retrieving Employee gender id  ...", extra=SAMPLED)
     try:
-        with db_connect.db_client.cursor() as cursor:
-            query = sql.SQL("SELECT id FROM {} WHERE gender = %s").format(
-                sql.Identifier(settings.gender_table_name)
-            )
-            cursor.execute(query, (gender,))
-            employee_gender_id = cursor.fetchone()
-
-            if employee_gender_id:
-                logger.info(
-                    f"Gender ID retrieved successfully. Value: {employee_gender_id[0]}"
-                )
-                return {"value": employee_gender_id[0]}
-            else:
-                logger.info("Gender ID not retrieved.")
-                return {"value": False}
+        employee_gender_id = await reference_data.cache.get_id("gender", gender.value)
+
+        if employee_gender_id:
+            logger.info("Gender ID retrieved successfully. Value: %s", employee_gender_id, extra=SAMPLED)
+            return {"value": employee_gender_id}
+        else:
+            logger.info("Gender ID not retrieved.", extra=SAMPLED)
+            return {"value": False}
 
     except Exception as e:
         logger.error("Unexpected error occurred while retrieving id for employee gender. Message: %s", str(e))
@@ -55,21 +73,16 @@ async def get_gender_id(gender: GenderIdRequest) -> Dict[str, int]:
 @id_router.get("/get_department_id/{department}")
 async def get_department_id(department: DepartmentIdRequest) -> Dict[str, int]:
     """Get employee department id."""
-    logger.info("Retrieving Employee department id ...")
+    logger.info("Retrieving Employee department id ...", extra=SAMPLED)
     try:
-        with db_connect.db_client.cursor() as cursor:
-            query = sql.SQL("SELECT id FROM {} WHERE department = %s").format(
-                sql.Identifier(settings.dept_table_name)
-            )
-            cursor.execute(query, (department,))
-            employee_dept_id = cursor.fetchone()
-
-            if employee_dept_id:
-                logger.info("Department ID retrieved successfully.")
-                return {"value": employee_dept_id[0]}
-            else:
-                logger.info("Department ID not retrieved.")
-                return {"value": False}
+        employee_dept_id = await reference_data.cache.get_id("department", department.value)
+
+        if employee_dept_id:
+            logger.info("Department ID retrieved successfully.", extra=SAMPLED)
+            return {"value": employee_dept_id}
+        else:
+            logger.info("Department ID not retrieved.", extra=SAMPLED)
+            return {"value": False}
 
     except Exception as e:
         logger.error("Unexpected error occurred while retrieving id for department. Message: %s", str(e))
@@ -79,22 +92,30 @@ async def get_department_id(department: DepartmentIdRequest) -> Dict[str, int]:
 @id_router.get("/get_position_id/{position}")
 async def get_position_id(position: PositionIdRequest) -> Dict[str, int]:
     """Get employee position id."""
-    logger.info("Retrieving Employee position id ...")
+    logger.info("Retrieving Employee position id ...", extra=SAMPLED)
     try:
-        with db_connect.db_client.cursor() as cursor:
-            query = sql.SQL("SELECT id FROM {} WHERE position = %s").format(
-                sql.Identifier(settings.position_table_name)
-            )
-            cursor.execute(query, (position,))
-            employee_position_id = cursor.fetchone()
-
-            if employee_position_id:
-                logger.info("Position ID retrieved successfully.")
-                return {"value": employee_position_id[0]}
-            else:
-                logger.info("Position ID not retrieved.")
-                return {"value": False}
+        employee_position_id = await reference_data.cache.get_id("position", position.value)
+
+        if employee_position_id:
+            logger.info("Position ID retrieved successfully.", extra=SAMPLED)
+            return {"value": employee_position_id}
+        else:
+            logger.info("Position ID not retrieved.", extra=SAMPLED)
+            return {"value": False}
 
     except Exception as e:
         logger.error("Unexpected error occurred while retrieving id for employee position. Message: %s", str(e))
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+
+@id_router.post("/refresh_reference_data/")
+async def refresh_reference_data() -> Dict[str, bool]:
+    """Reload the gender, department, position and role ids from the database."""
+    logger.info("Refreshing reference data ...")
+    try:
+        await reference_data.cache.refresh()
+        return {"success": True}
+
+    except Exception as e:
+        logger.error("Unexpected error occurred while refreshing reference data. Message: %s", str(e))
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
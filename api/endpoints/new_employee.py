@@ -5,43 +5,50 @@ and inserts the new employee record into the database. The endpoint includes err
 potential issues during the insertion process, such as database errors or validation failures,
 and returns appropriate responses based on the outcome of the operation.
 """
-from typing import Dict
+from typing import Any, Dict
 
-from fastapi import APIRouter, HTTPException
-from psycopg2.errors import (
+from fastapi import APIRouter, Depends, HTTPException
+from psycopg import AsyncConnection, sql
+from psycopg.errors import (
     OperationalError,
     UniqueViolation,
     InFailedSqlTransaction,
 )
 
-from api.input_data_validations.pydantic_validations import EmployeeCreateRequest
-from app.logger.log_handler import logger
+from api import employee_cache
+from api.input_data_validations.pydantic_validations import EmployeeCreateByNameRequest, EmployeeCreateRequest
+from app.config.config import settings
+from app.logger.log_handler import SAMPLED, get_logger
 from backend import db_connect
 
 
 router = APIRouter(prefix="/v1", tags=["Add New Employee"])
+logger = get_logger(__name__)
 
 
 @router.post("/add_new_employee/")
-def add_new_employee(employee: EmployeeCreateRequest) -> Dict[str, str]:
+async def add_new_employee(
+    employee: EmployeeCreateRequest,
+    connection: AsyncConnection = Depends(db_connect.get_db_connection),
+) -> Dict[str, str]:
     """
     Add new employee details to the employees table.
 
     :param employee: Employee details.
     :return: Success if added, failed is not.
     """
-    logger.info("Adding new employee to the database ...")
+    logger.info("Adding new employee to the database ...", extra=SAMPLED)
 
     query = """
         INSERT INTO employee (
         first_name, middle_name, last_name, email, phone, address, salary, department_id, position_id, gender_id, date_of_birth, hired_date, status)
         VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        RETURNING first_name last_name;
+        RETURNING id, first_name;
     """
 
     try:
-        with db_connect.db_client.cursor() as cursor:
-            cursor.execute(
+        async with connection.cursor() as cursor:
+            await cursor.execute(
                 query,
                 (
                     employee.first_name,
@@ -59,11 +66,12 @@ def add_new_employee(employee: EmployeeCreateRequest) -> Dict[str, str]:
                     employee.status
                 ),
             )
-            inserted_name = cursor.fetchone()[0]  # type: ignore
+            employee_id, inserted_name = await cursor.fetchone()  # type: ignore
 
-        db_connect.db_client.commit()
+        await connection.commit()
+        employee_cache.cache.invalidate(employee_id)
 
-        logger.info(f"{inserted_name} added successfully as an employee.")
+        logger.info("%s added successfully as an employee.", inserted_name, extra=SAMPLED)
 
         return {
             "status": "Success",
@@ -71,11 +79,113 @@ def add_new_employee(employee: EmployeeCreateRequest) -> Dict[str, str]:
         }
 
     except (InFailedSqlTransaction, OperationalError, UniqueViolation) as e:
-        db_connect.db_client.rollback()
+        await connection.rollback()
         logger.error("Failed to add new employee to the database. Message: %s", str(e))
         raise HTTPException(status_code=400, detail=f"Failed to add employee: {str(e)}")
 
     except Exception as e:
-        db_connect.db_client.rollback()
+        await connection.rollback()
         logger.error("Unexpected error occurred while adding employee. Message: %s", str(e))
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+
+@router.post("/create_employee/", description="""
+    - Department, position and gender are given by name and resolved to their ids by the API.
+
+    - Responds with **409** and the conflicting fields if the email or phone number is already used,
+      and with **422** and the unknown names if a department, position or gender does not exist.
+    """)
+async def create_employee(
+    employee: EmployeeCreateByNameRequest,
+    connection: AsyncConnection = Depends(db_connect.get_db_connection),
+) -> Dict[str, Any]:
+    """
+    Add a new employee in one transaction, resolving department, position and gender names to their ids
+    and checking email and phone number uniqueness with the insert itself.
+
+    :param employee: Employee details.
+    :return: Success and the new employee id if added.
+    """
+    logger.info("Creating new employee ...", extra=SAMPLED)
+
+    query = sql.SQL("""
+        WITH resolved AS (
+            SELECT
+                (SELECT id FROM {department} WHERE department = %(department)s) AS department_id,
+                (SELECT id FROM {position} WHERE position = %(position)s) AS position_id,
+                (SELECT id FROM {gender} WHERE gender = %(gender)s) AS gender_id
+        ),
+        inserted AS (
+            INSERT INTO {employee} (
+                first_name, middle_name, last_name, email, phone, address, salary,
+                department_id, position_id, gender_id, date_of_birth, hired_date, status
+            )
+            SELECT
+                %(first_name)s, %(middle_name)s, %(last_name)s, %(email)s, %(phone)s, %(address)s, %(salary)s,
+                r.department_id, r.position_id, r.gender_id, %(date_of_birth)s,
+                COALESCE(%(hired_date)s, CURRENT_DATE), %(status)s
+            FROM resolved AS r
+            WHERE r.department_id IS NOT NULL AND r.position_id IS NOT NULL AND r.gender_id IS NOT NULL
+            ON CONFLICT DO NOTHING
+            RETURNING id
+        )
+        SELECT
+            (SELECT id FROM inserted),
+            r.department_id,
+            r.position_id,
+            r.gender_id,
+            EXISTS (SELECT 1 FROM {employee} WHERE email = %(email)s),
+            EXISTS (SELECT 1 FROM {employee} WHERE phone = %(phone)s)
+        FROM resolved AS r;
+    """).format(
+        employee=sql.Identifier(settings.employee_table_name),
+        department=sql.Identifier(settings.dept_table_name),
+        position=sql.Identifier(settings.position_table_name),
+        gender=sql.Identifier(settings.gender_table_name),
+    )
+
+    try:
+        async with connection.cursor() as cursor:
+            await cursor.execute(query, employee.model_dump())
+            employee_id, department_id, position_id, gender_id, email_exists, phone_exists = await cursor.fetchone()  # type: ignore
+
+        await connection.commit()
+        if employee_id is not None:
+            employee_cache.cache.invalidate(employee_id)
+
+    except Exception as e:
+        await connection.rollback()
+        logger.error("Unexpected error occurred while creating employee. Message: %s", str(e))
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+    unknown = {
+        field: getattr(employee, field)
+        for field, resolved_id in (("department", department_id), ("position", position_id), ("gender", gender_id))
+        if resolved_id is None
+    }
+    if unknown:
+        logger.error("Failed to create employee. Unknown values: %s", ", ".join(unknown))
+        raise HTTPException(status_code=422, detail={
+            "status": "Invalid",
+            "message": f"Unknown {', '.join(unknown)}.",
+            "unknown": unknown,
+        })
+
+    if employee_id is None:
+        # A row added concurrently may not be visible to the checks, report both fields then
+        conflicts = [field for field, exists in (("email", email_exists), ("phone", phone_exists)) if exists]
+        conflicts = conflicts or ["email", "phone"]
+        logger.error("Failed to create employee. Conflicting fields: %s", ", ".join(conflicts))
+        raise HTTPException(status_code=409, detail={
+            "status": "Conflict",
+            "message": f"Employee with this {' and '.join(conflicts)} already exists.",
+            "conflicts": {field: getattr(employee, field) for field in conflicts},
+        })
+
+    logger.info("Employee %s created successfully.", employee_id, extra=SAMPLED)
+
+    return {
+        "status": "Success",
+        "message": f"{employee.first_name} {employee.last_name} added successfully as an employee.",
+        "employee_id": employee_id,
+    }
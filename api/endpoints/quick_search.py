@@ -0,0 +1,64 @@
+"""
+This module contains the API endpoint searching employees in the in-memory search index of the API process.
+It answers without querying the database, for lookups made on every keystroke. The index is optional and
+only available when enabled in the settings.
+"""
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, HTTPException, Query
+
+from api import search_index
+from api.input_data_validations.pydantic_validations import (
+    DepartmentIdRequest,
+    EmployeeResponseModel,
+    PositionIdRequest,
+)
+from app.config.config import settings
+from app.logger.log_handler import SAMPLED, get_logger
+
+
+quick_search_router = APIRouter(prefix="/v1", tags=["Employee Data"])
+logger = get_logger(__name__)
+
+
+@quick_search_router.get("/quick_search/", response_model=List[EmployeeResponseModel], description="""
+    - Combine any of the filters. First and last names match case-insensitive prefixes, the others exactly.
+
+    - Served from the in-memory search index, responds with **503** if it is disabled or not loaded yet.
+    """)
+async def quick_search(
+    employee_id: int | None = Query(default=None, alias="id"),
+    first_name: str | None = Query(default=None, min_length=1),
+    last_name: str | None = Query(default=None, min_length=1),
+    email: str | None = None,
+    phone: str | None = None,
+    department: DepartmentIdRequest | None = None,
+    position: PositionIdRequest | None = None,
+    status: str | None = None,
+    limit: int = Query(default=settings.employee_page_size, ge=1, le=settings.employee_page_max_size),
+) -> List[Dict[str, Any]]:
+    """
+    Search employees in the in-memory search index.
+
+    :param limit: Maximum number of results
+    :return: Matching employee data, ordered by employee id.
+    """
+    if search_index.index is None or not search_index.index.ready:
+        raise HTTPException(status_code=503, detail="Employee search index is not available.")
+
+    values = {
+        "id": employee_id,
+        "first_name": first_name,
+        "last_name": last_name,
+        "email": email,
+        "phone": phone,
+        "department": department.value if department else None,
+        "position": position.value if position else None,
+        "status": status,
+    }
+    filters = {field: value for field, value in values.items() if value is not None}
+
+    logger.info(
+        "Searching employee data in the search index by %s ...", ", ".join(filters) or "nothing", extra=SAMPLED
+    )
+    return search_index.index.search(filters, limit)
@@ -1,5 +1,11 @@
 """API root module"""
-from fastapi import APIRouter
+from typing import Dict
+
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from api import employee_cache
+from backend import db_connect
 
 
 root_router = APIRouter(tags=["Root"])
@@ -8,3 +14,21 @@ root_router = APIRouter(tags=["Root"])
 @root_router.get("/v1/root/")
 def get_root():
     return {"message": "Hello!!! Root API running."}
+
+
+@root_router.get("/v1/db_pool_stats/")
+def get_db_pool_stats() -> Dict[str, int]:
+    """Get database connection pool statistics."""
+    return db_connect.pool_stats()
+
+
+@root_router.get("/v1/employee_cache_stats/")
+def get_employee_cache_stats() -> Dict[str, int | float]:
+    """Get employee cache size, hit, miss, eviction, expiration and invalidation counters and hit ratio."""
+    return employee_cache.cache.stats()
+
+
+@root_router.get("/metrics", include_in_schema=False)
+def get_metrics() -> Response:
+    """Get the API metrics in the Prometheus text format."""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -3,23 +3,32 @@ This module defines the API endpoints for updating employee data.
 It includes a PATCH endpoint that allows clients to update specific fields of an employee's record by providing the employee ID
 and the fields to be updated. The endpoint validates the input, constructs a dynamic SQL query based on the provided fields,
 and executes the update operation in the database. It also includes error handling to manage potential issues during the update process.
+A bulk PATCH endpoint updates many employees in one transaction, grouping the rows updating the same fields into
+UPDATE ... FROM (VALUES ...) statements, and reports the outcome of every row. A mass update endpoint changes the
+salary, department or position of every employee matching a filter in one statement.
 """
-from typing import Dict
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
 
-from fastapi import APIRouter, HTTPException
+import psycopg
+from fastapi import APIRouter, Depends, HTTPException
+from psycopg import AsyncConnection, sql
 
-from api.input_data_validations.pydantic_validations import EmployeeUpdateRequest
+from api import employee_cache
+from api.endpoints.employees import employee_filter_clause
+from api.input_data_validations.pydantic_validations import EmployeeUpdateRequest, UpdateByFilterRequest
 from app.config.config import settings
-from app.logger.log_handler import logger
-from backend import db_connect
+from app.logger.log_handler import SAMPLED, get_logger
+from backend import db_connect, metrics, reference_data
 
 
 updates_router = APIRouter(prefix="/v1", tags=["Update Employee Data"])
+logger = get_logger(__name__)
 
 
-def update_data(employee_id: int, updates: dict) -> Dict[str, bool]:
+async def update_data(connection: AsyncConnection, employee_id: int, updates: dict) -> Dict[str, bool]:
     """A helper function to update employee data."""
-    logger.info("Updating employee data ...")
+    logger.info("Updating employee data ...", extra=SAMPLED)
 
     set_clauses = []
     values = []
@@ -35,15 +44,17 @@ def update_data(employee_id: int, updates: dict) -> Dict[str, bool]:
     """
 
     try:
-        with db_connect.db_client.cursor() as cursor:
-            cursor.execute(query, (*values, employee_id))
-        db_connect.db_client.commit()
+        async with connection.cursor() as cursor:
+            with metrics.named_query("update_data"):
+                await cursor.execute(query, (*values, employee_id))
+        await connection.commit()
+        employee_cache.cache.invalidate(employee_id)
 
-        logger.info("Employee data update completed successfully.")
+        logger.info("Employee data update completed successfully.", extra=SAMPLED)
         return {"success": True}
 
     except Exception as e:
-        db_connect.db_client.rollback()
+        await connection.rollback()
         logger.error("Error updating employee data. Message: %s", str(e))
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
@@ -57,7 +68,10 @@ def update_data(employee_id: int, updates: dict) -> Dict[str, bool]:
 
     - ⚠️ Delete keys you don't want to update, instead of sending them as `null`
     """)
-async def employee_data_update(request: EmployeeUpdateRequest) -> Dict[str, bool]:
+async def employee_data_update(
+    request: EmployeeUpdateRequest,
+    connection: AsyncConnection = Depends(db_connect.get_db_connection),
+) -> Dict[str, bool]:
     """Update employee data."""
 
     # Exclude fields without any value
@@ -70,7 +84,271 @@ async def employee_data_update(request: EmployeeUpdateRequest) -> Dict[str, bool
     if not updates:
         raise HTTPException(status_code=400, detail="No update fields provided.")
 
-    return update_data(
+    return await update_data(
+        connection=connection,
         employee_id=employee_id,
         updates=updates,
     )
+
+
+# Database types of the updatable employee columns, for the VALUES lists of bulk updates
+UPDATABLE_COLUMN_TYPES = {
+    "address": "varchar",
+    "salary": "numeric",
+    "first_name": "varchar",
+    "middle_name": "varchar",
+    "last_name": "varchar",
+    "position_id": "int",
+    "department_id": "int",
+    "phone": "varchar",
+}
+
+
+def bulk_update_query(columns: Tuple[str, ...], rows: int) -> sql.Composed:
+    """
+    Compose an UPDATE ... FROM (VALUES ...) statement setting the same columns for many employees.
+
+    :param columns: Columns updated.
+    :param rows: Number of rows in the VALUES list.
+    :return: Query with placeholders for the employee id then the column values, row after row.
+    """
+    row = sql.SQL("({})").format(sql.SQL(", ").join(
+        [sql.SQL("%s::bigint")] + [sql.SQL("%s::{}").format(sql.SQL(UPDATABLE_COLUMN_TYPES[column])) for column in columns]
+    ))
+
+    return sql.SQL("""
+        UPDATE {employee} AS e
+        SET {assignments}
+        FROM (VALUES {rows}) AS v (id, {columns})
+        WHERE e.id = v.id
+        RETURNING e.id;
+    """).format(
+        employee=sql.Identifier(settings.employee_table_name),
+        assignments=sql.SQL(", ").join(
+            sql.SQL("{column} = v.{column}").format(column=sql.Identifier(column)) for column in columns
+        ),
+        rows=sql.SQL(", ").join([row] * rows),
+        columns=sql.SQL(", ").join(map(sql.Identifier, columns)),
+    )
+
+
+async def phone_owners(connection: AsyncConnection, updates: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Find the employees already using the phone numbers set by updates.
+
+    :param connection: Database connection borrowed from the pool
+    :param updates: Updates with their employee id.
+    :return: Employee id by phone number, for the phone numbers in use.
+    """
+    phones = [update["phone"] for update in updates if "phone" in update]
+    if not phones:
+        return {}
+
+    async with connection.cursor() as cursor:
+        await cursor.execute(
+            sql.SQL("SELECT phone, id FROM {} WHERE phone = ANY(%s)").format(
+                sql.Identifier(settings.employee_table_name)
+            ),
+            (phones,),
+        )
+        return dict(await cursor.fetchall())
+
+
+@updates_router.patch("/bulk_update_employee_data", tags=["Employee Data Update"], description="""
+    - Send a list of updates, each with the **employee_id** and the fields to update, as for a single update.
+
+    - All updates are applied in one transaction. The response has the outcome of every update, in order:
+      **updated**, **not_found**, **rejected** (no fields, employee repeated, phone number already used)
+      or **failed** (the database refused the update, e.g. unknown position or department id).
+    """)
+async def bulk_employee_data_update(
+    requests: List[EmployeeUpdateRequest],
+    connection: AsyncConnection = Depends(db_connect.get_db_connection),
+) -> Dict[str, Any]:
+    """Update many employees at once."""
+    if len(requests) > settings.bulk_update_max_rows:
+        raise HTTPException(
+            status_code=413, detail=f"At most {settings.bulk_update_max_rows} updates can be sent at once."
+        )
+
+    logger.info("Updating employee data in bulk. Rows: %s", len(requests))
+    updates = [request.model_dump(exclude_none=True) for request in requests]
+    results: List[Dict[str, Any]] = [{"employee_id": update["employee_id"], "status": None} for update in updates]
+
+    updated_ids = set()
+    try:
+        async with connection.transaction():
+            owners = await phone_owners(connection, updates)
+
+            # Group the rows by the set of columns they update. Only rows that will be applied claim their
+            # employee and phone number, so a valid row isn't rejected because of a rejected one.
+            groups: Dict[Tuple[str, ...], List[int]] = defaultdict(list)
+            employees_seen = set()
+            phones_seen = set()
+            for index, update in enumerate(updates):
+                columns = tuple(sorted(column for column in update if column != "employee_id"))
+                phone = update.get("phone")
+                if not columns:
+                    results[index].update(status="rejected", reason="No update fields provided.")
+                elif update["employee_id"] in employees_seen:
+                    results[index].update(status="rejected", reason="Employee is updated by an earlier row.")
+                elif phone is not None and phone in phones_seen:
+                    results[index].update(status="rejected", reason=f"Duplicate phone number in update: {phone}")
+                elif phone is not None and owners.get(phone, update["employee_id"]) != update["employee_id"]:
+                    results[index].update(status="rejected", reason=f"Phone number already exists: {phone}")
+                else:
+                    groups[columns].append(index)
+                    employees_seen.add(update["employee_id"])
+                    if phone is not None:
+                        phones_seen.add(phone)
+
+            for columns, indexes in groups.items():
+                for start in range(0, len(indexes), settings.bulk_update_batch_size):
+                    batch = indexes[start:start + settings.bulk_update_batch_size]
+                    params = [
+                        value
+                        for index in batch
+                        for value in (updates[index]["employee_id"], *(updates[index][column] for column in columns))
+                    ]
+
+                    # A savepoint per statement, a refused batch does not undo the others
+                    try:
+                        async with connection.transaction():
+                            async with connection.cursor() as cursor:
+                                await cursor.execute(bulk_update_query(columns, len(batch)), params)
+                                batch_updated = {row[0] for row in await cursor.fetchall()}
+                    except psycopg.Error as e:
+                        logger.error("Bulk update of %s failed. Message: %s", ", ".join(columns), str(e))
+                        for index in batch:
+                            results[index].update(status="failed", reason=str(e))
+                        continue
+
+                    updated_ids |= batch_updated
+                    for index in batch:
+                        results[index]["status"] = (
+                            "updated" if updates[index]["employee_id"] in batch_updated else "not_found"
+                        )
+
+    except Exception as e:
+        logger.error("Error updating employee data in bulk. Message: %s", str(e))
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+    # Committed, drop the cached copies
+    employee_cache.cache.invalidate_many(updated_ids)
+
+    logger.info("Bulk employee data update completed. Updated: %s", len(updated_ids))
+    return {
+        "status": "Success",
+        "updated": len(updated_ids),
+        "results": results,
+    }
+
+
+def mass_update_query(filter_fields: List[str], assignments: List[sql.Composable], dry_run: bool) -> sql.Composed:
+    """
+    Compose the statement updating, or counting for a dry run, all employees matching filters.
+
+    :param filter_fields: Fields to filter on, from ALLOWED_EMPLOYEE_FILTERS.
+    :param assignments: SET assignments with named placeholders.
+    :param dry_run: Count the matching employees instead of updating them.
+    :return: Query with a placeholder for the value of every filter field, in order.
+    """
+    identifiers = {
+        "employee": sql.Identifier(settings.employee_table_name),
+        "department": sql.Identifier(settings.dept_table_name),
+        "position": sql.Identifier(settings.position_table_name),
+        "where_clause": employee_filter_clause(filter_fields),
+    }
+
+    if dry_run:
+        return sql.SQL("""
+            SELECT count(*)
+            FROM {employee} AS e
+            JOIN {department} AS d ON e.department_id = d.id
+            JOIN {position} AS p ON e.position_id = p.id
+            {where_clause};
+        """).format(**identifiers)
+
+    # The filters refer to the current department and position names, joined in FROM
+    return sql.SQL("""
+        UPDATE {employee} AS e
+        SET {assignments}
+        FROM {department} AS d, {position} AS p
+        {where_clause} AND e.department_id = d.id AND e.position_id = p.id
+        RETURNING e.id;
+    """).format(assignments=sql.SQL(", ").join(assignments), **identifiers)
+
+
+@updates_router.patch("/mass_update_employee_data", tags=["Employee Data Update"], description="""
+    - Applies the same change to every employee matching the filters, at least one filter is required.
+
+    - Changes: **salary_percent** (e.g. 4 for a 4% raise) or **salary_amount** (added to the salary),
+      **department** and **position** reassign the employees.
+
+    - With **dry_run** nothing is changed, the response has the number of employees that would be.
+    """)
+async def mass_employee_data_update(
+    request: UpdateByFilterRequest,
+    connection: AsyncConnection = Depends(db_connect.get_db_connection),
+) -> Dict[str, Any]:
+    """Update all employees matching a filter."""
+    filters = request.filters.model_dump(exclude_none=True)
+    if not filters:
+        raise HTTPException(status_code=400, detail="At least one filter is required.")
+
+    if request.salary_percent is not None and request.salary_amount is not None:
+        raise HTTPException(status_code=400, detail="Send either salary_percent or salary_amount, not both.")
+
+    # SET comes before WHERE, the assignment values are the first parameters
+    assignments: List[sql.Composable] = []
+    params: List[Any] = []
+
+    if request.salary_percent is not None:
+        assignments.append(sql.SQL("salary = round(e.salary * (1 + %s::numeric / 100), 2)"))
+        params.append(request.salary_percent)
+    if request.salary_amount is not None:
+        assignments.append(sql.SQL("salary = e.salary + %s::numeric"))
+        params.append(request.salary_amount)
+
+    for reference, value in (("department", request.department), ("position", request.position)):
+        if value is None:
+            continue
+        reference_id = await reference_data.cache.get_id(reference, value.value)
+        if reference_id is None:
+            raise HTTPException(status_code=422, detail=f"Unknown {reference}: {value.value}")
+        assignments.append(sql.SQL("{} = %s").format(sql.Identifier(f"{reference}_id")))
+        params.append(reference_id)
+
+    if not assignments:
+        raise HTTPException(status_code=400, detail="No update fields provided.")
+
+    for field in ("department", "position"):
+        if field in filters:
+            filters[field] = filters[field].value
+    for field in ("first_name", "last_name"):
+        if field in filters:
+            filters[field] = filters[field].capitalize()
+
+    query = mass_update_query(list(filters), assignments, request.dry_run)
+    logger.info("Updating employee data by %s. Dry run: %s", ", ".join(filters), request.dry_run)
+
+    try:
+        async with connection.transaction():
+            async with connection.cursor() as cursor:
+                if request.dry_run:
+                    await cursor.execute(query, list(filters.values()))
+                    affected = (await cursor.fetchone())[0]  # type: ignore
+                    return {"status": "Success", "dry_run": True, "affected": affected}
+
+                await cursor.execute(query, [*params, *filters.values()])
+                updated_ids = [row[0] for row in await cursor.fetchall()]
+
+    except Exception as e:
+        logger.error("Error updating employee data by filter. Message: %s", str(e))
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+    # Committed, drop the cached copies
+    employee_cache.cache.invalidate_many(updated_ids)
+
+    logger.info("Employee data update by filter completed. Updated: %s", len(updated_ids))
+    return {"status": "Success", "dry_run": False, "updated": len(updated_ids)}
@@ -0,0 +1,108 @@
+"""
+This module defines the API endpoints for user and admin management.
+Employees are added as users with an assigned role, to log in and view or modify employee data, and their
+logins are verified. Passwords are hashed with bcrypt on the password hashing process pool, never on the
+event loop.
+"""
+from typing import Dict
+
+from fastapi import APIRouter, Depends, HTTPException
+from psycopg import AsyncConnection, sql
+from psycopg.errors import ForeignKeyViolation, UniqueViolation
+
+from api.input_data_validations.pydantic_validations import UserCreateRequest, UserLoginRequest
+from app.config.config import settings
+from app.logger.log_handler import logger
+from backend import db_connect, password_hashing
+
+
+router = APIRouter(prefix="/v1", tags=["Admin and User Management"])
+
+
+@router.post("/add_user/")
+async def add_new_user(
+    user: UserCreateRequest,
+    connection: AsyncConnection = Depends(db_connect.get_db_connection),
+) -> Dict[str, str]:
+    """
+    Add new user to the user's database with assigned role as admin or user.
+
+    User role: can only view employee data.
+    Admin role: can perform all operations including addin, deleting and updating data.
+    """
+    logger.info("Adding new user to the database ...")
+
+    query = sql.SQL("""
+        INSERT INTO {users} (first_name, last_name, email, role, password, employee_id)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        RETURNING first_name, last_name;
+    """).format(users=sql.Identifier(settings.users_table_name))
+
+    try:
+        encrypted_password = await password_hashing.hash_password(user.password)
+
+        async with connection.cursor() as cursor:
+            await cursor.execute(
+                query,
+                (
+                    user.firstname,
+                    user.lastname,
+                    user.email,
+                    user.role.value,
+                    encrypted_password,
+                    user.employee_id,
+                ),
+            )
+            first_name, last_name = await cursor.fetchone()  # type: ignore
+
+        await connection.commit()
+
+        logger.info("User added successfully.")
+
+        return {
+            "status": "Success",
+            "message": f"User {first_name} {last_name} added to database successfully",
+        }
+
+    except (ForeignKeyViolation, UniqueViolation) as e:
+        await connection.rollback()
+        logger.error("Failed to add user to the database. Message: %s", str(e))
+        raise HTTPException(status_code=400, detail=f"Failed to add user: {str(e)}")
+
+    except Exception as e:
+        await connection.rollback()
+        logger.error("Unexpected error occurred while adding user. Message: %s", str(e))
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+
+@router.post("/verify_user_login/")
+async def verify_user_login(
+    login: UserLoginRequest,
+    connection: AsyncConnection = Depends(db_connect.get_db_connection),
+) -> Dict[str, bool | str | None]:
+    """
+    Verify the email and password of a user.
+
+    :return: If the login is valid, and the role of the user if it is.
+    """
+    logger.info("Verifying user login ...")
+
+    try:
+        async with connection.cursor() as cursor:
+            await cursor.execute(
+                sql.SQL("SELECT password, role FROM {} WHERE email = %s").format(
+                    sql.Identifier(settings.users_table_name)
+                ),
+                (login.email,),
+            )
+            row = await cursor.fetchone()
+
+        # Unknown emails are checked against a dummy hash, so they take as long to answer as known ones
+        valid = await password_hashing.verify_password(login.password, row[0] if row else None)
+
+    except Exception as e:
+        logger.error("Unexpected error occurred while verifying user login. Message: %s", str(e))
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+    logger.info("User login verified. Valid: %s", valid)
+    return {"valid": valid, "role": row[1] if valid else None}  # type: ignore
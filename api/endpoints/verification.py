@@ -1,69 +1,120 @@
 """Data and users verification module"""
-from typing import Dict
+from typing import Dict, List
 
-from fastapi import APIRouter, HTTPException
-from psycopg2 import sql
+from fastapi import APIRouter, Depends, HTTPException
+from psycopg import AsyncConnection, sql
 
-from api.input_data_validations.pydantic_validations import WhoToVerify
+from api.input_data_validations.pydantic_validations import BatchVerificationRequest, WhoToVerify
 from app.config.config import settings
-from app.logger.log_handler import logger
+from app.logger.log_handler import SAMPLED, get_logger
 from backend import db_connect
 
 
 verification_router = APIRouter(prefix="/v1", tags=["Employee Email and Phone Number Verification"])
+logger = get_logger(__name__)
 
 
 @verification_router.get("/verify_email/{email}")
-async def verify_email_exists(email: str, who: WhoToVerify) -> Dict[str, bool]:
+async def verify_email_exists(
+    email: str,
+    who: WhoToVerify,
+    connection: AsyncConnection = Depends(db_connect.get_db_connection),
+) -> Dict[str, bool]:
     """Verify if email already exists."""
 
-    logger.info(f"Verifying email {email} ...")
+    logger.info("Verifying email %s ...", email, extra=SAMPLED)
 
     try:
-        with db_connect.db_client.cursor() as cursor:
+        async with connection.cursor() as cursor:
             query = sql.SQL("SELECT email from {} WHERE email = %s")
             if who == "user":
                 query = query.format(sql.Identifier(settings.users_table_name))
             elif who == "employee":
                 query = query.format(sql.Identifier(settings.employee_table_name))
 
-            cursor.execute(query, (email,))
-            user_email = cursor.fetchone()
+            await cursor.execute(query, (email,))
+            user_email = await cursor.fetchone()
 
             if user_email:
-                logger.info(f"Email {email} exists in {who} database.")
+                logger.info("Email %s exists in %s database.", email, who, extra=SAMPLED)
                 return {"exist": True}
             else:
-                logger.info(f"Email {email} does not exists in {who} database.")
+                logger.info("Email %s does not exists in %s database.", email, who, extra=SAMPLED)
                 return {"exist": False}
 
     except Exception as e:
-        logger.error(f"Unexpected error occurred while verifying email {email}: {e}")
+        logger.error("Unexpected error occurred while verifying email %s: %s", email, e)
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 
 @verification_router.get("/verify_phone_number/{phone_number}")
-async def verify_phone_number(phone_number: str) -> Dict[str, bool]:
+async def verify_phone_number(
+    phone_number: str,
+    connection: AsyncConnection = Depends(db_connect.get_db_connection),
+) -> Dict[str, bool]:
     """Verify if phone number already exists in database."""
 
-    logger.info(f"Verifying phone number {phone_number}")
+    logger.info("Verifying phone number %s", phone_number, extra=SAMPLED)
 
     try:
-        with db_connect.db_client.cursor() as cursor:
+        async with connection.cursor() as cursor:
             query = sql.SQL("SELECT phone FROM {} WHERE phone = %s").format(
                 sql.Identifier(settings.employee_table_name)
             )
-            cursor.execute(query, (phone_number,))
-            employee_phone = cursor.fetchone()
+            await cursor.execute(query, (phone_number,))
+            employee_phone = await cursor.fetchone()
 
             if employee_phone:
-                logger.info(f"Phone number {phone_number} exists.")
+                logger.info("Phone number %s exists.", phone_number, extra=SAMPLED)
                 return {"exist": True}
             else:
-                logger.info(f"Phone number {phone_number} does not exist.")
+                logger.info("Phone number %s does not exist.", phone_number, extra=SAMPLED)
                 return {"exist": False}
     except Exception as e:
-        logger.error(
-            f"Unexpected error occurred while verifying phone number {phone_number}: {e}"
-        )
+        logger.error("Unexpected error occurred while verifying phone number %s: %s", phone_number, e)
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+
+@verification_router.post("/verify_batch/")
+async def verify_batch(
+    request: BatchVerificationRequest,
+    connection: AsyncConnection = Depends(db_connect.get_db_connection),
+) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Verify if emails and phone numbers already exist, with a single query.
+
+    Emails are checked in the employee and users tables, phone numbers in the employee table.
+    Each value is mapped to the tables it already exists in, an empty list if it does not exist.
+    """
+    logger.info(
+        "Verifying %s emails and %s phone numbers ...", len(request.emails), len(request.phone_numbers), extra=SAMPLED
+    )
+
+    result: Dict[str, Dict[str, List[str]]] = {
+        "emails": {email: [] for email in request.emails},
+        "phone_numbers": {phone: [] for phone in request.phone_numbers},
+    }
+
+    try:
+        async with connection.cursor() as cursor:
+            query = sql.SQL("""
+                SELECT 'emails', email, 'employee' FROM {employee} WHERE email = ANY(%(emails)s)
+                UNION ALL
+                SELECT 'emails', email, 'users' FROM {users} WHERE email = ANY(%(emails)s)
+                UNION ALL
+                SELECT 'phone_numbers', phone, 'employee' FROM {employee} WHERE phone = ANY(%(phone_numbers)s);
+            """).format(
+                employee=sql.Identifier(settings.employee_table_name),
+                users=sql.Identifier(settings.users_table_name),
+            )
+            await cursor.execute(query, {"emails": request.emails, "phone_numbers": request.phone_numbers})
+
+            for field, value, table in await cursor.fetchall():
+                result[field][value].append(table)
+
+        logger.info("Batch verification completed.", extra=SAMPLED)
+        return result
+
+    except Exception as e:
+        logger.error("Unexpected error occurred during batch verification. Message: %s", str(e))
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
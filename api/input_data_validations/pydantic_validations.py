@@ -7,8 +7,14 @@ predefined options, enhancing data integrity and consistency across the applicat
 """
 from datetime import date
 from enum import Enum
+from typing import List
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+
+class BatchVerificationRequest(BaseModel):
+    emails: List[str] = Field(default_factory=list, max_length=1000)
+    phone_numbers: List[str] = Field(default_factory=list, max_length=1000)
 
 
 class DepartmentIdRequest(str, Enum):
@@ -20,6 +26,22 @@ class DepartmentIdRequest(str, Enum):
     data_analytics = "Data & Analytics"
 
 
+class EmployeeCreateByNameRequest(BaseModel):
+    phone: str
+    email: str
+    gender: str
+    address: str
+    salary: float
+    position: str
+    last_name: str
+    first_name: str
+    department: str
+    middle_name: str
+    date_of_birth: date
+    status: str = "Active"
+    hired_date: date | None = None
+
+
 class EmployeeCreateRequest(BaseModel):
     phone: str
     email: str
@@ -36,6 +58,22 @@ class EmployeeCreateRequest(BaseModel):
     department_id: int
 
 
+class EmployeeImportRow(BaseModel):
+    gender: str
+    position: str
+    department: str
+    phone: str = Field(max_length=20)
+    email: str = Field(max_length=50)
+    date_of_birth: date
+    hired_date: date | None = None
+    last_name: str = Field(max_length=50)
+    first_name: str = Field(max_length=50)
+    address: str = Field(max_length=255)
+    status: str = Field(default="Active", max_length=10)
+    salary: float = Field(ge=0, lt=100_000_000)
+    middle_name: str | None = Field(default=None, max_length=50)
+
+
 class EmployeeResponseModel(BaseModel):
     id: int
     email: str
@@ -66,11 +104,23 @@ class EmployeeUpdateRequest(BaseModel):
     phone: str | None = None
 
 
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+    arrow = "arrow"
+    parquet = "parquet"
+
+
 class GenderIdRequest(str, Enum):
     male = "Male"
     female = "Female"
 
 
+class PaginatedEmployeeResponseModel(BaseModel):
+    items: List[EmployeeResponseModel]
+    next_cursor: int | None = None
+
+
 class PositionIdRequest(str, Enum):
     hr = "HR"
     intern = "Intern"
@@ -89,6 +139,43 @@ class PositionIdRequest(str, Enum):
     senior_engr_mgr = "Senior Engineering Manager"
 
 
+class Role(str, Enum):
+    admin = "Admin"
+    user = "User"
+
+
+class UpdateFilter(BaseModel):
+    id: int | None = None
+    first_name: str | None = None
+    last_name: str | None = None
+    department: DepartmentIdRequest | None = None
+    position: PositionIdRequest | None = None
+    status: str | None = None
+
+
+class UpdateByFilterRequest(BaseModel):
+    filters: UpdateFilter
+    salary_percent: float | None = Field(default=None, gt=-100, le=100)
+    salary_amount: float | None = Field(default=None, gt=-1e8, lt=1e8)
+    department: DepartmentIdRequest | None = None
+    position: PositionIdRequest | None = None
+    dry_run: bool = False
+
+
+class UserCreateRequest(BaseModel):
+    role: Role
+    firstname: str = Field(max_length=50)
+    lastname: str = Field(max_length=50)
+    email: str = Field(max_length=50)
+    password: str = Field(min_length=8, max_length=72)
+    employee_id: int
+
+
+class UserLoginRequest(BaseModel):
+    email: str
+    password: str = Field(max_length=72)
+
+
 class WhoToVerify(str, Enum):
     admin = "admin"
     manager = "manager"
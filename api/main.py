@@ -8,13 +8,18 @@ from contextlib import asynccontextmanager
 from api.endpoints.root import root_router
 from api.endpoints.verification import verification_router
 from api.endpoints.ids import id_router
-# from api.endpoints.users import router as users_router
-from api.endpoints.employees import employees_data_router
+from api.endpoints.users import router as users_router
+from api.endpoints.employees import compile_employee_queries, employees_data_router
 from api.endpoints.updates import updates_router
-from app.config.config import init_settings
+from app.config.config import init_settings, settings
 from api.endpoints.new_employee import router as add_new_employee_router
+from api.endpoints.bulk_import import bulk_import_router
+from api.endpoints.export import export_router
+from api.endpoints.quick_search import quick_search_router
 # from log_handler import logger
-from backend import db_connect
+from api import employee_cache, search_index
+from api.metrics import MetricsMiddleware
+from backend import db_connect, migrations, password_hashing, reference_data
 
 
 description = """
@@ -32,9 +37,22 @@ PS: This API is for this project purpose only.
 async def lifespan(app: FastAPI) -> AsyncContextManager[Any]:  # type: ignore
     # Startup
     init_settings()
-    db_connect.db_init()
+    await db_connect.db_init()
+    async with db_connect.db_pool.connection() as connection:
+        compile_employee_queries(connection)
+    if settings.run_migrations_on_startup:
+        await migrations.run_migrations()
+    await reference_data.reference_data_init()
+    await password_hashing.hasher_init()
+    if settings.employee_cache_notify:
+        await employee_cache.employee_cache_listen_init()
+    if settings.search_index_enabled:
+        await search_index.search_index_init()
     yield  # type: ignore
-    db_connect.db_client.close()
+    await search_index.search_index_close()
+    await employee_cache.employee_cache_listen_close()
+    password_hashing.hasher_close()
+    await db_connect.db_close()
 
 
 app = FastAPI(
@@ -82,12 +100,17 @@ app.add_middleware(
     allow_headers=["*"],
     expose_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
 
 
 # Register all router modules
 app.include_router(id_router)
 app.include_router(root_router)
+app.include_router(users_router)
 app.include_router(updates_router)
 app.include_router(employees_data_router)
 app.include_router(verification_router)
 app.include_router(add_new_employee_router)
+app.include_router(bulk_import_router)
+app.include_router(export_router)
+app.include_router(quick_search_router)
@@ -0,0 +1,82 @@
+"""
+Metrics middleware of the API, and the collectors of the connection pool and employee cache statistics.
+
+The middleware records the latency of every request and counts server errors by route template, so
+requests to paths that don't match any route are all recorded under "unmatched". It also reports the database
+time of the request, and the total time, in a Server-Timing response header. Both are measured up to the
+response headers, so they don't include the body of a streamed response.
+"""
+import time
+from typing import Any, Awaitable, Callable, MutableMapping
+
+from prometheus_client import REGISTRY
+
+from api import employee_cache
+from backend import db_connect, metrics
+
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+
+
+def server_timing(timing: metrics.QueryTiming, elapsed: float) -> bytes:
+    """Server-Timing header value with the database time and the total time of a request."""
+    return f'db;dur={timing.duration * 1000:.1f};desc="{timing.count} queries", total;dur={elapsed * 1000:.1f}'.encode()
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency, server errors and in-flight requests by route."""
+
+    def __init__(self, app: Callable[[Scope, Receive, Send], Awaitable[None]]) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        timing = metrics.QueryTiming()
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                header = (b"server-timing", server_timing(timing, time.perf_counter() - start))
+                message["headers"] = [*message.get("headers", []), header]
+            await send(message)
+
+        scope_token = metrics.request_scope.set(scope)
+        timing_token = metrics.query_timing.set(timing)
+        metrics.REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.REQUESTS_IN_FLIGHT.dec()
+            metrics.query_timing.reset(timing_token)
+            metrics.request_scope.reset(scope_token)
+
+            # The route is set in the scope by the router once matched
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            metrics.REQUEST_LATENCY.labels(scope["method"], route_path).observe(elapsed)
+            if status >= 500:
+                metrics.REQUEST_ERRORS.labels(scope["method"], route_path, str(status)).inc()
+
+
+REGISTRY.register(metrics.StatsCollector(
+    "ems_db_pool",
+    "Database connection pool statistic",
+    db_connect.pool_stats,
+    gauges=("pool_min", "pool_max", "pool_size", "pool_available", "requests_waiting"),
+))
+REGISTRY.register(metrics.StatsCollector(
+    "ems_employee_cache",
+    "Employee cache statistic",
+    employee_cache.cache.stats,
+    gauges=("size", "max_size", "hit_ratio"),
+))
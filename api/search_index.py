@@ -0,0 +1,216 @@
+"""
+In-memory employee search index.
+
+All employees are loaded at startup, with the same join as the employee data endpoints, into:
+
+- a prefix trie on first and last name (case-insensitive)
+- hash maps on email and phone number
+- posting lists of employee ids per department, position and status
+
+Searches are answered from memory. The index is kept current by a listener of the employee change
+notifications, sent by the employee table triggers for every insert, update and delete statement. The employees
+changed in a burst are fetched in a single query. The whole index is reloaded when a reset is notified, e.g.
+after seeding synthetic employees. The listener reconnects and reloads the whole index if its connection is
+lost, so no change is missed.
+"""
+import asyncio
+from collections import defaultdict
+from typing import Any, Dict, List, Set
+
+from psycopg import AsyncConnection, sql
+
+from api.endpoints.employees import employee_select_query
+from app.config.config import settings
+from app.logger.log_handler import logger
+from backend import db_connect, employee_changes
+
+
+TRIE_FIELDS = ("first_name", "last_name")
+HASH_FIELDS = ("email", "phone")
+POSTING_FIELDS = ("department", "position", "status")
+
+
+class TrieNode:
+    __slots__ = ("children", "ids")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "TrieNode"] = {}
+        self.ids: Set[int] = set()
+
+
+class PrefixTrie:
+    """Prefix trie of words, every node holding the ids of all words starting with its prefix."""
+
+    def __init__(self) -> None:
+        self.root = TrieNode()
+
+    def insert(self, word: str, employee_id: int) -> None:
+        node = self.root
+        for char in word.lower():
+            node = node.children.setdefault(char, TrieNode())
+            node.ids.add(employee_id)
+
+    def remove(self, word: str, employee_id: int) -> None:
+        node = self.root
+        for char in word.lower():
+            child = node.children.get(char)
+            if child is None:
+                return
+            child.ids.discard(employee_id)
+            if not child.ids:
+                # No other word goes through this node
+                del node.children[char]
+                return
+            node = child
+
+    def search(self, prefix: str) -> Set[int]:
+        """Get the ids of all words starting with a prefix."""
+        node = self.root
+        for char in prefix.lower():
+            node = node.children.get(char)  # type: ignore
+            if node is None:
+                return set()
+        return node.ids
+
+
+class EmployeeSearchIndex:
+    """In-memory indexes over all employees."""
+
+    def __init__(self) -> None:
+        self.ready = False
+        self._clear()
+
+    def _clear(self) -> None:
+        self.employees: Dict[int, Dict[str, Any]] = {}
+        self.tries: Dict[str, PrefixTrie] = {field: PrefixTrie() for field in TRIE_FIELDS}
+        self.hashes: Dict[str, Dict[str, int]] = {field: {} for field in HASH_FIELDS}
+        self.postings: Dict[str, Dict[str, Set[int]]] = {field: defaultdict(set) for field in POSTING_FIELDS}
+
+    def add(self, employee: Dict[str, Any]) -> None:
+        """Add an employee, replacing the indexed one with the same id."""
+        employee_id = employee["id"]
+        self.remove(employee_id)
+
+        self.employees[employee_id] = employee
+        for field in TRIE_FIELDS:
+            if employee[field]:
+                self.tries[field].insert(employee[field], employee_id)
+        for field in HASH_FIELDS:
+            self.hashes[field][employee[field]] = employee_id
+        for field in POSTING_FIELDS:
+            self.postings[field][employee[field]].add(employee_id)
+
+    def remove(self, employee_id: int) -> None:
+        """Remove an employee, if indexed."""
+        employee = self.employees.pop(employee_id, None)
+        if employee is None:
+            return
+
+        for field in TRIE_FIELDS:
+            if employee[field]:
+                self.tries[field].remove(employee[field], employee_id)
+        for field in HASH_FIELDS:
+            if self.hashes[field].get(employee[field]) == employee_id:
+                del self.hashes[field][employee[field]]
+        for field in POSTING_FIELDS:
+            posting = self.postings[field].get(employee[field])
+            if posting is not None:
+                posting.discard(employee_id)
+                if not posting:
+                    del self.postings[field][employee[field]]
+
+    def search(self, filters: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+        """
+        Find the employees matching all filters.
+
+        :param filters: Filter values by field. Names match on prefix, the other fields exactly.
+        :param limit: Maximum number of results.
+        :return: Matching employees ordered by id.
+        """
+        candidates: List[Set[int]] = []
+        for field, value in filters.items():
+            if field == "id":
+                candidates.append({value} if value in self.employees else set())
+            elif field in TRIE_FIELDS:
+                candidates.append(self.tries[field].search(value))
+            elif field in HASH_FIELDS:
+                employee_id = self.hashes[field].get(value)
+                candidates.append(set() if employee_id is None else {employee_id})
+            else:
+                candidates.append(self.postings[field].get(value, set()))
+
+        # Intersect starting from the smallest set
+        candidates.sort(key=len)
+        matches = set(candidates[0]).intersection(*candidates[1:]) if candidates else set(self.employees)
+
+        return [self.employees[employee_id] for employee_id in sorted(matches)[:limit]]
+
+    async def load(self, connection: AsyncConnection) -> None:
+        """Load all employees, replacing the indexed ones."""
+        async with connection.cursor() as cursor:
+            await cursor.execute(employee_select_query(where_clause=sql.SQL(""), tail_clause=sql.SQL("ORDER BY e.id")))
+            col_names = [desc[0] for desc in cursor.description]  # type: ignore
+            rows = await cursor.fetchall()
+
+        self._clear()
+        for row in rows:
+            self.add(dict(zip(col_names, row)))
+        self.ready = True
+        logger.info("Employee search index loaded. Employees: %s", len(self.employees))
+
+    async def apply_changes(self, employee_ids: Set[int]) -> None:
+        """Reindex employees after change notifications, removing those that were deleted."""
+        async with db_connect.db_pool.connection() as connection:
+            async with connection.cursor() as cursor:
+                await cursor.execute(
+                    employee_select_query(where_clause=sql.SQL("WHERE e.id = ANY(%s)")), [list(employee_ids)]
+                )
+                col_names = [desc[0] for desc in cursor.description]  # type: ignore
+                rows = await cursor.fetchall()
+
+        found: Set[int] = set()
+        for row in rows:
+            employee = dict(zip(col_names, row))
+            found.add(employee["id"])
+            self.add(employee)
+        for employee_id in employee_ids:
+            if employee_id not in found:
+                self.remove(employee_id)
+
+    def disconnected(self) -> None:
+        """Mark the index as out of date until it is reloaded."""
+        self.ready = False
+
+    async def listen(self) -> None:
+        """Keep the index current with the employee change notifications, until cancelled."""
+        # Listening before loading, changes made during the load are applied after it
+        await employee_changes.listen(
+            "Employee search index",
+            on_reset=self.load,
+            on_changes=self.apply_changes,
+            on_disconnect=self.disconnected,
+            batch_delay=settings.search_index_batch_delay,
+            reconnect_delay=settings.search_index_reconnect_delay,
+        )
+
+
+index: EmployeeSearchIndex = None  # type: ignore
+_listener: asyncio.Task = None  # type: ignore
+
+
+async def search_index_init() -> None:
+    """Create the search index and start keeping it current in the background."""
+    global index, _listener
+
+    index = EmployeeSearchIndex()
+    _listener = asyncio.create_task(index.listen())
+
+
+async def search_index_close() -> None:
+    """Stop the search index listener."""
+    if _listener is not None:
+        _listener.cancel()
+        try:
+            await _listener
+        except asyncio.CancelledError:
+            pass
@@ -1,5 +1,5 @@
 """Configuration settings."""
-from typing import List
+from typing import Dict, List
 
 from pydantic_settings import BaseSettings
 
@@ -14,12 +14,77 @@ class Settings(BaseSettings):
     gender_table_name: str = "gender"
     position_table_name: str = "position"
     dept_table_name: str = "department"
+    role_table_name: str = "role"
+    migrations_table_name: str = "schema_migrations"
     fetch_employee_data_join_column: str = "id"
     gender_id: str = "gender_id"
     position_id: str = "position_id"
     department_id: str = "department_id"
     host: str = "ems-db"
     port: int = 5432
+    run_migrations_on_startup: bool = True
+
+    # Database Connection Pool Configs
+    db_pool_min_size: int = 1
+    db_pool_max_size: int = 10
+    db_pool_timeout: float = 30.0
+
+    # HTTP Client Configs
+    httpx_max_connections: int = 20
+    httpx_max_keepalive_connections: int = 10
+    httpx_keepalive_expiry: float = 30.0
+    httpx_timeout: float = 10.0
+    httpx_connect_timeout: float = 5.0
+    httpx_http2: bool = False
+
+    # Pagination Configs
+    employee_page_size: int = 500
+    employee_page_max_size: int = 5000
+
+    # Export Configs
+    export_batch_size: int = 1000
+
+    # Bulk Update Configs
+    bulk_update_max_rows: int = 10000
+    bulk_update_batch_size: int = 1000
+
+    # Logging Configs
+    log_max_bytes: int = 50_000_000
+    log_backup_count: int = 10
+    # Share of the per-request messages (logged with extra=SAMPLED) of a logger that are logged, for hot paths
+    log_sample_rates: Dict[str, float] = {
+        "api.endpoints.employees": 0.1,
+        "api.endpoints.ids": 0.1,
+        "api.endpoints.verification": 0.1,
+        "api.endpoints.quick_search": 0.1,
+        "api.endpoints.updates": 0.1,
+        "api.endpoints.new_employee": 0.1,
+        "api.endpoints.export": 0.1,
+    }
+
+    # Slow Query Log Configs
+    slow_query_threshold_ms: float = 500.0
+    slow_query_explain: bool = False
+
+    # Cache Configs
+    reference_data_ttl: float = 3600.0
+    reference_data_revalidate_after: float = 60.0
+    employee_data_cache_size: int = 64
+    employee_cache_size: int = 1000
+    employee_cache_ttl: float = 300.0
+    # Invalidate the employee cache from the change notifications. Disable only with a single API worker.
+    employee_cache_notify: bool = True
+    employee_cache_reconnect_delay: float = 5.0
+
+    # Search Index Configs
+    search_index_enabled: bool = False
+    search_index_reconnect_delay: float = 5.0
+    search_index_batch_delay: float = 0.05
+
+    # Password Hashing Configs
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 2
+    password_hash_queue_factor: int = 4
 
     # UI Configs
     EMPLOYEES_COLUMN: List[str] = [
@@ -80,6 +145,8 @@ class Settings(BaseSettings):
 
     GENDER: List[str] = ["Male", "Female"]
 
+    STATUSES: List[str] = ["Active", "Resigned"]
+
     ROLES: List[str] = ["Admin", "Manager", "Employee"]
 
 
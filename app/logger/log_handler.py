@@ -1,12 +1,35 @@
-"""Logger configuration"""
+"""
+Logger configuration.
+
+Logging calls only put their records on a queue, a background thread writes them to the log file and the
+console, so request handlers don't wait on file or terminal I/O. The log file has one JSON record per line, a
+file per day, rotated when it grows over the configured size.
+
+The per-request INFO messages of the hot-path endpoints are logged with extra=SAMPLED, through a logger named
+after their module with get_logger, and sampled with the rate set for that logger in log_sample_rates. Other
+records, and warnings and errors, are always logged.
+"""
+import atexit
+import json
 import logging
 import os
+import queue
+import random
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, List
 
 from colorlog import ColoredFormatter
 
+from app.config.config import settings
+
 
 logger = logging.getLogger()
+slow_query_logger = logging.getLogger("slow_queries")
+_listeners: Dict[str, QueueListener] = {}
+
+# Extra of the per-request messages that can be sampled
+SAMPLED = {"sample": True}
 
 if os.getenv("IS_DOCKER", "false").lower() == "true":
     LOG_DIRECTORY = "/ems/logs"
@@ -14,29 +37,118 @@ else:
     LOG_DIRECTORY = "./logs"
 
 
+def get_logger(name: str) -> logging.Logger:
+    """Get a logger named after a module, whose per-request messages are sampled."""
+    return logging.getLogger(name)
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as JSON lines."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps({
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "function": record.funcName,
+            "message": record.getMessage(),
+        }, default=str)
+
+
+class DailyRotatingFileHandler(RotatingFileHandler):
+    """Write to a log file per day, rotated when it grows over a maximum size."""
+
+    def __init__(self, directory: str, prefix: str, max_bytes: int, backup_count: int) -> None:
+        self.directory = directory
+        self.prefix = prefix
+        self.day = datetime.now().strftime("%Y-%m-%d")
+        super().__init__(self.day_path(self.day), maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+
+    def day_path(self, day: str) -> str:
+        return os.path.join(self.directory, f"{self.prefix}_{day}.jsonl")
+
+    def emit(self, record: logging.LogRecord) -> None:
+        day = datetime.now().strftime("%Y-%m-%d")
+        if day != self.day:
+            self.day = day
+            if self.stream:
+                self.stream.close()
+                self.stream = None  # type: ignore
+            self.baseFilename = os.path.abspath(self.day_path(day))
+        super().emit(record)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a share of the INFO and lower records logged with extra=SAMPLED, with the rate of their logger."""
+
+    def __init__(self, rates: Dict[str, float]) -> None:
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO or not getattr(record, "sample", False):
+            return True
+        rate = self.rates.get(record.name)
+        return rate is None or random.random() < rate
+
+
+def remove_handlers(target: logging.Logger) -> None:
+    """Remove the handlers of a logger, and stop its background thread after writing its queued records."""
+    for handler in target.handlers[:]:
+        target.removeHandler(handler)
+
+    listener = _listeners.pop(target.name, None)
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+@atexit.register
+def stop_logging() -> None:
+    """Write the queued records and stop the background threads."""
+    for name in list(_listeners):
+        remove_handlers(logging.getLogger(name))
+
+
+def queue_logging(target: logging.Logger, *handlers: logging.Handler) -> QueueHandler:
+    """
+    Send the records of a logger through a queue to handlers run by a background thread.
+
+    Records are formatted into their message when queued, after the filters of the queue handler, so records
+    filtered out are never formatted.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners[target.name] = listener
+
+    queue_handler = QueueHandler(log_queue)
+    target.addHandler(queue_handler)
+    return queue_handler
+
+
+def file_handler(log_directory: str, prefix: str) -> logging.Handler:
+    os.makedirs(log_directory, exist_ok=True)
+    handler = DailyRotatingFileHandler(log_directory, prefix, settings.log_max_bytes, settings.log_backup_count)
+    handler.setFormatter(JsonFormatter())
+    return handler
+
+
 def config_logging(log_directory=None, level=logging.INFO):
     """
     Create logging configuration.
 
     1. Logging to file, if log_directory is specified. The log is more detailed than printed on screen.
-       Log file name includes date and time of log creation.
+       Log file name includes the date, a new file is started every day.
     2. Logging on screen
     """
-    if log_directory is not None:
-        os.makedirs(log_directory, exist_ok=True)
-        log_path = os.path.join(log_directory, "log_" + datetime.now().strftime("%Y-%m-%d") + ".txt")
-        logger.info(f"configuring logging to file {log_path}.")
-    else:
-        log_path = os.devnull
+    remove_handlers(logger)
+    logger.setLevel(level)
 
-    for handler in logging.root.handlers[:]:
-        logging.root.removeHandler(handler)
-
-    # Configure logging to file
-    logging.basicConfig(level=level, format="%(asctime)s %(levelname)-8s %(name)s %(funcName)s %(message)s",
-                        datefmt="%Y-%m-%d %H:%M:%S",
-                        filename=log_path,
-                        filemode="a")
+    handlers: List[logging.Handler] = []
+    if log_directory is not None:
+        handlers.append(file_handler(log_directory, "log"))
 
     # Add a logging console
     console = logging.StreamHandler()
@@ -52,9 +164,29 @@ def config_logging(log_directory=None, level=logging.INFO):
                                  secondary_log_colors={},
                                  style="%")
     console.setFormatter(formatter)
-    logger.addHandler(console)
+    handlers.append(console)
+
+    queue_handler = queue_logging(logger, *handlers)
+    queue_handler.addFilter(SamplingFilter(settings.log_sample_rates))
 
-    logger.info(f"Logger configured. Logging level: {logging.getLevelName(level)}")
+    logger.info("Logger configured. Logging level: %s", logging.getLevelName(level))
+
+
+def config_slow_query_logging(log_directory=None):
+    """
+    Create the slow query log configuration.
+
+    Slow queries are logged to a file of their own, if log_directory is specified, and not to the main log.
+    """
+    remove_handlers(slow_query_logger)
+    slow_query_logger.propagate = False
+    slow_query_logger.setLevel(logging.WARNING)
+
+    if log_directory is not None:
+        queue_logging(slow_query_logger, file_handler(log_directory, "slow_queries"))
+    else:
+        slow_query_logger.addHandler(logging.NullHandler())
 
 
 config_logging(LOG_DIRECTORY)
+config_slow_query_logging(LOG_DIRECTORY)
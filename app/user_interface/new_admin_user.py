@@ -4,11 +4,10 @@ Employees with User role will have login access to view employees data only,
 while employees with Admin access will be able to add, update, delete employees data
 and also assign user and admin roles to other employees.
 """
-import asyncio
 import re
 import streamlit as st
 
-from backend import backend_modules
+from backend import backend_modules, httpx_client
 from logger.log_handler import logger
 
 
@@ -39,15 +38,15 @@ with st.form("new_user_admin_form"):
 
 async def verify_user_details(email: str) -> bool | None:
     """
-    Runs email and employee id verification concurrently.
+    Runs email verification on the employees and users tables in one call.
 
     :param email: Email address to be verified.
     :return: Returns a boolean True if it exists, False if not, and None in case of error.
     """
     try:
-        employee_task = backend_modules.verify_email(email, who="employee")
-        user_admin_task = backend_modules.verify_email(email, who="user")
-        employee_email_exists, user_admin_exists = await asyncio.gather(employee_task, user_admin_task)
+        tables = (await backend_modules.verify_batch(emails=[email]))["emails"][email]
+        employee_email_exists = "employee" in tables
+        user_admin_exists = "users" in tables
         return employee_email_exists, user_admin_exists  # type: ignore
     except Exception as e:
         st.error("Verification failed ❌.")
@@ -127,4 +126,4 @@ async def create_user() -> None:
 
 
 if submit_button:
-    asyncio.run(create_user())
+    httpx_client.run(create_user())
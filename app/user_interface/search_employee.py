@@ -1,10 +1,8 @@
 """Module to search for employees data"""
-import asyncio
-
 import streamlit as st
 import pandas as pd
 
-from backend import backend_modules
+from backend import backend_modules, httpx_client
 from config.config import settings
 
 
@@ -21,86 +19,76 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-POSITIONS = settings.POSITIONS
-DEPARTMENTS = settings.DEPARTMENTS
+ANY = "Any"
+POSITIONS = [ANY] + settings.POSITIONS
+DEPARTMENTS = [ANY] + settings.DEPARTMENTS
+STATUSES = [ANY] + settings.STATUSES
 EMPLOYEE_COLUMNS = settings.EMPLOYEES_COLUMN
 
-#  Search option mapping with client functions
-OPTIONS = {
-    "Employee ID": ("id", backend_modules.get_employee_data_by_id),
-    "Position": ("position", backend_modules.get_employee_data_by_position),
-    "Last Name": ("last_name", backend_modules.get_employee_data_by_last_name),
-    "First Name": ("first_name", backend_modules.get_employee_data_by_first_name),
-    "Department": ("department", backend_modules.get_employee_data_by_department),
-}
-
-# Input widgets definition
-input_widgets = {
-    "Department": lambda: st.selectbox("Select Department", DEPARTMENTS),
-    "Position": lambda: st.selectbox("Select Position", POSITIONS),
-    "First Name": lambda: st.text_input("Enter First Name"),
-    "Last Name": lambda: st.text_input("Enter Last Name"),
-    "Employee ID": lambda: st.text_input("Enter Employee ID"),
-}
-
-
-async def get_employees_data(search_option: str, search_query: str) -> pd.DataFrame:
+
+async def get_employees_data(
+    employee_id: str,
+    first_name: str,
+    last_name: str,
+    department: str,
+    position: str,
+    status: str,
+) -> pd.DataFrame:
     """
-    Get all data matching input parameter from the database.
+    Get all employees matching the entered criteria from the database, best name matches first.
     """
-    query = search_query.strip()
-    if not query:
-        st.error("Empty strings are not allowed. Please enter a valid search parameter.")
-        return pd.DataFrame()
-
-    field, func = OPTIONS.get(search_option, (None, None))
-    if not field or not func:
-        st.error(f"Invalid search option: {search_option}")
-        return pd.DataFrame()
+    employee_id = employee_id.strip()
+    filters = {
+        "first_name": first_name.strip(),
+        "last_name": last_name.strip(),
+        "department": "" if department == ANY else department,
+        "position": "" if position == ANY else position,
+        "status": "" if status == ANY else status,
+    }
 
     #  Special case for employee ID's to validate entered data are all integers
-    if field == "id":
-        if not query.isdigit():
+    if employee_id:
+        if not employee_id.isdigit():
             st.error("Invalid Employee ID. Please enter a numeric value.")
             return pd.DataFrame()
-        return await func(int(query))
+        filters["id"] = employee_id
+
+    filters = {field: value for field, value in filters.items() if value}
+    if not filters:
+        st.error("Please enter at least one search criterion.")
+        return pd.DataFrame()
 
-    #  Run other searches
-    return await func(query)
+    return await backend_modules.search_employees(filters)
 
 
 # Initialize session state if not already present
 if 'employees_data' not in st.session_state:
-    cols = [
-        "id", "first_name", "middle_name", "last_name", "email", "phone", "address", "salary",
-        "department", "position", "gender", "date_of_birth", "hired_date", "status", "date_resigned"
-    ]
-    st.session_state.employees_data = pd.DataFrame(columns=cols)
+    st.session_state.employees_data = pd.DataFrame(columns=EMPLOYEE_COLUMNS)
 
 st.header("Search Employee")
+st.caption("Combine any criteria. Names match from their first letters and also find similar spellings.")
 
-# Select search option
-search_option = st.selectbox(
-    "Search by",
-    ["First Name", "Last Name", "Employee ID", "Department", "Position"]
-)
-
-# Dynmaic input based selection
-if search_option == "Department":
-    search_query = st.selectbox("Select Department", DEPARTMENTS)
-elif search_option == "Position":
-    search_query = st.selectbox("Select Position", POSITIONS)
-elif search_option == "Employee ID":
-    search_query = st.text_input("Enter Employee ID")
-elif search_option == "First Name":
-    search_query = st.text_input("Enter First Name")
-else:
-    search_query = st.text_input("Enter Last Name")
+first_name_col, last_name_col, id_col = st.columns(3)
+first_name_input = first_name_col.text_input("First Name")
+last_name_input = last_name_col.text_input("Last Name")
+employee_id_input = id_col.text_input("Employee ID")
+
+department_col, position_col, status_col = st.columns(3)
+department_input = department_col.selectbox("Department", DEPARTMENTS)
+position_input = position_col.selectbox("Position", POSITIONS)
+status_input = status_col.selectbox("Status", STATUSES)
 
 
 if st.button("Search"):
-    st.session_state.employees_data = asyncio.run(
-        get_employees_data(search_option, search_query)
+    st.session_state.employees_data = httpx_client.run(
+        get_employees_data(
+            employee_id=employee_id_input,
+            first_name=first_name_input,
+            last_name=last_name_input,
+            department=department_input,
+            position=position_input,
+            status=status_input,
+        )
     )
 
 if st.session_state.employees_data is not None and not st.session_state.employees_data.empty:
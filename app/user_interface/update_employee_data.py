@@ -1,9 +1,8 @@
 """Module to update employee data."""
-import asyncio
 import streamlit as st
 import pandas as pd
 
-from backend import backend_modules
+from backend import backend_modules, httpx_client
 from config.config import settings
 
 
@@ -96,7 +95,7 @@ with st.form("employee_id_search_form"):
 
 if get_available_employee_data:
     if employee_id.strip().isdigit():
-        st.session_state.employee_data = asyncio.run(get_employee_data(int(employee_id)))
+        st.session_state.employee_data = httpx_client.run(get_employee_data(int(employee_id)))
     else:
         st.error("Invalid Employee ID. Please enter a numeric value.")
 
@@ -129,7 +128,7 @@ with st.form("employee_data_update_form"):
 if submit_button:
     st.write(f"Updating employee {data_to_update} ...")
     if employee_id.strip().isdigit():
-        success = asyncio.run(update_employee_data(
+        success = httpx_client.run(update_employee_data(
             employee_id=int(employee_id),
             data_to_update=data_to_update,
             updated_value=updated_value
@@ -1,13 +1,18 @@
 """"Backend module"""
 import os
+import time
+from collections import OrderedDict
 from datetime import date
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, List, Tuple
 
 import httpx
 import pandas as pd
+import pyarrow as pa
 from fastapi import HTTPException
 
+from app.config.config import settings
 from app.logger.log_handler import logger
+from backend import httpx_client
 
 
 IS_DOCKER = os.getenv("IS_DOCKER", "false").lower() == "true"
@@ -19,6 +24,12 @@ else:
 
 HEADERS = {"accept": "application/json"}
 
+# Reference data bundle cached in process memory, revalidated with its ETag.
+REFERENCE_DATA: Dict[str, Any] = {"data": {}, "etag": None, "validated_at": 0.0}
+
+# Employee data responses by URL with their ETag, least recently used first.
+EMPLOYEE_DATA_CACHE: "OrderedDict[str, Tuple[str, Any]]" = OrderedDict()
+
 
 # async def verify_employee_id(email: str) -> bool:
 #     """
@@ -46,7 +57,13 @@ HEADERS = {"accept": "application/json"}
 #         return response.get("value", False)
 
 
-async def verify_parameter(base_path: str, identifier: str | int, log_context: str, params: dict | None = None) -> bool:
+async def verify_parameter(
+    base_path: str,
+    identifier: str | int,
+    log_context: str,
+    params: dict | None = None,
+    timeout: float | None = None,
+) -> bool:
     """
     Helper function to verify/validate identifier existence in the database and return true or false.
 
@@ -54,25 +71,26 @@ async def verify_parameter(base_path: str, identifier: str | int, log_context: s
     :param identifier: Employee identifier
     :param log_context: Context for logging messages
     :param params: query parameters to include in the request
+    :param timeout: Request timeout in seconds, the client default is used if not set
     :return: True if exists, False otherwise.
     """
-    logger.info(f"Starting verification for {log_context}: {identifier} ...")
+    logger.info("Starting verification for %s: %s ...", log_context, identifier)
 
     url = f"{BASE_URL}/{base_path}/{identifier}"
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, params=params, headers=HEADERS)
-        response.raise_for_status()
-        response = response.json()
+    client = httpx_client.get_httpx_client()
+    response = await client.get(url, params=params, headers=HEADERS, timeout=httpx_client.request_timeout(timeout))
+    response.raise_for_status()
+    response = response.json()
 
-        exists = response.get("exist")
+    exists = response.get("exist")
 
-        if exists:
-            logger.info(f"{log_context.capitalize()} with email {identifier} already exists.")
-        else:
-            logger.info(f"{log_context.capitalize()} {identifier} does not exist.")
+    if exists:
+        logger.info("%s with email %s already exists.", log_context.capitalize(), identifier)
+    else:
+        logger.info("%s %s does not exist.", log_context.capitalize(), identifier)
 
-        return exists
+    return exists
 
 
 async def verify_email(email: str, who: str) -> bool:
@@ -105,31 +123,85 @@ async def verify_phone_number(phone_number: str) -> bool:
     )
 
 
-async def fetch_parameter_id(base_path: str, identifier: str, log_context: str) -> int:
+async def verify_batch(
+    emails: List[str] | None = None,
+    phone_numbers: List[str] | None = None,
+    timeout: float | None = None,
+) -> Dict[str, Dict[str, List[str]]]:
     """
-    Helper function to fetch parameter id from database and return a value.
+    Verify if emails and phone numbers already exist, with a single API call.
 
-    :param base_path: API base path
-    :param identifier: Employee identifier
-    :param log_context: Context for logging messages
+    :param emails: Emails to check in the employee and users tables.
+    :param phone_numbers: Phone numbers to check in the employee table.
+    :param timeout: Request timeout in seconds, the client default is used if not set
+    :return: For "emails" and "phone_numbers", each value mapped to the tables it exists in, empty if none.
     """
-    logger.info(f"Starting {log_context} ID retrieval for {log_context}: {identifier}")
-    url = f"{BASE_URL}/{base_path}/{identifier}"
+    logger.info("Starting batch verification ...")
+    url = f"{BASE_URL}/verify_batch/"
+    payload = {
+        "emails": emails or [],
+        "phone_numbers": phone_numbers or [],
+    }
+
+    client = httpx_client.get_httpx_client()
+    response = await client.post(url, json=payload, headers=HEADERS, timeout=httpx_client.request_timeout(timeout))
+    response.raise_for_status()
+    logger.info("Batch verification completed.")
+    return response.json()
+
+
+async def get_reference_data(timeout: float | None = None) -> Dict[str, Dict[str, int]]:
+    """
+    Get all genders, departments, positions and roles mapped to their ids.
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=HEADERS)
+    The bundle is cached in process memory. Once it is older than the configured revalidation interval,
+    it is revalidated with its ETag, and only downloaded again if it has changed.
+
+    :param timeout: Request timeout in seconds, the client default is used if not set
+    :return: Reference table names mapped to their name -> id maps.
+    """
+    cached_at = REFERENCE_DATA["validated_at"]
+    if REFERENCE_DATA["data"] and time.monotonic() - cached_at < settings.reference_data_revalidate_after:
+        return REFERENCE_DATA["data"]
+
+    url = f"{BASE_URL}/reference"
+    headers = dict(HEADERS)
+    if REFERENCE_DATA["etag"]:
+        headers["If-None-Match"] = REFERENCE_DATA["etag"]
+
+    client = httpx_client.get_httpx_client()
+    response = await client.get(url, headers=headers, timeout=httpx_client.request_timeout(timeout))
+
+    if response.status_code == 304:
+        logger.info("Cached reference data is still current.")
+    else:
         response.raise_for_status()
-        response = response.json()
+        REFERENCE_DATA["data"] = response.json()
+        REFERENCE_DATA["etag"] = response.headers.get("ETag")
+        logger.info("Reference data retrieved successfully.")
 
-        required_id = response.get("value")
+    REFERENCE_DATA["validated_at"] = time.monotonic()
+    return REFERENCE_DATA["data"]
 
-        if required_id:
-            logger.info(f"{log_context.capitalize()} ID retrieved successfully.")
-            return required_id
 
-        logger.info(f"{log_context.capitalize()} ID not retrieved.")
+async def fetch_parameter_id(reference: str, identifier: str, log_context: str) -> int:
+    """
+    Helper function to look up a parameter id in the cached reference data and return a value.
+
+    :param reference: Reference table name, e.g. "gender"
+    :param identifier: Employee identifier
+    :param log_context: Context for logging messages
+    """
+    reference_data = await get_reference_data()
+    required_id = reference_data.get(reference, {}).get(identifier)
+
+    if required_id:
+        logger.info("%s ID retrieved successfully.", log_context.capitalize())
         return required_id
 
+    logger.info("%s ID not retrieved.", log_context.capitalize())
+    return required_id  # type: ignore
+
 
 async def get_gender_id(gender: str) -> int:
     """
@@ -139,7 +211,7 @@ async def get_gender_id(gender: str) -> int:
     :return: Gender ID from the gender table.
     """
     return await fetch_parameter_id(
-        base_path="get_gender_id",
+        reference="gender",
         identifier=gender,
         log_context="gender"
     )
@@ -153,7 +225,7 @@ async def get_department_id(department: str) -> int:
     :return: Department ID from the department table.
     """
     return await fetch_parameter_id(
-        base_path="get_department_id",
+        reference="department",
         identifier=department,
         log_context="department"
     )
@@ -167,40 +239,220 @@ async def get_position_id(position: str) -> int:
     :return: Position ID from the position table.
     """
     return await fetch_parameter_id(
-        base_path="get_position_id",
+        reference="position",
         identifier=position,
         log_context="position"
     )
 
 
-async def fetch_employee_data(endpoint: str, identifier: str | int, log_context: str) -> pd.DataFrame | None:
+async def get_employee_data_response(
+    url: str,
+    params: Dict[str, Any] | None = None,
+    timeout: float | None = None,
+) -> Tuple[int, Any]:
     """
-    Helper function to fetch employee data from API and return a DataFrame
+    Get an employee data response, revalidating the cached copy with its ETag if there is one.
+
+    :param url: Endpoint URL
+    :param params: Query parameters
+    :param timeout: Request timeout in seconds, the client default is used if not set
+    :return: Status code and the response data, from the cache if it is still current.
+    """
+    cache_key = str(httpx.URL(url, params=params))
+    cached = EMPLOYEE_DATA_CACHE.get(cache_key)
+
+    headers = dict(HEADERS)
+    if cached:
+        headers["If-None-Match"] = cached[0]
+
+    client = httpx_client.get_httpx_client()
+    response = await client.get(url, params=params, headers=headers, timeout=httpx_client.request_timeout(timeout))
+
+    if response.status_code == 304 and cached:
+        logger.info("Cached employee data is still current.")
+        EMPLOYEE_DATA_CACHE.move_to_end(cache_key)
+        return 200, cached[1]
+
+    if response.status_code == 404:
+        EMPLOYEE_DATA_CACHE.pop(cache_key, None)
+        return 404, None
+
+    response.raise_for_status()
+    data = response.json()
+
+    etag = response.headers.get("ETag")
+    if etag:
+        EMPLOYEE_DATA_CACHE[cache_key] = (etag, data)
+        EMPLOYEE_DATA_CACHE.move_to_end(cache_key)
+        while len(EMPLOYEE_DATA_CACHE) > settings.employee_data_cache_size:
+            EMPLOYEE_DATA_CACHE.popitem(last=False)
+
+    return response.status_code, data
+
+
+async def iter_employee_data_pages(
+    endpoint: str,
+    identifier: str | int,
+    log_context: str,
+    limit: int | None = None,
+    timeout: float | None = None,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Walk the pages of a paginated employee data endpoint.
 
     :param endpoint: API subpath
     :param identifier: Employee identifier
     :param log_context: Context for logging messages
+    :param limit: Page size, the API default is used if not set
+    :param timeout: Request timeout in seconds, the client default is used if not set
+    :return: Async iterator over the pages, each a list of employee records.
     """
-    logger.info(f"Initiating employee data retrieval process for {log_context}: {identifier} ...")
     url = f"{BASE_URL}/get_employee_data/{endpoint}/{identifier}"
+    params: Dict[str, int] = {} if limit is None else {"limit": limit}
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, headers=HEADERS)
+    while True:
+        status_code, page = await get_employee_data_response(url, params=dict(params), timeout=timeout)
 
-            if response.status_code == 404:
-                logger.warning(f"Employee with {log_context} {identifier} not found.")
-                return None
+        if status_code == 404:
+            logger.warning("Employee with %s %s not found.", log_context, identifier)
+            return
+
+        yield page["items"]
+
+        if page.get("next_cursor") is None:
+            return
+        params["after"] = page["next_cursor"]
 
-            response.raise_for_status()
 
-            data = response.json()
+async def fetch_employee_data(
+    endpoint: str,
+    identifier: str | int,
+    log_context: str,
+    timeout: float | None = None,
+    paginated: bool = False,
+) -> pd.DataFrame | None:
+    """
+    Helper function to fetch employee data from API and return a DataFrame
+
+    :param endpoint: API subpath
+    :param identifier: Employee identifier
+    :param log_context: Context for logging messages
+    :param timeout: Request timeout in seconds, the client default is used if not set
+    :param paginated: If the endpoint is paginated, all pages are fetched
+
+    Responses are cached by URL and revalidated with their ETag, unchanged data is not downloaded again.
+    """
+    logger.info("Initiating employee data retrieval process for %s: %s ...", log_context, identifier)
+    url = f"{BASE_URL}/get_employee_data/{endpoint}/{identifier}"
+
+    try:
+        if paginated:
+            data = [
+                row
+                async for page in iter_employee_data_pages(endpoint, identifier, log_context, timeout=timeout)
+                for row in page
+            ]
+            if not data:
+                return None
+
             logger.info("Pandas Dataframe with employee data created.")
             return pd.DataFrame(data)
 
-        except Exception as e:
-            logger.error(f"Unexpected error occurred while retrieving data for employee {log_context} {identifier}: {e}")
-            raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+        status_code, data = await get_employee_data_response(url, timeout=timeout)
+
+        if status_code == 404:
+            logger.warning("Employee with %s %s not found.", log_context, identifier)
+            return None
+
+        logger.info("Pandas Dataframe with employee data created.")
+        return pd.DataFrame(data)
+
+    except Exception as e:
+        logger.error(
+            "Unexpected error occurred while retrieving data for employee %s %s: %s", log_context, identifier, e
+        )
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+
+async def search_employees(
+    filters: Dict[str, str | int],
+    limit: int | None = None,
+    timeout: float | None = None,
+) -> pd.DataFrame | None:
+    """
+    Search employees combining filters, with names matched on prefixes and similar names.
+
+    :param filters: Search filters by field (id, first_name, last_name, department, position, status)
+    :param limit: Maximum number of results, the API default is used if not set
+    :param timeout: Request timeout in seconds, the client default is used if not set
+    :return: DataFrame of the matching employees, best matches first, None if there is none.
+    """
+    logger.info("Initiating employee search by %s ...", ", ".join(filters))
+    url = f"{BASE_URL}/search_employees/"
+    params = dict(filters) if limit is None else {**filters, "limit": limit}
+
+    client = httpx_client.get_httpx_client()
+    try:
+        response = await client.get(url, params=params, headers=HEADERS, timeout=httpx_client.request_timeout(timeout))
+
+        if response.status_code == 404:
+            logger.warning("No employee found for search by %s.", ", ".join(filters))
+            return None
+
+        response.raise_for_status()
+
+        data = response.json()
+        logger.info("Pandas Dataframe with employee data created.")
+        return pd.DataFrame(data)
+
+    except Exception as e:
+        logger.error("Unexpected error occurred while searching employees: %s", e)
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+
+async def fetch_employee_data_arrow(
+    filters: Dict[str, str | int],
+    log_context: str,
+    timeout: float | None = None,
+) -> pd.DataFrame | None:
+    """
+    Fetch employee data from the export endpoint as an Arrow IPC stream and load it into a DataFrame.
+
+    Columns are converted from Arrow as a whole: strings and dates stay Arrow-backed and the dictionary-encoded
+    department, position and gender become categoricals, so no Python object is created per row.
+
+    :param filters: Export filters by field
+    :param log_context: Context for logging messages
+    :param timeout: Request timeout in seconds, the client default is used if not set
+    """
+    identifier = ", ".join(map(str, filters.values()))
+    logger.info("Initiating employee data retrieval process for %s: %s ...", log_context, identifier)
+    url = f"{BASE_URL}/export_employees/"
+    params = {"format": "arrow", **filters}
+
+    client = httpx_client.get_httpx_client()
+    try:
+        response = await client.get(url, params=params, timeout=httpx_client.request_timeout(timeout))
+        response.raise_for_status()
+
+        table = pa.ipc.open_stream(response.content).read_all()
+        if not table.num_rows:
+            logger.warning("Employee with %s %s not found.", log_context, identifier)
+            return None
+
+        logger.info("Pandas Dataframe with employee data created.")
+        return table.to_pandas(
+            types_mapper={
+                pa.string(): pd.StringDtype("pyarrow"),
+                pa.date32(): pd.ArrowDtype(pa.date32()),
+            }.get,
+        )
+
+    except Exception as e:
+        logger.error(
+            "Unexpected error occurred while retrieving data for employee %s %s: %s", log_context, identifier, e
+        )
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 
 async def get_employee_data_by_id(employee_id: int) -> pd.DataFrame | None:
@@ -230,21 +482,39 @@ async def get_employee_data_by_last_name(last_name: str) -> pd.DataFrame | None:
     )
 
 
-async def get_employee_data_by_department(department: str) -> pd.DataFrame | None:
-    """Fetch employee data using their department."""
+async def get_employee_data_by_department(department: str, arrow: bool = False) -> pd.DataFrame | None:
+    """
+    Fetch employee data using their department.
+
+    :param department: Department name
+    :param arrow: Load all employees from the Arrow export in one request, instead of walking the pages.
+    """
+    if arrow:
+        return await fetch_employee_data_arrow(filters={"department": department}, log_context="department")
+
     return await fetch_employee_data(
         endpoint="by_department",
         identifier=department,
-        log_context="department"
+        log_context="department",
+        paginated=True,
     )
 
 
-async def get_employee_data_by_position(position: str) -> pd.DataFrame | None:
-    """Fetch employee data by their position."""
+async def get_employee_data_by_position(position: str, arrow: bool = False) -> pd.DataFrame | None:
+    """
+    Fetch employee data by their position.
+
+    :param position: Position name
+    :param arrow: Load all employees from the Arrow export in one request, instead of walking the pages.
+    """
+    if arrow:
+        return await fetch_employee_data_arrow(filters={"position": position}, log_context="position")
+
     return await fetch_employee_data(
         endpoint="by_position",
         identifier=position,
-        log_context="position"
+        log_context="position",
+        paginated=True,
     )
 
 
@@ -273,12 +543,27 @@ async def add_new_user(
         "password": password,
         "employee_id": employee_id,
     }
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, json=payload, headers=HEADERS)
-        response.raise_for_status()
-        response = response.json()
-        logger.info(f"{response.get('message')} with assigned role {role}")
-        return response
+    client = httpx_client.get_httpx_client()
+    response = await client.post(url, json=payload, headers=HEADERS)
+    response.raise_for_status()
+    response = response.json()
+    logger.info("%s with assigned role %s", response.get("message"), role)
+    return response
+
+
+async def verify_user_login(email: str, password: str) -> Dict[str, Any]:
+    """
+    Verify the email and password of a user.
+
+    :return: If the login is valid, and the role of the user if it is.
+    """
+    logger.info("Initiating user login verification ...")
+
+    url = f"{BASE_URL}/verify_user_login/"
+    client = httpx_client.get_httpx_client()
+    response = await client.post(url, json={"email": email, "password": password}, headers=HEADERS)
+    response.raise_for_status()
+    return response.json()
 
 
 async def add_new_employee_data(
@@ -287,49 +572,58 @@ async def add_new_employee_data(
     last_name: str,
     address: str,
     date_of_birth: date,
-    gender_id: int,
+    gender: str,
     phone: str,
-    position_id: int,
+    position: str,
     email: str,
-    department_id: int,
+    department: str,
     salary: int,
     hired_date: date,
     status: str = "Active",
 ) -> Any:
     """
-    Add a new employee details to the database.
+    Add a new employee details to the database in one request.
+
+    Department, position and gender are sent by name and resolved by the API, which also checks that the email
+    and phone number are not used yet. If the employee can't be added for one of those reasons, the API
+    response detail is returned, with the status and a message to show.
     """
-    logger.info(f"Initiating new employee creating process for {first_name} {last_name}...")
+    logger.info("Initiating new employee creating process for %s %s...", first_name, last_name)
 
-    url = f"{BASE_URL}/add_new_employee/"
+    url = f"{BASE_URL}/create_employee/"
     payload = {
         "first_name": first_name,
         "middle_name": middle_name,
         "last_name": last_name,
         "address": address,
         "date_of_birth": date_of_birth.strftime("%Y-%m-%d"),
-        "gender_id": gender_id,
+        "gender": gender,
         "phone": phone,
-        "position_id": position_id,
-        "department_id": department_id,
+        "position": position,
+        "department": department,
         "email": email,
         "salary": salary,
         "hired_date": hired_date.strftime("%Y-%m-%d"),
         "status": status,
     }
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(url, json=payload, headers=HEADERS)
-            response.raise_for_status()
-            response = response.json()
+    client = httpx_client.get_httpx_client()
+    try:
+        response = await client.post(url, json=payload, headers=HEADERS)
+        if response.status_code in (409, 422) and isinstance(response.json().get("detail"), dict):
+            detail = response.json()["detail"]
+            logger.error("%s", detail.get("message"))
+            return detail
+
+        response.raise_for_status()
+        response = response.json()
 
-            if response.get("status") == "Success":
-                logger.info(f"{response.get('message')}")
-                return response
-        except Exception as e:
-            logger.error(f"Unexpected error occurred while adding employee data for {first_name} {last_name}: {e}")
-            raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+        if response.get("status") == "Success":
+            logger.info("%s", response.get("message"))
+            return response
+    except Exception as e:
+        logger.error("Unexpected error occurred while adding employee data for %s %s: %s", first_name, last_name, e)
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 
 async def update_employee_data(
@@ -344,7 +638,7 @@ async def update_employee_data(
     phone: str | None = None,
 ) -> bool | None:
     """Client call to update employee data"""
-    logger.info(f"Initialting update process for employee with id {employee_id} ...")
+    logger.info("Initialting update process for employee with id %s ...", employee_id)
     url = f"{BASE_URL}/update_employee_data"
     payload = {
         "employee_id": employee_id,
@@ -370,7 +664,7 @@ async def update_employee_data(
     if PHONE_NUMBER is not None:
         phone_exist = await verify_phone_number(phone_number=PHONE_NUMBER)
         if phone_exist:
-            logger.warning(f"Phone number {PHONE_NUMBER} already exists in the database.")
+            logger.warning("Phone number %s already exists in the database.", PHONE_NUMBER)
             return
 
     if POSITION is not None:
@@ -383,26 +677,26 @@ async def update_employee_data(
 
     payload = {k: v for k, v in payload.items() if v is not None}
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.patch(url, json=payload, headers=HEADERS)
+    client = httpx_client.get_httpx_client()
+    try:
+        response = await client.patch(url, json=payload, headers=HEADERS)
 
-            if response.status_code == 400:
-                logger.warning("Either employee id is missing or no update fields provided.")
-                return False
+        if response.status_code == 400:
+            logger.warning("Either employee id is missing or no update fields provided.")
+            return False
 
-            if response.status_code == 500:
-                logger.warning(f"Unexpected error: {response.json().get('detail')}")
-                return False
+        if response.status_code == 500:
+            logger.warning("Unexpected error: %s", response.json().get("detail"))
+            return False
 
-            response.raise_for_status()
+        response.raise_for_status()
 
-            data = response.json()
-            logger.info("Employee data updated successfully.")
-            return data.get("success")
+        data = response.json()
+        logger.info("Employee data updated successfully.")
+        return data.get("success")
 
-        except Exception as e:
-            logger.error(f"Unexpected error occurred updating employee data: {e}")
-            raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+    except Exception as e:
+        logger.error("Unexpected error occurred updating employee data: %s", e)
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 # TODO - Add new enpoint call for deleting employee data
@@ -1,23 +1,174 @@
-"""Database connection module."""
-import psycopg2
+"""
+Database connection module.
+
+Pooled connections use InstrumentedCursor, which times every statement for the query metrics and the
+Server-Timing header of the request, and writes statements slower than the slow query threshold to the slow
+query log, with the shape of their parameters and optionally their plan.
+"""
+import re
+import time
+from typing import Any, AsyncIterator, Dict, List, Mapping
+
+import psycopg
+from psycopg import sql
+from psycopg_pool import AsyncConnectionPool
 
 from app.config.config import settings
+from app.logger.log_handler import slow_query_logger
+from backend import metrics
+
+
+db_pool: AsyncConnectionPool = None  # type: ignore
+
+# Statements EXPLAIN ANALYZE can run, in a savepoint rolled back afterwards
+EXPLAINABLE_STATEMENT = re.compile(r"^\s*(SELECT|WITH|INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+
+
+def value_shape(value: Any) -> str:
+    """Type of a query parameter, with its length for strings and sequences."""
+    if isinstance(value, (str, bytes, list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def params_shape(params: Any) -> Any:
+    """Shape of query parameters, their types and lengths without their values."""
+    if params is None:
+        return None
+    if isinstance(params, Mapping):
+        return {key: value_shape(value) for key, value in params.items()}
+    return [value_shape(value) for value in params]
+
+
+class InstrumentedCursor(psycopg.AsyncCursor):
+    """Cursor timing every statement it executes, and logging the slow ones."""
+
+    def query_text(self, query: Any) -> str:
+        if isinstance(query, sql.Composable):
+            return query.as_string(self.connection)
+        if isinstance(query, bytes):
+            return query.decode()
+        return str(query)
+
+    async def explain(self, query: str, params: Any) -> str | None:
+        """Run a statement again with EXPLAIN (ANALYZE, BUFFERS) and roll it back."""
+        if not EXPLAINABLE_STATEMENT.match(query):
+            return None
+
+        try:
+            async with self.connection.transaction(force_rollback=True):
+                # A plain cursor, so the EXPLAIN is neither timed nor explained itself
+                async with psycopg.AsyncCursor(self.connection) as cursor:
+                    await cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + query, params)
+                    return "\n".join(row[0] for row in await cursor.fetchall())
+        except psycopg.Error as e:
+            return f"EXPLAIN failed: {e}"
+
+    async def statement_done(self, query: Any, params: Any, duration: float, explain: bool, count: int = 1) -> None:
+        metrics.record_query(duration)
+        if duration * 1000 < settings.slow_query_threshold_ms:
+            return
+
+        text = self.query_text(query)
+        plan = await self.explain(text, params) if explain and settings.slow_query_explain else None
+        slow_query_logger.warning(
+            "Slow query %s took %.1f ms. Endpoint: %s. Statements: %s. Parameters: %s. Query: %s%s",
+            metrics.query_label(),
+            duration * 1000,
+            metrics.request_endpoint() or "-",
+            count,
+            params_shape(params),
+            " ".join(text.split()),
+            f"\n{plan}" if plan else "",
+        )
+
+    async def execute(self, query, params=None, **kwargs):  # type: ignore
+        start = time.perf_counter()
+        succeeded = False
+        try:
+            await super().execute(query, params, **kwargs)
+            succeeded = True
+            return self
+        finally:
+            await self.statement_done(query, params, time.perf_counter() - start, explain=succeeded)
+
+    async def executemany(self, query, params_seq, **kwargs):  # type: ignore
+        params_list: List[Any] = list(params_seq)
+        start = time.perf_counter()
+        try:
+            return await super().executemany(query, params_list, **kwargs)
+        finally:
+            # Logged with the shape of the first parameters, not explained
+            await self.statement_done(
+                query,
+                params_list[0] if params_list else None,
+                time.perf_counter() - start,
+                explain=False,
+                count=len(params_list),
+            )
 
 
-db_client = None
+def connection_kwargs() -> Dict[str, Any]:
+    """Connection parameters for the database from the settings."""
+    return {
+        "dbname": settings.database_name,
+        "user": settings.postgres_user,
+        "password": settings.postgres_password,
+        "host": settings.host,
+        "port": settings.port,
+    }
 
 
-def db_init() -> None:
-    """Create a connection to the database."""
-    global db_client
+async def connect() -> psycopg.AsyncConnection:
+    """Open a standalone connection to the database, outside the pool, for command line tools."""
+    return await psycopg.AsyncConnection.connect(**connection_kwargs())
+
+
+async def db_init() -> None:
+    """
+    Create and open the async database connection pool.
+
+    Connections are health-checked when borrowed, so connections broken by a database restart are
+    discarded and replaced by new ones instead of being handed out to requests.
+    """
+    global db_pool
 
     try:
-        db_client = psycopg2.connect(
-            dbname=settings.database_name,
-            user=settings.postgres_user,
-            password=settings.postgres_password,
-            host=settings.host,
-            port=settings.port,
+        db_pool = AsyncConnectionPool(
+            conninfo="",
+            kwargs={**connection_kwargs(), "cursor_factory": InstrumentedCursor},
+            min_size=settings.db_pool_min_size,
+            max_size=settings.db_pool_max_size,
+            timeout=settings.db_pool_timeout,
+            check=AsyncConnectionPool.check_connection,
+            open=False,
         )
+        await db_pool.open(wait=True)
     except Exception as e:
-        raise psycopg2.OperationalError(e)
+        raise psycopg.OperationalError(e)
+
+
+async def db_close() -> None:
+    """Close the database connection pool."""
+    global db_pool
+
+    if db_pool is not None:
+        await db_pool.close()
+        db_pool = None  # type: ignore
+
+
+async def get_db_connection() -> AsyncIterator[psycopg.AsyncConnection]:
+    """
+    FastAPI dependency that borrows a pooled connection for the duration of a request.
+
+    The transaction is committed when the request succeeds and rolled back if it fails.
+    """
+    async with db_pool.connection() as connection:
+        yield connection
+
+
+def pool_stats() -> Dict[str, int]:
+    """Return statistics for the database connection pool."""
+    if db_pool is None:
+        return {}
+    return db_pool.get_stats()
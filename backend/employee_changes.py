@@ -0,0 +1,97 @@
+"""
+Listener of the employee change notifications.
+
+The employee table triggers (migration 0006) notify the ids of the employees changed by every statement on the
+employee_changes channel, in batches of up to 300 ids per notification. The listener collects the ids
+notified in a burst, over a short delay after the first notification, and handles them together.
+
+Bulk writers that disable the triggers, such as the seeding of synthetic employees, send a single reset
+notification instead, meaning any employee may have changed.
+
+A notification is lost if the listener connection is down when it is sent, so the listener also resets on
+every (re)connection, once it is listening, with a callback such as a full reload.
+"""
+import asyncio
+import json
+from typing import Awaitable, Callable, List, Set
+
+from psycopg import AsyncConnection, sql
+
+from app.logger.log_handler import logger
+from backend import db_connect
+
+
+CHANGES_CHANNEL = "employee_changes"
+RESET_OPERATION = "RESET"
+
+
+def changed_employee_ids(payload: str) -> List[int] | None:
+    """Get the ids of the employees changed from a notification payload, None for a reset."""
+    change = json.loads(payload)
+    return None if change["op"] == RESET_OPERATION else change["ids"]
+
+
+async def notify_reset(connection: AsyncConnection) -> None:
+    """Notify that any employee may have changed, delivered when the transaction commits."""
+    await connection.execute(
+        "SELECT pg_notify(%s, %s)", (CHANGES_CHANNEL, json.dumps({"op": RESET_OPERATION}))
+    )
+
+
+async def collect_changes(connection: AsyncConnection, batch_delay: float) -> Set[int] | None:
+    """
+    Wait for a change notification and collect the ids notified until the batch delay after it.
+
+    :return: Ids of the employees changed, None if a reset was notified.
+    """
+    ids: Set[int] | None = set()
+    # A packet can hold more notifications than stop_after, they are all yielded
+    async for notify in connection.notifies(stop_after=1):
+        changed = changed_employee_ids(notify.payload)
+        ids = None if ids is None or changed is None else ids | set(changed)
+    async for notify in connection.notifies(timeout=batch_delay):
+        changed = changed_employee_ids(notify.payload)
+        ids = None if ids is None or changed is None else ids | set(changed)
+    return ids
+
+
+async def listen(
+    name: str,
+    on_reset: Callable[[AsyncConnection], Awaitable[None]],
+    on_changes: Callable[[Set[int]], Awaitable[None]],
+    on_disconnect: Callable[[], None],
+    batch_delay: float,
+    reconnect_delay: float,
+) -> None:
+    """
+    Handle the employee change notifications until cancelled, reconnecting when the connection is lost.
+
+    :param name: Name of the listener, for the log.
+    :param on_reset: Called with the listener connection once listening, to catch up with missed changes, and
+        when a reset is notified.
+    :param on_changes: Called with the ids of the employees changed in a burst.
+    :param on_disconnect: Called when the listener connection is lost.
+    :param batch_delay: Seconds to collect the ids of a burst, after its first notification.
+    :param reconnect_delay: Seconds to wait before reconnecting.
+    """
+    while True:
+        try:
+            connection = await db_connect.connect()
+            await connection.set_autocommit(True)
+            async with connection:
+                await connection.execute(sql.SQL("LISTEN {}").format(sql.Identifier(CHANGES_CHANNEL)))
+                await on_reset(connection)
+
+                while True:
+                    ids = await collect_changes(connection, batch_delay)
+                    if ids is None:
+                        await on_reset(connection)
+                    else:
+                        await on_changes(ids)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            on_disconnect()
+            logger.error("%s listener failed, reconnecting. Message: %s", name, str(e))
+            await asyncio.sleep(reconnect_delay)
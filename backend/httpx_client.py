@@ -1,24 +1,80 @@
 """HTTPX client module."""
+import asyncio
+import importlib.util
+import weakref
+from typing import Any, Coroutine, TypeVar
+
 import httpx
 
+from app.config.config import settings
+from app.logger.log_handler import logger
+
+
+T = TypeVar("T")
+
+# httpx connections are bound to the event loop they were opened on, so one shared client is kept per loop.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _http2_enabled() -> bool:
+    """HTTP/2 is used only if enabled in the settings and the optional h2 package is installed."""
+    if not settings.httpx_http2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP/2 is enabled but the h2 package is not installed. Falling back to HTTP/1.1.")
+        return False
+    return True
 
-httpx_client: httpx.AsyncClient = None  # type: ignore
 
+def init_httpx_client() -> httpx.AsyncClient:
+    """Initialize the shared async HTTPX client for the running event loop."""
+    return httpx.AsyncClient(
+        http2=_http2_enabled(),
+        limits=httpx.Limits(
+            max_connections=settings.httpx_max_connections,
+            max_keepalive_connections=settings.httpx_max_keepalive_connections,
+            keepalive_expiry=settings.httpx_keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(settings.httpx_timeout, connect=settings.httpx_connect_timeout),
+    )
 
-def init_httpx_client() -> None:
-    """Initialize async HTTPX client."""
-    global httpx_client
-    if httpx_client is None:
-        httpx_client = httpx.AsyncClient()
+
+def get_httpx_client() -> httpx.AsyncClient:
+    """
+    Get the shared async HTTPX client for the running event loop, creating it on first use.
+
+    :return: Long-lived client with keep-alive connections.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = init_httpx_client()
+        _clients[loop] = client
+    return client
 
 
 async def close_httpx_client() -> None:
-    """Properly close the HTTPX client to release resources."""
-    global httpx_client
-    if httpx_client is not None:
-        await httpx_client.aclose()
-        httpx_client = None  # type: ignore
+    """Properly close the HTTPX client of the running event loop to release resources."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def request_timeout(timeout: float | None) -> Any:
+    """Per-call timeout to pass to a request, falling back to the client default if not set."""
+    return httpx.USE_CLIENT_DEFAULT if timeout is None else timeout
+
+
+def run(coroutine: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine in a new event loop, like asyncio.run, and close the shared client afterwards.
 
+    All requests made by the coroutine share the client and its warm connections.
+    """
+    async def runner() -> T:
+        try:
+            return await coroutine
+        finally:
+            await close_httpx_client()
 
-# Initialize the client when the module is loaded
-init_httpx_client()
+    return asyncio.run(runner())
@@ -0,0 +1,97 @@
+"""
+Prometheus metrics of the API and its database queries.
+
+Request metrics are recorded by the API metrics middleware, query durations by the instrumented cursor of
+every pooled connection. Statistics kept elsewhere, such as those of the connection pool, are read when the
+metrics are scraped by a StatsCollector.
+
+A query is labelled with the name set by named_query, or with the endpoint running it otherwise.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Iterator, MutableMapping
+
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+from prometheus_client.registry import Collector
+
+
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUEST_LATENCY = Histogram(
+    "ems_http_request_duration_seconds", "HTTP request latency by route.", ["method", "route"]
+)
+REQUEST_ERRORS = Counter(
+    "ems_http_request_errors", "HTTP requests failed with a server error, by route.", ["method", "route", "status"]
+)
+REQUESTS_IN_FLIGHT = Gauge("ems_http_requests_in_flight", "HTTP requests being processed.")
+QUERY_DURATION = Histogram(
+    "ems_db_query_duration_seconds", "Database statement duration by query name.", ["query"], buckets=QUERY_BUCKETS
+)
+
+
+class QueryTiming:
+    """Database time and number of statements of a request."""
+
+    __slots__ = ("duration", "count")
+
+    def __init__(self) -> None:
+        self.duration = 0.0
+        self.count = 0
+
+
+query_name: ContextVar[str | None] = ContextVar("query_name", default=None)
+request_scope: ContextVar[MutableMapping[str, Any] | None] = ContextVar("request_scope", default=None)
+query_timing: ContextVar[QueryTiming | None] = ContextVar("query_timing", default=None)
+
+
+@contextmanager
+def named_query(name: str) -> Iterator[None]:
+    """Label the statements executed in the block with a query name."""
+    token = query_name.set(name)
+    try:
+        yield
+    finally:
+        query_name.reset(token)
+
+
+def request_endpoint() -> str | None:
+    """Name of the endpoint handling the current request, None outside requests."""
+    scope = request_scope.get()
+    endpoint = scope.get("endpoint") if scope else None
+    return endpoint.__name__ if endpoint else None
+
+
+def query_label() -> str:
+    """Name of the query being executed: its set name, or the name of the endpoint running it."""
+    return query_name.get() or request_endpoint() or "other"
+
+
+def record_query(duration: float) -> None:
+    """Record the duration of a statement in the query metrics and the database time of the request."""
+    QUERY_DURATION.labels(query_label()).observe(duration)
+    timing = query_timing.get()
+    if timing is not None:
+        timing.duration += duration
+        timing.count += 1
+
+
+class StatsCollector(Collector):
+    """Export a dictionary of statistics as metrics, read when the metrics are scraped."""
+
+    def __init__(self, prefix: str, documentation: str, stats: Callable[[], Dict[str, Any]], gauges: Iterable[str]):
+        """
+        :param prefix: Prefix of the metric names.
+        :param documentation: Description of the statistics.
+        :param stats: Function returning the statistics.
+        :param gauges: Statistics that go up and down, the others are counters.
+        """
+        self.prefix = prefix
+        self.documentation = documentation
+        self.stats = stats
+        self.gauges = set(gauges)
+
+    def collect(self) -> Iterator[Metric]:
+        for key, value in self.stats().items():
+            metric_family = GaugeMetricFamily if key in self.gauges else CounterMetricFamily
+            yield metric_family(f"{self.prefix}_{key}", f"{self.documentation}: {key}.", value=value)
@@ -0,0 +1,132 @@
+"""
+Versioned database schema migrations.
+
+Migrations are SQL files in the migrations directory, named <version>_<name>.sql. Each pending migration is
+applied in its own transaction and recorded in the schema_migrations table. An advisory lock keeps several
+API workers starting at the same time from applying the same migration twice.
+
+Migrations are applied at API startup, or from the command line:
+
+    python -m backend.migrations            # apply pending migrations
+    python -m backend.migrations --list     # show applied and pending migrations
+"""
+import argparse
+import asyncio
+import re
+from pathlib import Path
+from typing import List, NamedTuple, Set
+
+from psycopg import AsyncConnection, AsyncCursor, sql
+
+from app.config.config import settings
+from app.logger.log_handler import logger
+from backend import db_connect
+
+
+MIGRATIONS_DIRECTORY = Path(__file__).resolve().parent.parent / "migrations"
+MIGRATION_FILE_PATTERN = re.compile(r"^(\d+)_(\w+)\.sql$")
+MIGRATION_LOCK_ID = 8_201_993
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    path: Path
+
+
+def discover_migrations(directory: Path = MIGRATIONS_DIRECTORY) -> List[Migration]:
+    """
+    Find all migration files, ordered by version.
+
+    :param directory: Directory containing the migration files.
+    :return: List of migrations.
+    """
+    migrations = []
+    for path in directory.glob("*.sql"):
+        match = MIGRATION_FILE_PATTERN.match(path.name)
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2), path))
+    return sorted(migrations)
+
+
+async def create_migrations_table(connection: AsyncConnection) -> None:
+    """Create the table tracking applied migrations, if it does not exist."""
+    async with connection.transaction():
+        await connection.execute(
+            sql.SQL("""
+                CREATE TABLE IF NOT EXISTS {} (
+                    version INT PRIMARY KEY,
+                    name VARCHAR(255) NOT NULL,
+                    applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+                );
+            """).format(sql.Identifier(settings.migrations_table_name))
+        )
+
+
+async def applied_versions(cursor: AsyncCursor) -> Set[int]:
+    """Get the versions of all applied migrations."""
+    await cursor.execute(
+        sql.SQL("SELECT version FROM {}").format(sql.Identifier(settings.migrations_table_name))
+    )
+    return {row[0] for row in await cursor.fetchall()}
+
+
+async def migrate(connection: AsyncConnection) -> List[Migration]:
+    """
+    Apply all pending migrations.
+
+    :param connection: Database connection.
+    :return: List of the migrations applied.
+    """
+    await create_migrations_table(connection)
+    applied = []
+
+    for migration in discover_migrations():
+        async with connection.transaction():
+            async with connection.cursor() as cursor:
+                await cursor.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK_ID,))
+                if migration.version in await applied_versions(cursor):
+                    continue
+
+                logger.info("Applying migration %s_%s ...", migration.version, migration.name)
+                await cursor.execute(migration.path.read_text())  # type: ignore[arg-type]
+                await cursor.execute(
+                    sql.SQL("INSERT INTO {} (version, name) VALUES (%s, %s)").format(
+                        sql.Identifier(settings.migrations_table_name)
+                    ),
+                    (migration.version, migration.name),
+                )
+                applied.append(migration)
+
+    logger.info("Database schema is up to date. Migrations applied: %s", len(applied))
+    return applied
+
+
+async def run_migrations() -> List[Migration]:
+    """Apply all pending migrations with a connection borrowed from the pool."""
+    async with db_connect.db_pool.connection() as connection:
+        return await migrate(connection)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Apply database schema migrations.")
+    parser.add_argument("--list", action="store_true", help="Show applied and pending migrations only.")
+    args = parser.parse_args()
+
+    connection = await db_connect.connect()
+    try:
+        if args.list:
+            await create_migrations_table(connection)
+            async with connection.cursor() as cursor:
+                applied = await applied_versions(cursor)
+            for migration in discover_migrations():
+                status = "applied" if migration.version in applied else "pending"
+                print(f"{migration.version:04d}_{migration.name}: {status}")
+        else:
+            await migrate(connection)
+    finally:
+        await connection.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+"""
+Password hashing and verification with bcrypt on a process pool.
+
+bcrypt is deliberately slow, a hash with the default cost takes a few hundred milliseconds of CPU. Running it on
+the event loop would stall every other request of the worker meanwhile, so it runs in a bounded pool of
+processes instead. The number of hashes waiting for the pool is limited as well, further requests wait
+on the event loop without holding anything.
+
+The pool is started by hasher_init in the API lifespan, and its processes are started from a fork server (or
+spawned where there is none) rather than forked from the API process, which runs the logging and connection
+pool threads.
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import bcrypt
+
+from app.config.config import settings
+from app.logger.log_handler import logger
+
+
+_executor: ProcessPoolExecutor = None  # type: ignore
+_pending: asyncio.Semaphore = None  # type: ignore
+# Hash checked when there is no user, with the configured cost, so unknown users take as long as known ones
+_dummy_hash: bytes = None  # type: ignore
+
+
+def _hash(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+
+
+def _verify(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+async def hasher_init() -> None:
+    """Start the password hashing process pool, and compute the dummy hash on it."""
+    global _executor, _pending, _dummy_hash
+
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    _executor = ProcessPoolExecutor(
+        max_workers=settings.password_hash_workers, mp_context=multiprocessing.get_context(start_method)
+    )
+    _pending = asyncio.Semaphore(settings.password_hash_workers * settings.password_hash_queue_factor)
+    _dummy_hash = await _run(_hash, b"dummy password", settings.bcrypt_rounds)
+    logger.info("Password hashing pool started. Workers: %s", settings.password_hash_workers)
+
+
+def hasher_close() -> None:
+    """Stop the password hashing process pool."""
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None  # type: ignore
+
+
+async def _run(function, *args):  # type: ignore
+    if _executor is None:
+        raise RuntimeError("The password hashing pool is not started, call hasher_init first.")
+
+    async with _pending:
+        return await asyncio.get_running_loop().run_in_executor(_executor, function, *args)
+
+
+async def hash_password(password: str) -> str:
+    """
+    Hash a password with the configured bcrypt cost factor.
+
+    :param password: Plain text password.
+    :return: bcrypt hash, including the salt and cost factor.
+    """
+    hashed = await _run(_hash, password.encode(), settings.bcrypt_rounds)
+    return hashed.decode()
+
+
+async def verify_password(password: str, hashed: str | None) -> bool:
+    """
+    Check a password against a bcrypt hash.
+
+    Without a hash, e.g. for an unknown user, the password is checked against a dummy hash of the same cost and
+    rejected, so the time taken does not tell whether the user exists.
+
+    :param password: Plain text password.
+    :param hashed: Stored bcrypt hash, None if there is none.
+    :return: True if the password matches, False otherwise.
+    """
+    if hashed is None:
+        await _run(_verify, password.encode(), _dummy_hash)
+        return False
+    return await _run(_verify, password.encode(), hashed.encode())
@@ -0,0 +1,134 @@
+"""
+In-memory cache of the reference data tables (gender, department, position and role).
+
+The tables are loaded at API startup into bidirectional maps (name -> id and id -> name) and served from
+memory. The cache is reloaded from the database once its TTL has expired, or when refreshed explicitly.
+"""
+import asyncio
+import hashlib
+import json
+import time
+from typing import Dict, Iterable, Tuple
+
+from psycopg import AsyncConnection, sql
+
+from app.config.config import settings
+from app.logger.log_handler import logger
+from backend import db_connect
+
+
+class ReferenceMap:
+    """Bidirectional map between the names and ids of a reference table."""
+
+    def __init__(self, rows: Iterable[Tuple[int, str]]) -> None:
+        self.by_id: Dict[int, str] = {row_id: name for row_id, name in rows}
+        self.by_name: Dict[str, int] = {name: row_id for row_id, name in self.by_id.items()}
+
+    def get_id(self, name: str) -> int | None:
+        """Get the id for a name, None if it does not exist."""
+        return self.by_name.get(name)
+
+    def get_name(self, row_id: int) -> str | None:
+        """Get the name for an id, None if it does not exist."""
+        return self.by_id.get(row_id)
+
+
+class ReferenceDataCache:
+    """Cache of all reference tables, reloaded from the database when its TTL has expired."""
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self.tables: Dict[str, ReferenceMap] = {}
+        self.bundle: Dict[str, Dict[str, int]] = {}
+        self.etag = ""
+        self.loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def table_definitions() -> Dict[str, Tuple[str, str]]:
+        """Reference table names mapped to their database table and name column."""
+        return {
+            "gender": (settings.gender_table_name, "gender"),
+            "department": (settings.dept_table_name, "department"),
+            "position": (settings.position_table_name, "position"),
+            "role": (settings.role_table_name, "role"),
+        }
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() - self.loaded_at >= self.ttl
+
+    async def load(self, connection: AsyncConnection) -> None:
+        """
+        Load all reference tables using the given connection.
+
+        :param connection: Database connection.
+        """
+        tables = {}
+        async with connection.cursor() as cursor:
+            for name, (table, column) in self.table_definitions().items():
+                query = sql.SQL("SELECT id, {} FROM {}").format(sql.Identifier(column), sql.Identifier(table))
+                await cursor.execute(query)
+                tables[name] = ReferenceMap(await cursor.fetchall())
+
+        bundle = {name: table.by_name for name, table in tables.items()}
+
+        self.tables = tables
+        self.bundle = bundle
+        self.etag = '"{}"'.format(hashlib.sha256(json.dumps(bundle, sort_keys=True).encode()).hexdigest()[:32])
+        self.loaded_at = time.monotonic()
+        logger.info("Reference data loaded. Tables: %s", ", ".join(tables))
+
+    async def _reload(self) -> None:
+        async with db_connect.db_pool.connection() as connection:
+            await self.load(connection)
+
+    async def refresh(self) -> None:
+        """Reload all reference tables with a connection borrowed from the pool."""
+        async with self._lock:
+            await self._reload()
+
+    async def ensure_fresh(self) -> None:
+        """Reload the cache if its TTL has expired."""
+        if self.expired:
+            async with self._lock:
+                if self.expired:
+                    await self._reload()
+
+    async def get_table(self, name: str) -> ReferenceMap:
+        """
+        Get a reference table, reloading the cache first if it has expired.
+
+        :param name: Reference table name, e.g. "gender".
+        :return: Bidirectional map of the table.
+        """
+        await self.ensure_fresh()
+        return self.tables[name]
+
+    async def get_bundle(self) -> Tuple[Dict[str, Dict[str, int]], str]:
+        """
+        Get all reference tables as one bundle, reloading the cache first if it has expired.
+
+        :return: Names mapped to ids for every reference table, and the ETag of the bundle.
+        """
+        await self.ensure_fresh()
+        return self.bundle, self.etag
+
+    async def get_id(self, name: str, value: str) -> int | None:
+        """Get the id of a value in a reference table, None if it does not exist."""
+        return (await self.get_table(name)).get_id(value)
+
+    async def get_name(self, name: str, row_id: int) -> str | None:
+        """Get the value of an id in a reference table, None if it does not exist."""
+        return (await self.get_table(name)).get_name(row_id)
+
+
+cache: ReferenceDataCache = None  # type: ignore
+
+
+async def reference_data_init() -> None:
+    """Create the reference data cache and load it from the database."""
+    global cache
+
+    cache = ReferenceDataCache(ttl=settings.reference_data_ttl)
+    await cache.refresh()
@@ -0,0 +1,133 @@
+"""
+Benchmark for request latency under concurrent load.
+
+A number of workers keep the API busy with employee searches by department while a probe measures the
+latency of a cheap ID lookup. With blocking database calls on the event loop the probe waits behind every
+search in flight, with the async data-access layer it does not.
+
+Run it once against each build and compare the results:
+
+    python -m benchmarks.concurrent_latency --output before.json
+    python -m benchmarks.concurrent_latency --baseline before.json
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, Dict, List
+
+import httpx
+
+
+DEFAULT_BASE_URL = "http://localhost:8000/v1"
+LOAD_PATH = "/get_employee_data/by_department/Research"
+PROBE_PATH = "/get_gender_id/Male"
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    """
+    Summarize latencies in milliseconds.
+
+    :param latencies: Request latencies in seconds.
+    :return: Request count and p50, p95, p99 and max latency in milliseconds.
+    """
+    if not latencies:
+        return {"count": 0}
+
+    ordered = sorted(latencies)
+
+    def percentile(fraction: float) -> float:
+        index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+        return round(ordered[index] * 1000, 2)
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 2),
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+async def timed_get(client: httpx.AsyncClient, path: str, latencies: List[float]) -> None:
+    """Send a GET request and record its latency."""
+    start = time.perf_counter()
+    response = await client.get(path)
+    latencies.append(time.perf_counter() - start)
+    if response.status_code >= 500:
+        response.raise_for_status()
+
+
+async def run(base_url: str, concurrency: int, duration: float) -> Dict[str, Any]:
+    """
+    Run the benchmark.
+
+    :param base_url: API base url.
+    :param concurrency: Number of concurrent workers sending search requests.
+    :param duration: Benchmark duration in seconds.
+    :return: Latency summaries for the load and probe requests.
+    """
+    load_latencies: List[float] = []
+    probe_latencies: List[float] = []
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency + 1, max_keepalive_connections=concurrency + 1)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+
+        async def load_worker() -> None:
+            while time.perf_counter() < deadline:
+                await timed_get(client, LOAD_PATH, load_latencies)
+
+        async def probe_worker() -> None:
+            while time.perf_counter() < deadline:
+                await timed_get(client, PROBE_PATH, probe_latencies)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(probe_worker(), *(load_worker() for _ in range(concurrency)))
+
+    return {
+        "concurrency": concurrency,
+        "duration_s": duration,
+        "load": summarize(load_latencies),
+        "probe": summarize(probe_latencies),
+    }
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """Return the relative change of every latency statistic against a baseline run."""
+    changes: Dict[str, Dict[str, float]] = {}
+    for group in ("load", "probe"):
+        changes[group] = {
+            key: round((value - baseline[group][key]) / baseline[group][key] * 100, 1)
+            for key, value in result[group].items()
+            if key.endswith("_ms") and baseline[group].get(key)
+        }
+    return changes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--output", help="File to write the result to.")
+    parser.add_argument("--baseline", help="Result file of a previous run to compare against.")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.base_url, args.concurrency, args.duration))
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            result["change_pct"] = compare(result, json.load(baseline_file))
+
+    print(json.dumps(result, indent=2))
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(result, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+EXPLAIN-based check that every employee search filter is served by an index.
+
+The check applies the schema migrations, fills the employee table with synthetic rows inside a transaction,
+runs EXPLAIN for the query of each filter in ALLOWED_EMPLOYEE_FILTERS (paginated for department and
+position, as the endpoints run them), and rolls the transaction back, so the database is left unchanged.
+
+    python -m benchmarks.index_usage --rows 200000
+"""
+import argparse
+import asyncio
+import json
+import sys
+from typing import Any, Dict, Iterator, List
+
+from psycopg import AsyncConnection, sql
+
+from api.endpoints.employees import ALLOWED_EMPLOYEE_FILTERS, employee_data_query
+from app.config.config import settings
+from backend import db_connect, migrations
+from benchmarks.seed import insert_synthetic_employees, synthetic_phone
+
+
+# A bitmap heap scan reads the rows found by a bitmap index scan below it.
+INDEX_NODE_TYPES = {"Index Scan", "Index Only Scan", "Bitmap Heap Scan"}
+PAGINATED_FILTERS = {"department", "position"}
+
+
+async def sample_values(connection: AsyncConnection, rows: int) -> Dict[str, Any]:
+    """Pick a search value for every filter from the synthetic rows."""
+    cursor = await connection.execute(
+        sql.SQL("""
+            SELECT e.id, e.first_name, e.last_name, d.department, p.position
+            FROM {employee} AS e
+            JOIN {department} AS d ON e.department_id = d.id
+            JOIN {position} AS p ON e.position_id = p.id
+            WHERE e.phone = %s;
+        """).format(
+            employee=sql.Identifier(settings.employee_table_name),
+            department=sql.Identifier(settings.dept_table_name),
+            position=sql.Identifier(settings.position_table_name),
+        ),
+        (synthetic_phone(rows // 2),),
+    )
+    employee_id, first_name, last_name, department, position = await cursor.fetchone()  # type: ignore
+    return {
+        "id": employee_id,
+        "first_name": first_name,
+        "last_name": last_name,
+        "department": department,
+        "position": position,
+        "status": "Resigned",
+    }
+
+
+def plan_nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Walk all nodes of an EXPLAIN (FORMAT JSON) plan."""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+async def check_filter(connection: AsyncConnection, filter_field: str, value: Any) -> Dict[str, Any]:
+    """EXPLAIN the query of a filter and report how the employee table is scanned."""
+    paginated = filter_field in PAGINATED_FILTERS
+    query = employee_data_query(filter_field, limit=paginated)
+    params: List[Any] = [value, settings.employee_page_size + 1] if paginated else [value]
+
+    cursor = await connection.execute(sql.SQL("EXPLAIN (FORMAT JSON) ") + query, params)
+    plan = (await cursor.fetchone())[0][0]["Plan"]  # type: ignore
+
+    scans = [
+        {"node": node["Node Type"], "index": node.get("Index Name")}
+        for node in plan_nodes(plan)
+        if node.get("Relation Name") == settings.employee_table_name
+    ]
+    uses_index = bool(scans) and all(scan["node"] in INDEX_NODE_TYPES for scan in scans)
+    return {"filter": filter_field, "uses_index": uses_index, "scans": scans}
+
+
+async def run(rows: int) -> List[Dict[str, Any]]:
+    """
+    Run the check.
+
+    :param rows: Number of synthetic employees to insert.
+    :return: Result for every filter.
+    """
+    connection = await db_connect.connect()
+    try:
+        await migrations.migrate(connection)
+        results = []
+        async with connection.transaction(force_rollback=True):
+            await insert_synthetic_employees(connection, rows)
+            values = await sample_values(connection, rows)
+            for filter_field in ALLOWED_EMPLOYEE_FILTERS:
+                results.append(await check_filter(connection, filter_field, values[filter_field]))
+        return results
+    finally:
+        await connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000, help="Number of synthetic employees.")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.rows))
+    print(json.dumps(results, indent=2))
+
+    if not all(result["uses_index"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""
+End-to-end load test of the API.
+
+The database is seeded with synthetic employees, then a number of concurrent workers send requests to the
+API for a while, each request to a route picked at random with the weights of the route mix: searches, ID
+lookups, reference data, verification, logins, exports, adding, importing and updating employees, one at a
+time, in bulk and by filter. Throughput and p50/p95/p99 latency are reported per route as JSON, and compared
+to the result of a previous run if given.
+
+    python -m benchmarks.load --seed-rows 100000 --output baseline.json
+    python -m benchmarks.load --mix by_id=50,search=20,update=5 --baseline baseline.json
+
+Only synthetic employees are requested and updated, so the load test never changes real employees. Mass
+updates filter on a department, which holds real employees too, so they are sent as dry runs. Logins are of a
+user the load test creates for a synthetic employee. Any response other than 2xx or 304 is counted as an
+error. Employees and users added by the load test, and the seeded employees with --cleanup, are deleted at the
+end.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple
+
+import bcrypt
+import httpx
+from psycopg import AsyncConnection, sql
+
+from app.config.config import settings
+from backend import db_connect, migrations
+from benchmarks.concurrent_latency import DEFAULT_BASE_URL, summarize
+from benchmarks.seed import SYNTHETIC_EMAIL_PATTERN, delete_synthetic_employees, insert_synthetic_employees
+
+
+class Request(NamedTuple):
+    method: str
+    path: str
+    params: Dict[str, Any] | None = None
+    json: Any = None
+    content: bytes | None = None
+    headers: Dict[str, str] | None = None
+
+
+class Samples(NamedTuple):
+    ids: List[int]
+    first_names: List[str]
+    last_names: List[str]
+    emails: List[str]
+    phones: List[str]
+
+
+DEFAULT_MIX = {
+    "by_id": 25,
+    "by_first_name": 8,
+    "by_last_name": 8,
+    "by_department": 4,
+    "by_position": 4,
+    "search": 10,
+    "reference": 5,
+    "gender_id": 5,
+    "department_id": 5,
+    "position_id": 5,
+    "verify_batch": 8,
+    "login": 3,
+    "export": 2,
+    "add": 5,
+    "bulk_import": 2,
+    "update": 8,
+    "bulk_update": 3,
+    "mass_update": 2,
+}
+
+ADDED_EMAIL_PREFIX = "loadtest-"
+ADDED_EMAIL_PATTERN = f"{ADDED_EMAIL_PREFIX}%@example.com"
+LOGIN_EMAIL = f"{ADDED_EMAIL_PREFIX}user@example.com"
+LOGIN_PASSWORD = "load-test-password"
+BATCH_SIZE = 10
+
+
+def build_routes(samples: Samples, run_id: str) -> Dict[str, Callable[[random.Random, int], Request]]:
+    """
+    Request builders of every route, each taking the random generator of a worker and a request number.
+
+    :param samples: Values of existing employees to request.
+    :param run_id: Unique id of the run, for the employees it adds.
+    :return: Request builder by route name.
+    """
+    def new_employee(rng: random.Random, number: int | str) -> Dict[str, Any]:
+        return {
+            "first_name": "Load",
+            "middle_name": "Test",
+            "last_name": f"Employee{number}",
+            "email": f"{ADDED_EMAIL_PREFIX}{run_id}-{number}@example.com",
+            "phone": f"L{run_id}{number}",
+            "address": "1 Benchmark Road",
+            "salary": rng.randint(30_000, 120_000),
+            "department": rng.choice(settings.DEPARTMENTS),
+            "position": rng.choice(settings.POSITIONS),
+            "gender": rng.choice(settings.GENDER),
+            "date_of_birth": "1990-01-01",
+        }
+
+    return {
+        "by_id": lambda rng, n: Request("GET", f"/get_employee_data/by_id/{rng.choice(samples.ids)}"),
+        "by_first_name": lambda rng, n: Request(
+            "GET", f"/get_employee_data/by_first_name/{rng.choice(samples.first_names)}"
+        ),
+        "by_last_name": lambda rng, n: Request(
+            "GET", f"/get_employee_data/by_last_name/{rng.choice(samples.last_names)}"
+        ),
+        "by_department": lambda rng, n: Request(
+            "GET", f"/get_employee_data/by_department/{rng.choice(settings.DEPARTMENTS)}"
+        ),
+        "by_position": lambda rng, n: Request(
+            "GET", f"/get_employee_data/by_position/{rng.choice(settings.POSITIONS)}"
+        ),
+        "search": lambda rng, n: Request(
+            "GET", "/search_employees/", params={"last_name": rng.choice(samples.last_names)[:4], "limit": 50}
+        ),
+        "reference": lambda rng, n: Request("GET", "/reference"),
+        "gender_id": lambda rng, n: Request("GET", f"/get_gender_id/{rng.choice(settings.GENDER)}"),
+        "department_id": lambda rng, n: Request("GET", f"/get_department_id/{rng.choice(settings.DEPARTMENTS)}"),
+        "position_id": lambda rng, n: Request("GET", f"/get_position_id/{rng.choice(settings.POSITIONS)}"),
+        "verify_batch": lambda rng, n: Request("POST", "/verify_batch/", json={
+            "emails": rng.sample(samples.emails, min(10, len(samples.emails))),
+            "phone_numbers": rng.sample(samples.phones, min(10, len(samples.phones))),
+        }),
+        "login": lambda rng, n: Request(
+            "POST", "/verify_user_login/", json={"email": LOGIN_EMAIL, "password": LOGIN_PASSWORD}
+        ),
+        "export": lambda rng, n: Request("GET", "/export_employees/", params={
+            "format": rng.choice(("ndjson", "csv", "arrow")), "last_name": rng.choice(samples.last_names),
+        }),
+        "add": lambda rng, n: Request("POST", "/create_employee/", json=new_employee(rng, n)),
+        "bulk_import": lambda rng, n: Request(
+            "POST",
+            "/bulk_import_employees/",
+            content="".join(json.dumps(new_employee(rng, f"{n}-{i}")) + "\n" for i in range(BATCH_SIZE)).encode(),
+            headers={"Content-Type": "application/x-ndjson"},
+        ),
+        "update": lambda rng, n: Request("PATCH", "/update_employee_data", json={
+            "employee_id": rng.choice(samples.ids), "salary": rng.randint(30_000, 120_000),
+        }),
+        "bulk_update": lambda rng, n: Request("PATCH", "/bulk_update_employee_data", json=[
+            {"employee_id": employee_id, "salary": rng.randint(30_000, 120_000)}
+            for employee_id in rng.sample(samples.ids, min(BATCH_SIZE, len(samples.ids)))
+        ]),
+        "mass_update": lambda rng, n: Request("PATCH", "/mass_update_employee_data", json={
+            "filters": {"department": rng.choice(settings.DEPARTMENTS)}, "salary_percent": 1, "dry_run": True,
+        }),
+    }
+
+
+def parse_mix(mix: str | None) -> Dict[str, float]:
+    """Parse a route mix like by_id=50,search=20 into weights by route."""
+    if not mix:
+        return dict(DEFAULT_MIX)
+
+    weights = {}
+    for item in mix.split(","):
+        route, _, weight = item.partition("=")
+        if route.strip() not in DEFAULT_MIX:
+            raise ValueError(f"Unknown route {route.strip()}, expected one of: {', '.join(DEFAULT_MIX)}")
+        weights[route.strip()] = float(weight or 1)
+    return weights
+
+
+async def sample_employees(connection: AsyncConnection, size: int = 1000) -> Samples:
+    """Pick synthetic employees to request and update."""
+    cursor = await connection.execute(
+        sql.SQL("""
+            SELECT id, first_name, last_name, email, phone FROM {} WHERE email LIKE %s ORDER BY random() LIMIT %s
+        """).format(sql.Identifier(settings.employee_table_name)),
+        (SYNTHETIC_EMAIL_PATTERN, size),
+    )
+    rows = await cursor.fetchall()
+    if not rows:
+        raise RuntimeError("No synthetic employees to request, seed the database with --seed-rows.")
+    return Samples(*(list(column) for column in zip(*rows)))  # type: ignore
+
+
+async def create_login_user(connection: AsyncConnection, employee_id: int) -> None:
+    """Create the user the load test logs in as, for a synthetic employee."""
+    hashed = bcrypt.hashpw(LOGIN_PASSWORD.encode(), bcrypt.gensalt(rounds=settings.bcrypt_rounds)).decode()
+    async with connection.transaction():
+        await connection.execute(
+            sql.SQL("""
+                INSERT INTO {} (first_name, last_name, email, role, password, employee_id)
+                VALUES ('Load', 'Test', %s, 'User', %s, %s)
+                ON CONFLICT DO NOTHING
+            """).format(sql.Identifier(settings.users_table_name)),
+            (LOGIN_EMAIL, hashed, employee_id),
+        )
+
+
+async def prepare_database(seed_rows: int) -> Samples:
+    """Apply the migrations, seed the synthetic employees, sample them and create the login user."""
+    connection = await db_connect.connect()
+    try:
+        await migrations.migrate(connection)
+        if seed_rows:
+            async with connection.transaction():
+                await insert_synthetic_employees(connection, seed_rows)
+        samples = await sample_employees(connection)
+        await connection.commit()
+        await create_login_user(connection, samples.ids[0])
+        return samples
+    finally:
+        await connection.close()
+
+
+async def clean_database(cleanup_seeded: bool) -> None:
+    """Delete the employees and users added by load tests, and the synthetic employees if asked to."""
+    connection = await db_connect.connect()
+    try:
+        async with connection.transaction():
+            for table in (settings.users_table_name, settings.employee_table_name):
+                await connection.execute(
+                    sql.SQL("DELETE FROM {} WHERE email LIKE %s").format(sql.Identifier(table)), (ADDED_EMAIL_PATTERN,)
+                )
+            if cleanup_seeded:
+                await delete_synthetic_employees(connection)
+    finally:
+        await connection.close()
+
+
+async def run_load(
+    base_url: str,
+    routes: Dict[str, Callable[[random.Random, int], Request]],
+    weights: Dict[str, float],
+    concurrency: int,
+    duration: float,
+    seed: int,
+) -> Dict[str, Any]:
+    """
+    Send requests with concurrent workers for a while.
+
+    :return: Throughput and latency summary per route and for all requests.
+    """
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    names = list(weights)
+    counter = iter(range(1, 1 << 62))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker(worker_id: int) -> None:
+            rng = random.Random(seed * 1000 + worker_id)
+            while time.perf_counter() < deadline:
+                route = rng.choices(names, weights=[weights[name] for name in names])[0]
+                request = routes[route](rng, next(counter))
+
+                start = time.perf_counter()
+                try:
+                    response = await client.request(
+                        request.method,
+                        request.path,
+                        params=request.params,
+                        json=request.json,
+                        content=request.content,
+                        headers=request.headers,
+                    )
+                    failed = not (200 <= response.status_code < 300 or response.status_code == 304)
+                except httpx.HTTPError:
+                    failed = True
+                latencies[route].append(time.perf_counter() - start)
+                if failed:
+                    errors[route] += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(worker_id) for worker_id in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    def route_result(route_latencies: List[float], route_errors: int) -> Dict[str, Any]:
+        return {
+            **summarize(route_latencies),
+            "errors": route_errors,
+            "throughput_rps": round(len(route_latencies) / elapsed, 2),
+        }
+
+    all_latencies = [latency for route_latencies in latencies.values() for latency in route_latencies]
+    return {
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 2),
+        "mix": weights,
+        "routes": {route: route_result(latencies[route], errors[route]) for route in sorted(latencies)},
+        "total": route_result(all_latencies, sum(errors.values())),
+    }
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """Return the relative change of the latency statistics and throughput of every route against a baseline run."""
+    def change(current: Dict[str, Any], previous: Dict[str, Any]) -> Dict[str, float]:
+        return {
+            key: round((value - previous[key]) / previous[key] * 100, 1)
+            for key, value in current.items()
+            if (key.endswith("_ms") or key == "throughput_rps") and previous.get(key)
+        }
+
+    groups: List[Tuple[str, Dict[str, Any], Dict[str, Any]]] = [("total", result["total"], baseline["total"])]
+    groups += [
+        (route, stats, baseline["routes"][route])
+        for route, stats in result["routes"].items()
+        if route in baseline.get("routes", {})
+    ]
+    return {name: change(current, previous) for name, current, previous in groups}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--seed-rows", type=int, default=0, help="Synthetic employees to seed before the run.")
+    parser.add_argument("--mix", help="Route weights, e.g. by_id=50,search=20. All routes by default.")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--random-seed", type=int, default=1, help="Seed of the request sequence.")
+    parser.add_argument("--cleanup", action="store_true", help="Delete the synthetic employees at the end.")
+    parser.add_argument("--output", help="File to write the result to.")
+    parser.add_argument("--baseline", help="Result file of a previous run to compare against.")
+    args = parser.parse_args()
+
+    weights = parse_mix(args.mix)
+    samples = asyncio.run(prepare_database(args.seed_rows))
+    routes = build_routes(samples, run_id=uuid.uuid4().hex[:8])
+
+    try:
+        result = asyncio.run(
+            run_load(args.base_url, routes, weights, args.concurrency, args.duration, args.random_seed)
+        )
+    finally:
+        asyncio.run(clean_database(args.cleanup))
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            result["change_pct"] = compare(result, json.load(baseline_file))
+
+    print(json.dumps(result, indent=2))
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(result, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
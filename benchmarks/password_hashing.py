@@ -0,0 +1,184 @@
+"""
+Benchmark for password hashing on the process pool.
+
+Without --base-url it runs in process and reports:
+
+- bcrypt hashes per second on the event loop and on the password hashing process pool
+- the event loop lag, how late a 10 ms timer fires, while a number of signups hash their passwords
+  concurrently, hashing on the event loop against hashing on the pool
+
+With --base-url it measures the API under concurrent password requests instead: their latency, and the
+latency of a cheap ID lookup sent meanwhile. With --mode login they are logins of an existing user. With
+--mode signup they are signups of new users for synthetic employees (python -m benchmarks.seed) that have
+no user yet, read from the database of the settings, which must be the one of the API. The users signed up
+are deleted at the end.
+
+    python -m benchmarks.password_hashing --signups 32
+    python -m benchmarks.password_hashing --base-url http://localhost:8000/v1 --email admin@gmail.com --password ...
+    python -m benchmarks.password_hashing --base-url http://localhost:8000/v1 --mode signup
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, List
+
+import bcrypt
+import httpx
+from psycopg import sql
+
+from app.config.config import settings
+from backend import db_connect, password_hashing
+from benchmarks.concurrent_latency import PROBE_PATH, summarize, timed_get
+from benchmarks.seed import SYNTHETIC_EMAIL_DOMAIN, SYNTHETIC_EMAIL_PATTERN
+
+
+PASSWORD = "benchmark-password"
+TIMER_INTERVAL = 0.01
+SIGNUP_EMAIL_PREFIX = "signup-"
+SIGNUP_EMAIL_PATTERN = f"{SIGNUP_EMAIL_PREFIX}%@{SYNTHETIC_EMAIL_DOMAIN}"
+
+
+async def measure_loop_lag(stop: asyncio.Event, lags: List[float]) -> None:
+    """Record how late a timer fires on the event loop until stopped."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TIMER_INTERVAL)
+        lags.append(time.perf_counter() - start - TIMER_INTERVAL)
+
+
+async def hash_on_loop(password: str) -> str:
+    """Hash a password on the event loop, as a request handler calling bcrypt directly does."""
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=settings.bcrypt_rounds)).decode()
+
+
+async def run_signups(signups: int, offload: bool) -> Dict[str, Any]:
+    """Hash the passwords of concurrent signups and measure the throughput and event loop lag."""
+    hash_password = password_hashing.hash_password if offload else hash_on_loop
+    stop = asyncio.Event()
+    lags: List[float] = []
+    ticker = asyncio.create_task(measure_loop_lag(stop, lags))
+    await asyncio.sleep(TIMER_INTERVAL)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(hash_password(f"{PASSWORD}-{i}") for i in range(signups)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await ticker
+    return {
+        "hashes_per_second": round(signups / elapsed, 2),
+        "loop_lag": summarize(lags),
+    }
+
+
+async def run_local(signups: int) -> Dict[str, Any]:
+    """Compare hashing on the event loop and on the process pool."""
+    await password_hashing.hasher_init()
+    try:
+        # Start the worker processes before measuring
+        await password_hashing.hash_password(PASSWORD)
+        return {
+            "bcrypt_rounds": settings.bcrypt_rounds,
+            "workers": settings.password_hash_workers,
+            "on_event_loop": await run_signups(signups, offload=False),
+            "on_process_pool": await run_signups(signups, offload=True),
+        }
+    finally:
+        password_hashing.hasher_close()
+
+
+async def run_api(base_url: str, path: str, payloads: List[Dict[str, Any]], probes: int) -> Dict[str, Any]:
+    """Send concurrent requests to a password endpoint of the API and probe a cheap endpoint meanwhile."""
+    request_latencies: List[float] = []
+    probe_latencies: List[float] = []
+
+    async def send(client: httpx.AsyncClient, payload: Dict[str, Any]) -> None:
+        start = time.perf_counter()
+        response = await client.post(path, json=payload)
+        request_latencies.append(time.perf_counter() - start)
+        response.raise_for_status()
+
+    async def probe(client: httpx.AsyncClient) -> None:
+        for _ in range(probes):
+            await timed_get(client, PROBE_PATH, probe_latencies)
+            await asyncio.sleep(TIMER_INTERVAL)
+
+    limits = httpx.Limits(max_connections=len(payloads) + 1)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        await asyncio.gather(probe(client), *(send(client, payload) for payload in payloads))
+
+    return {"requests": summarize(request_latencies), "probe": summarize(probe_latencies)}
+
+
+async def run_api_logins(base_url: str, email: str, password: str, logins: int, probes: int) -> Dict[str, Any]:
+    """Send concurrent logins of an existing user to the API."""
+    payloads = [{"email": email, "password": password}] * logins
+    return {"mode": "login", **await run_api(base_url, "/verify_user_login/", payloads, probes)}
+
+
+async def run_api_signups(base_url: str, signups: int, probes: int) -> Dict[str, Any]:
+    """Send concurrent signups of synthetic employees to the API, and delete the users afterwards."""
+    users = sql.Identifier(settings.users_table_name)
+    connection = await db_connect.connect()
+    try:
+        cursor = await connection.execute(
+            sql.SQL("""
+                SELECT e.id FROM {employee} AS e
+                WHERE e.email LIKE %s AND NOT EXISTS (SELECT 1 FROM {users} AS u WHERE u.employee_id = e.id)
+                LIMIT %s
+            """).format(employee=sql.Identifier(settings.employee_table_name), users=users),
+            (SYNTHETIC_EMAIL_PATTERN, signups),
+        )
+        employee_ids = [row[0] for row in await cursor.fetchall()]
+        if len(employee_ids) < signups:
+            raise RuntimeError("Not enough synthetic employees without a user, seed them with benchmarks.seed.")
+
+        payloads = [
+            {
+                "role": "User",
+                "firstname": "Signup",
+                "lastname": f"Benchmark{employee_id}",
+                "email": f"{SIGNUP_EMAIL_PREFIX}{employee_id}@{SYNTHETIC_EMAIL_DOMAIN}",
+                "password": PASSWORD,
+                "employee_id": employee_id,
+            }
+            for employee_id in employee_ids
+        ]
+        try:
+            return {"mode": "signup", **await run_api(base_url, "/add_user/", payloads, probes)}
+        finally:
+            await connection.execute(
+                sql.SQL("DELETE FROM {} WHERE email LIKE %s").format(users), (SIGNUP_EMAIL_PATTERN,)
+            )
+            await connection.commit()
+    finally:
+        await connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--signups", type=int, default=32, help="Concurrent signups or logins.")
+    parser.add_argument("--base-url", help="Benchmark the password endpoints of a running API instead.")
+    parser.add_argument("--mode", choices=("login", "signup"), default="login", help="API requests to send.")
+    parser.add_argument("--email", help="Email of an existing user, for the API login benchmark.")
+    parser.add_argument("--password", help="Password of the user, for the API login benchmark.")
+    parser.add_argument("--probes", type=int, default=50, help="Probe requests during the API benchmark.")
+    args = parser.parse_args()
+
+    if args.base_url and args.mode == "signup":
+        results = asyncio.run(run_api_signups(args.base_url, args.signups, args.probes))
+    elif args.base_url:
+        if not args.email or not args.password:
+            parser.error("--email and --password are required with --base-url in login mode")
+        results = asyncio.run(
+            run_api_logins(args.base_url, args.email, args.password, args.signups, args.probes)
+        )
+    else:
+        results = asyncio.run(run_local(args.signups))
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Microbenchmark for the precompiled and server-prepared employee data queries.
+
+It measures, on one database connection:
+
+- the CPU time to compose an employee data query on every request, against a lookup in the query registry
+- the time per query to run the search by id and by department with the query parsed and planned on every
+  execution, against a prepared statement
+
+    python -m benchmarks.query_preparation --iterations 5000
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, List
+
+from psycopg import AsyncConnection, sql
+
+from api.endpoints.employees import EMPLOYEE_QUERIES, compile_employee_queries, employee_data_query
+from app.config.config import settings
+from backend import db_connect
+
+
+async def sample_values(connection: AsyncConnection) -> Dict[str, Any]:
+    """Pick an existing employee id and department to search for."""
+    cursor = await connection.execute(
+        sql.SQL("""
+            SELECT e.id, d.department
+            FROM {employee} AS e
+            JOIN {department} AS d ON e.department_id = d.id
+            ORDER BY e.id
+            LIMIT 1;
+        """).format(
+            employee=sql.Identifier(settings.employee_table_name),
+            department=sql.Identifier(settings.dept_table_name),
+        )
+    )
+    row = await cursor.fetchone()
+    return {"id": row[0], "department": row[1]} if row else {"id": 1, "department": "IT"}
+
+
+def compose_queries(connection: AsyncConnection, iterations: int) -> Dict[str, float]:
+    """Compare the CPU time per request to compose a query against a registry lookup, in microseconds."""
+    start = time.process_time()
+    for _ in range(iterations):
+        employee_data_query("department", keyset=True, limit=True).as_bytes(connection)
+    composed = time.process_time() - start
+
+    start = time.process_time()
+    for _ in range(iterations):
+        EMPLOYEE_QUERIES.get(("department", True, True)) or employee_data_query("department", True, True)
+    registry = time.process_time() - start
+
+    return {
+        "compose_us": round(composed / iterations * 1_000_000, 2),
+        "registry_us": round(registry / iterations * 1_000_000, 2),
+    }
+
+
+async def execute_queries(
+    connection: AsyncConnection,
+    query: bytes,
+    params: List[Any],
+    iterations: int,
+    prepare: bool,
+) -> Dict[str, float]:
+    """Run a query repeatedly and report the wall clock and client CPU time per query."""
+    start, cpu_start = time.perf_counter(), time.process_time()
+    for _ in range(iterations):
+        async with connection.cursor() as cursor:
+            await cursor.execute(query, params, prepare=prepare)
+            await cursor.fetchall()
+    elapsed, cpu = time.perf_counter() - start, time.process_time() - cpu_start
+
+    return {
+        "mean_ms": round(elapsed / iterations * 1000, 4),
+        "client_cpu_us": round(cpu / iterations * 1_000_000, 2),
+        "queries_per_second": round(iterations / elapsed, 1),
+    }
+
+
+async def run(iterations: int) -> Dict[str, Any]:
+    """
+    Run the benchmark.
+
+    :param iterations: Number of executions per measurement.
+    :return: Results per measurement.
+    """
+    connection = await db_connect.connect()
+    try:
+        compile_employee_queries(connection)
+        values = await sample_values(connection)
+        results: Dict[str, Any] = {"composition": compose_queries(connection, iterations)}
+
+        searches = {
+            "by_id": (EMPLOYEE_QUERIES[("id", False, False)], [values["id"]]),
+            "by_department": (
+                EMPLOYEE_QUERIES[("department", False, True)],
+                [values["department"], settings.employee_page_size + 1],
+            ),
+        }
+        for name, (query, params) in searches.items():
+            unprepared = await execute_queries(connection, query, params, iterations, prepare=False)
+            prepared = await execute_queries(connection, query, params, iterations, prepare=True)
+            results[name] = {"unprepared": unprepared, "prepared": prepared}
+
+        return results
+    finally:
+        await connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5000, help="Executions per measurement.")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args.iterations)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
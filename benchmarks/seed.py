@@ -0,0 +1,294 @@
+"""
+Synthetic employees for scale testing and the benchmarks.
+
+The generator produces realistic employees deterministically from a seed: names drawn with a skewed
+frequency, departments and positions with uneven head counts, ages, hire and resignation dates relative to a
+fixed date, and log-normal salaries. Emails and phones are unique, derived from the row number. Rows are
+streamed into the employee table with COPY.
+
+Synthetic employees have emails in the synthetic.test domain, so they can be told apart from real ones.
+Seeding replaces all synthetic employees, so the same rows and seed always give the same data.
+
+    python -m benchmarks.seed --rows 1000000 --seed 42
+    python -m benchmarks.seed --delete
+
+The per-statement employee change notifications are disabled while seeding, and a single reset notification
+is sent instead when the seeding or deletion is committed. On it, every API worker clears its employee cache
+and, if enabled, reloads its in-memory search index.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+from itertools import accumulate
+from math import exp
+from statistics import NormalDist
+from typing import AsyncIterator, Dict, Iterator, List, Sequence, Tuple
+
+from psycopg import AsyncConnection, sql
+
+from app.config.config import settings
+from backend import db_connect, employee_changes, migrations
+
+
+SYNTHETIC_EMAIL_DOMAIN = "synthetic.test"
+SYNTHETIC_EMAIL_PATTERN = f"%@{SYNTHETIC_EMAIL_DOMAIN}"
+SYNTHETIC_PHONE_PREFIX = "+1555"
+NOTIFY_TRIGGERS = ("employee_insert_notify", "employee_update_notify", "employee_delete_notify")
+DEFAULT_SEED = 42
+MAX_ROWS = 99_999_999
+CHUNK_ROWS = 50_000
+
+# Dates are relative to a fixed date rather than today, so a seed gives the same rows on any day
+REFERENCE_DATE = date(2025, 1, 1)
+EARLIEST_DATE = date(1955, 1, 1)
+RESIGNED_SHARE = 0.08
+MIDDLE_NAME_SHARE = 0.4
+# Log-normal salaries, the median is about 60,000
+SALARY_LOG_MEAN = 11.0
+SALARY_LOG_SIGMA = 0.45
+
+COPY_COLUMNS = (
+    "first_name", "middle_name", "last_name", "email", "phone", "address", "salary",
+    "department_id", "position_id", "gender_id", "date_of_birth", "hired_date", "status", "date_resigned",
+)
+
+# Most common first, names are drawn with a Zipf-like frequency
+FIRST_NAMES = (
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+    "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Chinedu", "Ngozi",
+    "Charles", "Karen", "Daniel", "Amaka", "Matthew", "Nancy", "Anthony", "Lisa", "Emeka", "Betty",
+    "Mark", "Margaret", "Donald", "Sandra", "Steven", "Ashley", "Paul", "Kimberly", "Andrew", "Emily",
+    "Tunde", "Donna", "Kenneth", "Michelle", "Kevin", "Carol", "Brian", "Amanda", "George", "Melissa",
+    "Oluwaseun", "Deborah", "Ibrahim", "Fatima", "Hiroshi", "Yuki", "Carlos", "Sofia", "Priya", "Arjun",
+)
+LAST_NAMES = (
+    "Smith", "Johnson", "Okafor", "Williams", "Brown", "Adeyemi", "Jones", "Garcia", "Miller", "Davis",
+    "Okonkwo", "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Eze", "Thomas",
+    "Taylor", "Moore", "Jackson", "Martin", "Bello", "Lee", "Perez", "Thompson", "White", "Harris",
+    "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson", "Nwosu", "Walker", "Young", "Allen", "King",
+    "Wright", "Scott", "Torres", "Nguyen", "Hill", "Flores", "Green", "Adams", "Nelson", "Baker",
+    "Hall", "Rivera", "Campbell", "Mitchell", "Carter", "Roberts", "Abubakar", "Tanaka", "Sato", "Patel",
+    "Sharma", "Kowalski", "Novak", "Schmidt", "Muller", "Rossi", "Dubois", "Larsen", "Silva", "Okeke",
+)
+STREETS = (
+    "Oak", "Maple", "Cedar", "Pine", "Elm", "Lake", "Hill", "Park", "Church", "Market",
+    "Station", "Victoria", "Broad", "Allen", "Adeola", "Awolowo", "Bode Thomas", "Ahmadu Bello", "Marina", "Kings",
+)
+STREET_SUFFIXES = ("Street", "Avenue", "Road", "Lane", "Close", "Drive", "Crescent", "Way")
+CITIES = (
+    "Lagos", "Abuja", "Ibadan", "Port Harcourt", "Enugu", "Kano", "London", "Manchester", "Berlin", "Toronto",
+    "New York", "Austin", "Nairobi", "Accra", "Johannesburg", "Dublin", "Amsterdam", "Lisbon", "Tokyo", "Pune",
+)
+
+# Relative head count of the departments and positions of initdb/init.sql, others get a weight of 1
+DEPARTMENT_WEIGHTS = {
+    "IT": 30, "Sales": 25, "Marketing": 15, "Data & Analytics": 15, "Research": 10, "HR": 5,
+}
+POSITION_WEIGHTS = {
+    "Software Engineer": 20, "Data Engineer": 10, "Data Analyst": 10, "Web Developer": 8, "Business Analyst": 8,
+    "Junior Data Engineer": 6, "Intern": 6, "DevOps Engineer": 5, "Data Scientist": 5, "Network Engineer": 4,
+    "HR": 4, "Senior Data Engineer": 4, "Machine Learning Engineer": 3, "Cloud Architect": 2,
+    "Solutions Architect": 2, "Product Owner": 2, "Senior Engineering Manager": 1,
+}
+
+
+def synthetic_phone(number: int) -> str:
+    """Phone number of the synthetic employee with the given row number."""
+    return f"{SYNTHETIC_PHONE_PREFIX}{number:08d}"
+
+
+def zipf_cum_weights(size: int) -> List[float]:
+    """Cumulative weights of a Zipf-like distribution over items ordered from most to least common."""
+    return list(accumulate(1 / rank for rank in range(1, size + 1)))
+
+
+def reference_cum_weights(
+    reference: Sequence[Tuple[int, str]], weights: Dict[str, int]
+) -> Tuple[List[int], List[float]]:
+    """Ids of reference rows with the cumulative weights of their names."""
+    return [row_id for row_id, _ in reference], list(accumulate(weights.get(name, 1) for _, name in reference))
+
+
+def generate_employee_rows(
+    rows: int,
+    seed: int,
+    departments: Sequence[Tuple[int, str]],
+    positions: Sequence[Tuple[int, str]],
+    genders: Sequence[Tuple[int, str]],
+) -> Iterator[bytes]:
+    """
+    Generate synthetic employees in COPY text format.
+
+    :param rows: Number of employees.
+    :param seed: Seed of the generator, the same seed and reference rows give the same employees.
+    :param departments: Department ids and names, ordered by id.
+    :param positions: Position ids and names, ordered by id.
+    :param genders: Gender ids and names, ordered by id.
+    :return: Chunks of COPY lines.
+    """
+    if not 0 <= rows <= MAX_ROWS:
+        raise ValueError(f"Rows must be between 0 and {MAX_ROWS}.")
+
+    rng = random.Random(seed)
+    # Everything that can be is drawn for a whole chunk at once from precomputed values, which is much faster
+    # than drawing and formatting every value of every row
+    days = [
+        (EARLIEST_DATE + timedelta(days=day)).isoformat() for day in range((REFERENCE_DATE - EARLIEST_DATE).days)
+    ]
+    today = len(days) - 1
+    first_names = [(name, name.lower()) for name in FIRST_NAMES]
+    last_names = [(name, name.lower()) for name in LAST_NAMES]
+    first_name_weights = zipf_cum_weights(len(FIRST_NAMES))
+    last_name_weights = zipf_cum_weights(len(LAST_NAMES))
+    middle_names = (*FIRST_NAMES, r"\N")
+    # A middle name for MIDDLE_NAME_SHARE of the employees, none for the others
+    middle_name_weights = [*first_name_weights, first_name_weights[-1] / MIDDLE_NAME_SHARE]
+    department_ids, department_weights = reference_cum_weights(departments, DEPARTMENT_WEIGHTS)
+    position_ids, position_weights = reference_cum_weights(positions, POSITION_WEIGHTS)
+    gender_ids = [str(row_id) for row_id, _ in genders]
+    addresses = [
+        f"{number} {street} {suffix}, {city}"
+        for number in range(1, 100) for street in STREETS for suffix in STREET_SUFFIXES for city in CITIES
+    ]
+    # Ages in days from 18 to 65 years, most common around 30
+    ages = range(18 * 365, 65 * 365)
+    age_weights = list(accumulate(
+        (age - ages.start) / (30 * 365 - ages.start) if age < 30 * 365 else (ages.stop - age) / (ages.stop - 30 * 365)
+        for age in ages
+    ))
+    salary_distribution = NormalDist(mu=SALARY_LOG_MEAN, sigma=SALARY_LOG_SIGMA)
+    salaries = [f"{exp(salary_distribution.inv_cdf((i + 0.5) / 10_000)):.2f}" for i in range(10_000)]
+
+    for start in range(1, rows + 1, CHUNK_ROWS):
+        size = min(CHUNK_ROWS, rows + 1 - start)
+        columns = zip(
+            range(start, start + size),
+            rng.choices(first_names, cum_weights=first_name_weights, k=size),
+            rng.choices(middle_names, cum_weights=middle_name_weights, k=size),
+            rng.choices(last_names, cum_weights=last_name_weights, k=size),
+            rng.choices(addresses, k=size),
+            rng.choices(salaries, k=size),
+            rng.choices(department_ids, cum_weights=department_weights, k=size),
+            rng.choices(position_ids, cum_weights=position_weights, k=size),
+            rng.choices(gender_ids, k=size),
+            rng.choices(ages, cum_weights=age_weights, k=size),
+        )
+
+        lines = []
+        for (
+            number, (first, first_lower), middle, (last, last_lower), address, salary, department, position, gender, age
+        ) in columns:
+            # Tenures skew short, most employees were hired in the last few years
+            hired = today - int((age - 18 * 365) * rng.random() ** 3)
+            if rng.random() < RESIGNED_SHARE:
+                status = f"Resigned\t{days[hired + int((today - hired) * rng.random())]}"
+            else:
+                status = "Active\t\\N"
+
+            lines.append(
+                f"{first}\t{middle}\t{last}\t{first_lower}.{last_lower}.{number}@{SYNTHETIC_EMAIL_DOMAIN}\t"
+                f"{SYNTHETIC_PHONE_PREFIX}{number:08d}\t{address}\t{salary}\t{department}\t{position}\t{gender}\t"
+                f"{days[today - age]}\t{days[hired]}\t{status}"
+            )
+
+        yield ("\n".join(lines) + "\n").encode()
+
+
+async def reference_rows(connection: AsyncConnection, table: str, column: str) -> List[Tuple[int, str]]:
+    """Ids and names of a reference table, ordered by id."""
+    cursor = await connection.execute(
+        sql.SQL("SELECT id, {} FROM {} ORDER BY id").format(sql.Identifier(column), sql.Identifier(table))
+    )
+    return await cursor.fetchall()
+
+
+@asynccontextmanager
+async def notifications_disabled(connection: AsyncConnection) -> AsyncIterator[None]:
+    """
+    Disable the employee change notifications, a batch per 300 rows, while writing many employees, and notify a
+    single reset instead.
+    """
+    table = sql.Identifier(settings.employee_table_name)
+    for trigger in NOTIFY_TRIGGERS:
+        await connection.execute(sql.SQL("ALTER TABLE {} DISABLE TRIGGER {}").format(table, sql.Identifier(trigger)))
+    yield
+    for trigger in NOTIFY_TRIGGERS:
+        await connection.execute(sql.SQL("ALTER TABLE {} ENABLE TRIGGER {}").format(table, sql.Identifier(trigger)))
+    await employee_changes.notify_reset(connection)
+
+
+async def _delete_synthetic_employees(connection: AsyncConnection) -> int:
+    cursor = await connection.execute(
+        sql.SQL("DELETE FROM {} WHERE email LIKE %s").format(sql.Identifier(settings.employee_table_name)),
+        (SYNTHETIC_EMAIL_PATTERN,),
+    )
+    return cursor.rowcount
+
+
+async def insert_synthetic_employees(connection: AsyncConnection, rows: int, seed: int = DEFAULT_SEED) -> None:
+    """
+    Replace the synthetic employees with newly generated ones.
+
+    Run it in a transaction: the employee table is locked until the transaction ends.
+
+    :param connection: Database connection.
+    :param rows: Number of employees.
+    :param seed: Seed of the generator.
+    """
+    departments = await reference_rows(connection, settings.dept_table_name, "department")
+    positions = await reference_rows(connection, settings.position_table_name, "position")
+    genders = await reference_rows(connection, settings.gender_table_name, "gender")
+
+    copy_statement = sql.SQL("COPY {employee} ({columns}) FROM STDIN").format(
+        employee=sql.Identifier(settings.employee_table_name),
+        columns=sql.SQL(", ").join(map(sql.Identifier, COPY_COLUMNS)),
+    )
+    async with notifications_disabled(connection):
+        await _delete_synthetic_employees(connection)
+        async with connection.cursor() as cursor:
+            async with cursor.copy(copy_statement) as copy:
+                for chunk in generate_employee_rows(rows, seed, departments, positions, genders):
+                    await copy.write(chunk)
+
+    await connection.execute(sql.SQL("ANALYZE {}").format(sql.Identifier(settings.employee_table_name)))
+
+
+async def delete_synthetic_employees(connection: AsyncConnection) -> int:
+    """Delete all synthetic employees and return how many there were."""
+    async with notifications_disabled(connection):
+        return await _delete_synthetic_employees(connection)
+
+
+async def run(rows: int, seed: int, delete: bool) -> Dict[str, float]:
+    """Seed or delete the synthetic employees and time it."""
+    connection = await db_connect.connect()
+    try:
+        await migrations.migrate(connection)
+        start = time.perf_counter()
+        async with connection.transaction():
+            if delete:
+                result = {"deleted": await delete_synthetic_employees(connection)}
+            else:
+                await insert_synthetic_employees(connection, rows, seed)
+                result = {"inserted": rows, "seed": seed}
+        return {**result, "seconds": round(time.perf_counter() - start, 2)}
+    finally:
+        await connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="Number of synthetic employees.")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed of the generator.")
+    parser.add_argument("--delete", action="store_true", help="Delete the synthetic employees instead.")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args.rows, args.seed, args.delete)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+-- INDEXES FOR THE EMPLOYEE SEARCH ENDPOINTS
+-- Name searches
+CREATE INDEX IF NOT EXISTS idx_employee_first_name ON employee (first_name);
+CREATE INDEX IF NOT EXISTS idx_employee_last_name ON employee (last_name);
+
+-- Department and position searches, including the id for keyset pagination
+CREATE INDEX IF NOT EXISTS idx_employee_department_id ON employee (department_id, id);
+CREATE INDEX IF NOT EXISTS idx_employee_position_id ON employee (position_id, id);
+
+-- Status filters and hire date ranges
+CREATE INDEX IF NOT EXISTS idx_employee_status ON employee (status);
+CREATE INDEX IF NOT EXISTS idx_employee_hired_date ON employee (hired_date);
@@ -0,0 +1,13 @@
+-- USERS TABLE FOR ADMIN AND USER ACCOUNTS
+CREATE TABLE IF NOT EXISTS users (
+    id BIGSERIAL PRIMARY KEY,
+    first_name VARCHAR(50) NOT NULL,
+    last_name VARCHAR(50) NOT NULL,
+    email VARCHAR(50) UNIQUE NOT NULL,
+    role VARCHAR(10),
+    password VARCHAR(255) NOT NULL,
+    employee_id INT UNIQUE NOT NULL,
+
+    -- Foreign Key Constraint
+    CONSTRAINT fk_employee FOREIGN KEY (employee_id) REFERENCES employee(id) ON DELETE CASCADE
+);
@@ -0,0 +1,6 @@
+-- TRIGRAM INDEXES FOR THE EMPLOYEE SEARCH ENDPOINT
+-- Case-insensitive prefix (ILIKE) and similarity (%) matches on names
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_employee_first_name_trgm ON employee USING gin (first_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_employee_last_name_trgm ON employee USING gin (last_name gin_trgm_ops);
@@ -0,0 +1,15 @@
+-- EMPLOYEE CHANGE NOTIFICATIONS
+-- Keep the in-memory employee search index of the API current
+CREATE OR REPLACE FUNCTION notify_employee_change() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify(
+        'employee_changes',
+        json_build_object('op', TG_OP, 'id', COALESCE(NEW.id, OLD.id))::text
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER employee_change_notify
+AFTER INSERT OR UPDATE OR DELETE ON employee
+FOR EACH ROW EXECUTE FUNCTION notify_employee_change();
@@ -0,0 +1,14 @@
+-- EMPLOYEE ROW VERSIONS
+-- Time of the last change of every employee, used for the ETags of the employee data endpoints
+ALTER TABLE employee ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp();
+
+CREATE OR REPLACE FUNCTION set_employee_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at = clock_timestamp();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER employee_set_updated_at
+BEFORE UPDATE ON employee
+FOR EACH ROW EXECUTE FUNCTION set_employee_updated_at();
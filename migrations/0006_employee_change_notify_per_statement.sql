@@ -0,0 +1,40 @@
+-- EMPLOYEE CHANGE NOTIFICATIONS PER STATEMENT
+-- Notify the ids of all employees changed by a statement in batched payloads, instead of one notification per
+-- row, so bulk writes don't send a notification for every employee they touch.
+-- Transition tables can only be declared by triggers on a single event, hence a trigger per event.
+DROP TRIGGER IF EXISTS employee_change_notify ON employee;
+DROP FUNCTION IF EXISTS notify_employee_change();
+
+CREATE OR REPLACE FUNCTION notify_employee_changes() RETURNS trigger AS $$
+DECLARE
+    ids BIGINT[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(id ORDER BY id) INTO ids FROM new_rows;
+    ELSIF TG_OP = 'UPDATE' THEN
+        SELECT array_agg(id ORDER BY id) INTO ids FROM (SELECT id FROM old_rows UNION SELECT id FROM new_rows) AS changed;
+    ELSE
+        SELECT array_agg(id ORDER BY id) INTO ids FROM old_rows;
+    END IF;
+
+    -- Payloads are limited to 8000 bytes, so the ids are sent in batches of 300
+    PERFORM pg_notify('employee_changes', json_build_object('op', TG_OP, 'ids', ids[i:i + 299])::text)
+    FROM generate_series(1, cardinality(ids), 300) AS i;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER employee_insert_notify
+AFTER INSERT ON employee
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_employee_changes();
+
+CREATE OR REPLACE TRIGGER employee_update_notify
+AFTER UPDATE ON employee
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_employee_changes();
+
+CREATE OR REPLACE TRIGGER employee_delete_notify
+AFTER DELETE ON employee
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_employee_changes();
@@ -0,0 +1,138 @@
+"""
+Tests of the bulk import merge, against the configured database.
+
+Every test runs in a transaction rolled back at the end. The tests are skipped if the database can't be reached.
+"""
+import asyncio
+from datetime import date
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+psycopg = pytest.importorskip("psycopg")
+
+from api.endpoints.bulk_import import (  # noqa: E402
+    IMPORT_COLUMNS, STAGING_TABLE, create_staging_table, merge_staging_table, validate_record,
+)
+from api.endpoints.employees import fetch_employee_data  # noqa: E402
+from api.input_data_validations.pydantic_validations import EmployeeResponseModel  # noqa: E402
+from app.config.config import settings  # noqa: E402
+from backend import db_connect  # noqa: E402
+
+
+def import_row(**values: Any) -> Tuple[Any, ...]:
+    row = {
+        "first_name": "Ada",
+        "middle_name": None,
+        "last_name": "Import",
+        "email": "ada.import@bulk-import.test",
+        "phone": "+10000000001",
+        "address": "1 Import Road",
+        "salary": 50000,
+        "department": "IT",
+        "position": "Data Engineer",
+        "gender": "Female",
+        "date_of_birth": date(1990, 1, 1),
+        "hired_date": None,
+        "status": "Active",
+        **values,
+    }
+    return tuple(row[column] for column in IMPORT_COLUMNS)
+
+
+async def merge(
+    rows: List[Tuple[Any, ...]],
+) -> Tuple[int, Dict[int, str | None], List[EmployeeResponseModel]]:
+    """
+    Merge rows, numbered from line 1.
+
+    :return: Number of employees inserted, rejection of every line, and the employees inserted as the employee
+        data endpoints return them.
+    """
+    try:
+        connection = await db_connect.connect()
+    except psycopg.OperationalError as e:
+        pytest.skip(f"Database not available: {e}")
+
+    try:
+        async with connection.transaction(force_rollback=True):
+            async with connection.cursor() as cursor:
+                await create_staging_table(cursor)
+                copy_statement = psycopg.sql.SQL("COPY {staging} (line_number, {columns}) FROM STDIN").format(
+                    staging=psycopg.sql.Identifier(STAGING_TABLE),
+                    columns=psycopg.sql.SQL(", ").join(map(psycopg.sql.Identifier, IMPORT_COLUMNS)),
+                )
+                async with cursor.copy(copy_statement) as copy:
+                    for line_number, row in enumerate(rows, start=1):
+                        await copy.write_row((line_number, *row))
+
+                inserted = await merge_staging_table(cursor)
+                await cursor.execute(
+                    psycopg.sql.SQL("SELECT line_number, rejection FROM {} ORDER BY line_number").format(
+                        psycopg.sql.Identifier(STAGING_TABLE)
+                    )
+                )
+                rejections = dict(await cursor.fetchall())
+
+                await cursor.execute(
+                    psycopg.sql.SQL("""
+                        SELECT e.id FROM {employee} AS e JOIN {staging} AS s ON s.email = e.email
+                        WHERE s.rejection IS NULL ORDER BY s.line_number
+                    """).format(
+                        employee=psycopg.sql.Identifier(settings.employee_table_name),
+                        staging=psycopg.sql.Identifier(STAGING_TABLE),
+                    )
+                )
+                employee_ids = [row[0] for row in await cursor.fetchall()]
+
+            employees = [
+                EmployeeResponseModel.model_validate(row)
+                for employee_id in employee_ids
+                for row in await fetch_employee_data(connection=connection, filter_field="id", value=employee_id)
+            ]
+        return inserted, rejections, employees
+    finally:
+        await connection.close()
+
+
+def test_duplicates_in_import_are_rejected() -> None:
+    inserted, rejections, _ = asyncio.run(merge([import_row(), import_row(phone="+10000000002")]))
+
+    assert inserted == 1
+    assert rejections[1] is None
+    assert rejections[2].startswith("Duplicate email in import")
+
+
+def test_valid_row_is_not_a_duplicate_of_a_rejected_row() -> None:
+    inserted, rejections, _ = asyncio.run(merge([
+        import_row(department="No Such Department"),
+        import_row(),
+        import_row(email="grace.import@bulk-import.test", department="No Such Department"),
+        import_row(email="grace.import@bulk-import.test", phone="+10000000003"),
+    ]))
+
+    assert inserted == 2
+    assert rejections[1].startswith("Unknown department")
+    assert rejections[2] is None
+    assert rejections[3].startswith("Unknown department")
+    assert rejections[4] is None
+
+
+def test_imported_employee_is_returned_by_the_api() -> None:
+    inserted, _, employees = asyncio.run(merge([import_row(middle_name=None, hired_date=None)]))
+
+    assert inserted == 1
+    assert [(employee.email, employee.address, employee.date_of_birth) for employee in employees] == [
+        ("ada.import@bulk-import.test", "1 Import Road", date(1990, 1, 1))
+    ]
+
+
+def test_address_and_date_of_birth_are_required() -> None:
+    record = dict(zip(IMPORT_COLUMNS, import_row()))
+    del record["address"]
+    del record["date_of_birth"]
+
+    errors = validate_record(record)
+
+    assert isinstance(errors, str)
+    assert "address" in errors and "date_of_birth" in errors